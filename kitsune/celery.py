@@ -11,6 +11,7 @@ app.autodiscover_tasks()
 app.conf.task_routes = {
     "post_office.tasks.send_queued_mail": {"queue": "email"},
     "kitsune.tidings.tasks.send_emails": {"queue": "email"},
+    "kitsune.tidings.tasks.send_email_chunk": {"queue": "email"},
     "kitsune.messages.tasks.email_private_message": {"queue": "email"},
     "kitsune.announcements.tasks.send_group_email": {"queue": "email"},
     "kitsune.kbadge.tasks.send_award_notification": {"queue": "email"},
@@ -9,10 +9,10 @@ PERIODIC_TASKS_ALL = {
         "schedule": crontab(minute="30"),
     },
     # Dashboards Periodic Tasks
-    # Daily at 21:00.
+    # Every hour at 20 minutes past.
     "cache_most_unhelpful_kb_articles": {
         "task": "kitsune.dashboards.tasks.cache_most_unhelpful_kb_articles",
-        "schedule": crontab(hour="21", minute="0"),
+        "schedule": crontab(minute="20"),
     },
     # On the 1st of every month at 00:30.
     "update_l10n_contributor_metrics": {
@@ -85,10 +85,21 @@ PERIODIC_TASKS_ALL = {
         "task": "kitsune.questions.tasks.report_employee_answers",
         "schedule": crontab(hour="1", minute="11"),
     },
-    # Daily at 01:40.
+    # Every 10 minutes.
     "update_weekly_votes": {
         "task": "kitsune.questions.tasks.update_weekly_votes",
-        "schedule": crontab(hour="1", minute="40"),
+        "schedule": crontab(minute="*/10"),
+    },
+    # Every 5 minutes.
+    "refresh_question_list_facets": {
+        "task": "kitsune.questions.tasks.refresh_question_list_facets",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Search Periodic Tasks
+    # Every minute.
+    "drain_index_queue": {
+        "task": "kitsune.search.coalesce.drain_index_queue",
+        "schedule": crontab(minute="*"),
     },
     # SUMO Periodic Tasks
     # Every 5 minutes.
@@ -134,6 +145,11 @@ PERIODIC_TASKS_ALL = {
         "schedule": crontab(hour="*/4", minute="15"),
         "kwargs": {"within_hours": 24},
     },
+    # Daily at 01:30.
+    "update_contributor_stats": {
+        "task": "kitsune.questions.tasks.update_contributor_stats",
+        "schedule": crontab(hour="1", minute="30"),
+    },
     # Wiki Periodic Tasks
     # Every 4 hours at 00 minutes past.
     "create_missing_translations": {
@@ -206,6 +222,11 @@ PERIODIC_TASKS_PRODUCTION_ONLY = {
         "task": "kitsune.kpi.tasks.update_visitors_metric",
         "schedule": crontab(hour="2", minute="0"),
     },
+    # Daily at 00:30.
+    "update_kpi_rollups": {
+        "task": "kitsune.kpi.tasks.update_kpi_rollups",
+        "schedule": crontab(hour="0", minute="30"),
+    },
     # Questions Periodic Tasks
     # Daily at 23:00.
     "reload_question_traffic_stats": {
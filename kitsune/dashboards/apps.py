@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class DashboardsConfig(AppConfig):
     name = "kitsune.dashboards"
     default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        from kitsune.dashboards import snapshots
+
+        snapshots.register_signals()
@@ -1,14 +1,15 @@
 import itertools
 import logging
+from collections import Counter
 
-from django.db import IntegrityError, models, transaction
-from django.db.models import Q, Subquery
+from django.db import connection, models, transaction
 from django.utils.translation import gettext_lazy as _lazy
 
 from kitsune.dashboards import PERIODS
 from kitsune.products.models import Product
 from kitsune.sumo import googleanalytics
 from kitsune.sumo.models import LocaleField, ModelBase
+from kitsune.sumo.staging import CountStagingTable
 from kitsune.wiki.models import Document
 
 log = logging.getLogger("k.dashboards")
@@ -26,83 +27,56 @@ class WikiDocumentVisits(ModelBase):
 
     @classmethod
     def reload_period_from_analytics(cls, period, verbose=False):
-        """Replace the stats for the given period from Google Analytics."""
-        with transaction.atomic():
-            # First, let's clear out the previous results for this period.
-            if verbose:
-                log.info(
-                    f"Deleting all stale instances of {cls.__name__} with period = {period}..."
-                )
-
-            cls.objects.filter(period=period).delete()
+        """
+        Replace the stats for the given period from Google Analytics.
+
+        The GA4 report is consumed page by page as it arrives. Each page is resolved to
+        document ids and added to a temporary staging table, so memory use doesn't grow
+        with the size of the report. The stats for the period are then replaced from the
+        staging table in a single transaction, so readouts never see an empty period.
+        """
+        if verbose:
+            log.info("Loading the ids of all documents by locale and slug...")
+
+        document_ids = {
+            (locale, slug): pk
+            for pk, locale, slug in Document.objects.values_list("id", "locale", "slug").iterator()
+        }
+
+        if verbose:
+            log.info("Staging pageviews per article from GA4 data API...")
+
+        with CountStagingTable(f"{cls._meta.db_table}_staging") as staging:
+            rows = googleanalytics.iter_pageviews_by_document(period, verbose=verbose)
+            for page in itertools.batched(rows, googleanalytics.REPORT_PAGE_SIZE, strict=False):
+                visits_by_document_id = Counter()
+                for locale, slug, visits in page:
+                    document_id = document_ids.get((locale, slug))
+                    if document_id is not None:
+                        visits_by_document_id[document_id] += visits
+                staging.add(visits_by_document_id)
 
-            # Next, let's gather some data we need. We're sacrificing memory
-            # here in order to reduce the number of database queries later on.
             if verbose:
-                log.info("Gathering pageviews per article from GA4 data API...")
-
-            # At this point, this is a dictionary of integer values (visits).
-            instance_by_locale_and_slug = googleanalytics.pageviews_by_document(
-                period, verbose=verbose
-            )
-
-            # Replace the integer values (visits) with WikiDocumentVisits instances.
-            for (locale, slug), visits in instance_by_locale_and_slug.items():
-                instance_by_locale_and_slug[(locale, slug)] = cls(
-                    document_id=Subquery(
-                        Document.objects.filter(locale=locale, slug=slug).values("id")
-                    ),
-                    period=period,
-                    visits=visits,
+                log.info(f"Replacing the instances of {cls.__name__} with period = {period}...")
+
+            # Only copy rows that still refer to an existing Document, since one may have
+            # been deleted while the report was being staged.
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {cls._meta.db_table} WHERE period = %s "
+                    f"AND document_id NOT IN (SELECT key FROM {staging.name})",
+                    [period],
                 )
-
-            # Then we can create the fresh results for this period.
-            if verbose:
-                log.info(
-                    f"Creating {len(instance_by_locale_and_slug)} fresh instances of "
-                    f"{cls.__name__} with period = {period}..."
+                cursor.execute(
+                    f"INSERT INTO {cls._meta.db_table} (document_id, period, visits) "
+                    f"SELECT s.key, %s, s.value FROM {staging.name} s "
+                    f"JOIN {Document._meta.db_table} d ON d.id = s.key "
+                    "ON CONFLICT (period, document_id) DO UPDATE SET visits = EXCLUDED.visits",
+                    [period],
                 )
 
-            def create_batch(batch_of_locale_and_slug_queries):
-                """
-                Create a batch of instances in one shot, but only include instances that
-                refer to an existing Document, so we avoid triggering an integrity error.
-                A call to this function makes only two databases queries no matter how
-                many instances we need to validate and create.
-                """
-                cls.objects.bulk_create(
-                    [
-                        instance_by_locale_and_slug[locale_and_slug]
-                        for locale_and_slug in Document.objects.filter(
-                            batch_of_locale_and_slug_queries
-                        ).values_list("locale", "slug")
-                    ]
-                )
-
-            # Let's create the fresh instances in batches, so we avoid exposing ourselves to
-            # the possibility of transgressing some query size limit.
-            batch_size = 1000
-            for batch_of_pairs in itertools.batched(instance_by_locale_and_slug, batch_size, strict=False):
-                locale_and_slug_queries = Q()
-                for locale, slug in batch_of_pairs:
-                    locale_and_slug_queries |= Q(locale=locale, slug=slug)
-
-                if verbose:
-                    log.info(f"Creating a batch of {len(batch_of_pairs)} instances...")
-
-                try:
-                    with transaction.atomic():
-                        create_batch(locale_and_slug_queries)
-                except IntegrityError:
-                    # There is a very slim chance that one or more Documents have been deleted in
-                    # the moment of time between the formation of the list of valid instances and
-                    # actually creating them, so let's give it one more try, assuming there's an
-                    # even slimmer chance that lightning will strike twice. If this one fails,
-                    # we'll roll-back everything and give up on the entire effort.
-                    create_batch(locale_and_slug_queries)
-
-            if verbose:
-                log.info("Done.")
+        if verbose:
+            log.info("Done.")
 
 
 L10N_TOP20_CODE = "percent_localized_top20"
@@ -20,8 +20,9 @@ from django.utils.translation import gettext_lazy as _lazy
 from django.utils.translation import pgettext_lazy
 from markupsafe import Markup
 
-from kitsune.dashboards import LAST_30_DAYS, PERIODS
+from kitsune.dashboards import LAST_30_DAYS, PERIODS, snapshots
 from kitsune.dashboards.models import WikiDocumentVisits
+from kitsune.dashboards.utils import unhelpful_articles_key
 from kitsune.products.models import ProductSupportConfig
 from kitsune.sumo.redis_utils import RedisError, redis_client
 from kitsune.sumo.templatetags.jinja_helpers import urlparams
@@ -151,6 +152,22 @@ def kb_overview_rows(user=None, mode=None, max=None, locale=None, product=None,
     if mode is None:
         mode = LAST_30_DAYS
 
+    rows, _computed = snapshots.fetch(
+        "kb-overview", user, locale=locale, product=product, mode=mode, category=category, max=max
+    )
+    if max:
+        rows = rows[:max]
+
+    now = timezone.now()
+    for data in rows:
+        if data.get("expiry_date"):
+            data["stale"] = data["expiry_date"] < now
+
+    return rows
+
+
+def compute_kb_overview_rows(user, mode, locale, product, category, max=None):
+    """Compute the rows of the KB dashboard overview, without their staleness."""
     docs = (
         Document.objects.visible(user, locale=settings.WIKI_DEFAULT_LANGUAGE, is_archived=False)
         .exclude(html__startswith=REDIRECT_HTML)
@@ -245,9 +262,6 @@ def kb_overview_rows(user=None, mode=None, max=None, locale=None, product=None,
         if d.num_visits and max_visits:
             data["visits_ratio"] = float(d.num_visits) / max_visits
 
-        if data.get("expiry_date"):
-            data["stale"] = data["expiry_date"] < timezone.now()
-
         if d.unapproved_revision_comment is None:
             data["latest_revision"] = True
         else:
@@ -266,16 +280,8 @@ def kb_overview_rows(user=None, mode=None, max=None, locale=None, product=None,
     return rows
 
 
-def l10n_overview_rows(locale, product=None, user=None):
-    """Return the iterable of dicts needed to draw the Overview table."""
-    # The Overview table is a special case: it has only a static number of
-    # rows, so it has no expanded, all-rows view, and thus needs no slug, no
-    # "max" kwarg on rows(), etc. It doesn't fit the Readout signature, so we
-    # don't shoehorn it in.
-
-    def percent_or_100(num, denom):
-        return round(num / float(denom) * 100) if denom else 100
-
+def compute_l10n_overview_counts(locale, product, user):
+    """Compute the numbers of (up to date) translations behind the Overview table."""
     ignore_categories = [
         ADMINISTRATION_CATEGORY,
         NAVIGATION_CATEGORY,
@@ -390,6 +396,44 @@ def l10n_overview_rows(locale, product=None, user=None):
         num_translated=Count("pk", filter=Q(is_translated=True))
     )["num_translated"]
 
+    return {
+        "total_docs": total_docs,
+        "total_templates": total_templates,
+        "translated_docs": translated_docs,
+        "translated_templates": translated_templates,
+        "top_20_translated": top_20_translated,
+        "top_50_translated": top_50_translated,
+        "top_100_translated": top_100_translated,
+    }
+
+
+def l10n_overview_rows(locale, product=None, user=None, fresh=False):
+    """
+    Return the iterable of dicts needed to draw the Overview table.
+
+    The counts come from the shared snapshot, unless fresh is set, in which case
+    they're computed right away.
+    """
+    # The Overview table is a special case: it has only a static number of
+    # rows, so it has no expanded, all-rows view, and thus needs no slug, no
+    # "max" kwarg on rows(), etc. It doesn't fit the Readout signature, so we
+    # don't shoehorn it in.
+
+    def percent_or_100(num, denom):
+        return round(num / float(denom) * 100) if denom else 100
+
+    if fresh:
+        counts = compute_l10n_overview_counts(locale, product, user)
+    else:
+        counts, _computed = snapshots.fetch("l10n-overview", user, locale=locale, product=product)
+    total_docs = counts["total_docs"]
+    total_templates = counts["total_templates"]
+    translated_docs = counts["translated_docs"]
+    translated_templates = counts["translated_templates"]
+    top_20_translated = counts["top_20_translated"]
+    top_50_translated = counts["top_50_translated"]
+    top_100_translated = counts["top_100_translated"]
+
     return {
         "top-20": {
             # L10n: This is an entry header for the Overview table, displayed on
@@ -495,6 +539,8 @@ class Readout:
         self.mode = mode if mode is not None else self.default_mode
         # self.mode is allowed to be invalid.
         self.product = product
+        # When the rows were computed, if they came from a shared snapshot.
+        self.computed = None
 
     def rows(self, max=None):
         """Return an iterable of dicts containing the data for the table.
@@ -506,7 +552,19 @@ class Readout:
         Limit to `max` rows.
 
         """
-        return self.sort_and_truncate([self.row_to_dict(r) for r in self.get_queryset(max)], max)
+        return self.sort_and_truncate([self.row_to_dict(r) for r in self.fetch(max)], max)
+
+    def fetch(self, max=None):
+        """Return the results of get_queryset, from the readout's snapshot if possible."""
+        results, self.computed = snapshots.fetch(
+            self.slug,
+            self.user,
+            locale=self.locale,
+            product=self.product,
+            mode=self.mode,
+            max=max,
+        )
+        return results[:max] if max else results
 
     def render(self, max_rows=None, rows=None):
         """Return HTML table rows, optionally limiting to a number of rows."""
@@ -531,6 +589,7 @@ class Readout:
                 "rows": rows,
                 "column3_label": self.column3_label,
                 "column4_label": self.column4_label,
+                "computed": self.computed,
             },
             request=self.request,
         )
@@ -967,6 +1026,10 @@ class TemplateTranslationsReadout(Readout):
             "needs_review",
         )
 
+    def fetch(self, max=None):
+        # The rows are sorted after they're fetched, so they're truncated then.
+        return super().fetch()
+
     def row_to_dict(self, row):
         (eng_slug, eng_title, slug, title, significance, needs_review) = row
         return row_to_dict_with_out_of_dateness(
@@ -1101,7 +1164,8 @@ class UnhelpfulReadout(Readout):
         hide_readout = True
 
     def rows(self, max=None):
-        REDIS_KEY = settings.HELPFULVOTES_UNHELPFUL_KEY
+        # The articles are those of the default locale, and of the product if given.
+        REDIS_KEY = unhelpful_articles_key(product_id=self.product and self.product.id)
         try:
             redis = redis_client("helpfulvotes")
             length = redis.llen(REDIS_KEY)
@@ -1122,12 +1186,6 @@ class UnhelpfulReadout(Readout):
     def row_to_dict(self, strresult):
         result = strresult.split("::")
 
-        # Filter by product
-        if self.product:
-            doc = Document.objects.filter(products__in=[self.product], slug=result[5])
-            if not doc.count():
-                return None
-
         helpfulness = Markup(
             '<span title="{:+.1f}%">{:.1f}%</span>'.format(
                 float(result[3]) * 100, float(result[2]) * 100
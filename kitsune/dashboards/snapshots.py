@@ -0,0 +1,169 @@
+"""
+Snapshots of the KB dashboard readouts.
+
+The readouts are expensive aggregates over documents, revisions and visits, but they
+only change when a document or revision is saved or the visits are reloaded. Each of
+those bumps a generation number, and the rows of each readout are kept in the cache
+per (readout, locale, product, mode, category, audience), along with the generation
+they were computed at and when. Reading a snapshot of an older generation returns it
+as is and refreshes it in the background, so a dashboard never waits for a readout
+query once it has been computed.
+
+Readouts are filtered by what the user may see, so snapshots are only shared by users
+who see the same documents: the "public" audience (anonymous users and contributors
+without any special visibility) and the "all" audience (staff and superusers).
+Everyone else gets the rows computed for them on the spot.
+"""
+
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from kitsune.dashboards.models import WikiDocumentVisits
+from kitsune.products.models import Product
+from kitsune.sumo.utils import in_staff_group
+from kitsune.wiki.models import Document, Revision
+from kitsune.wiki.permissions import can_delete_documents_or_review_revisions
+
+GENERATION_CACHE_KEY = "dashboards:snapshots:generation"
+SNAPSHOT_CACHE_KEY = "dashboards:snapshot:{name}:{locale}:{product}:{mode}:{category}:{audience}"
+REFRESH_LOCK_TIMEOUT = 60 * 5
+
+PUBLIC = "public"
+ALL = "all"
+
+
+def current_generation():
+    return cache.get_or_set(GENERATION_CACHE_KEY, lambda: uuid4().hex, None)
+
+
+def invalidate():
+    """Mark every snapshot as out of date."""
+    cache.set(GENERATION_CACHE_KEY, uuid4().hex, None)
+
+
+def get_audience(user, locale):
+    """
+    Return the audience whose snapshots show the given user what they may see in the
+    given locale, or None if the user's view of the documents is their own.
+    """
+    if not (user and user.is_authenticated):
+        return PUBLIC
+
+    memo = user.__dict__.setdefault("_dashboard_audiences", {})
+    if locale not in memo:
+        if user.is_superuser or in_staff_group(user):
+            memo[locale] = ALL
+        elif (
+            any(
+                can_delete_documents_or_review_revisions(user, locale=each)
+                for each in {locale, settings.WIKI_DEFAULT_LANGUAGE}
+            )
+            or Document.restrict_to_groups.through.objects.filter(
+                group__in=user.groups.all()  # noqa: group-leak
+            ).exists()
+            or Revision.objects.filter(
+                creator=user, document__current_revision__isnull=True
+            ).exists()
+        ):
+            memo[locale] = None
+        else:
+            memo[locale] = PUBLIC
+    return memo[locale]
+
+
+def _audience_user(audience):
+    return User(is_superuser=True) if audience == ALL else None
+
+
+def _compute(name, user, locale, product, mode, category, max=None):
+    from kitsune.dashboards import readouts
+
+    if name == "kb-overview":
+        return readouts.compute_kb_overview_rows(user, mode, locale, product, category, max)
+    if name == "l10n-overview":
+        return readouts.compute_l10n_overview_counts(locale, product, user)
+
+    readout = readouts.READOUTS[name](None, locale=locale, mode=mode, product=product)
+    readout.user = user
+    return list(readout.get_queryset(max))
+
+
+def _key(name, audience, locale, product_id, mode, category):
+    return SNAPSHOT_CACHE_KEY.format(
+        name=name,
+        locale=locale,
+        product=product_id,
+        mode=mode,
+        category=category,
+        audience=audience,
+    )
+
+
+def refresh(name, audience, locale, product=None, mode=None, category=None):
+    """Compute and store the snapshot, and return it."""
+    key = _key(name, audience, locale, product and product.id, mode, category)
+    # Read the generation first, so changes made while computing mark it as out of date.
+    snapshot = {
+        "generation": current_generation(),
+        "computed": timezone.now(),
+        "data": _compute(name, _audience_user(audience), locale, product, mode, category),
+    }
+    cache.set(key, snapshot, settings.CACHE_LONG_TIMEOUT)
+    cache.delete(f"{key}:refreshing")
+    return snapshot
+
+
+def fetch(name, user, *, locale, product=None, mode=None, category=None, max=None):
+    """
+    Return the data of the readout with the given name, and when it was computed, or
+    None for the latter if it was computed just for the given user.
+
+    Data computed just for the user is limited to ``max`` rows in the query. Snapshots
+    are shared by every ``max``, so they're never limited.
+    """
+    audience = get_audience(user, locale)
+    if audience is None:
+        return _compute(name, user, locale, product, mode, category, max), None
+
+    key = _key(name, audience, locale, product and product.id, mode, category)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = refresh(name, audience, locale, product, mode, category)
+    elif snapshot["generation"] != current_generation() and cache.add(
+        f"{key}:refreshing", True, REFRESH_LOCK_TIMEOUT
+    ):
+        from kitsune.dashboards.tasks import refresh_readout_snapshot
+
+        refresh_readout_snapshot.delay(
+            name, audience, locale, product and product.id, mode, category
+        )
+        # Pick up the refreshed snapshot if the task ran eagerly.
+        snapshot = cache.get(key, snapshot)
+    return snapshot["data"], snapshot["computed"]
+
+
+def refresh_by_product_id(name, audience, locale, product_id, mode, category):
+    product = Product.objects.filter(id=product_id).first() if product_id else None
+    if product_id and not product:
+        return
+    refresh(name, audience, locale, product, mode, category)
+
+
+def _invalidate(sender, **kwargs):
+    invalidate()
+    # Snapshots refreshed before the change is committed can't see it, so once more.
+    transaction.on_commit(invalidate)
+
+
+def register_signals():
+    for sender in (Document, Revision, WikiDocumentVisits):
+        post_save.connect(_invalidate, sender=sender)
+        post_delete.connect(_invalidate, sender=sender)
+    m2m_changed.connect(_invalidate, sender=Document.products.through)
+    m2m_changed.connect(_invalidate, sender=Document.restrict_to_groups.through)
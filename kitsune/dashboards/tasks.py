@@ -1,9 +1,13 @@
-from datetime import date
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
+from operator import itemgetter
 
 from celery import shared_task
 from django.conf import settings
-from django.db import connection
+from django.db.models import Count, F, Q
+from django.utils import timezone
 
+from kitsune.dashboards import snapshots
 from kitsune.dashboards.metrics import warm_wiki_metrics_cache
 from kitsune.dashboards.models import (
     L10N_ACTIVE_CONTRIBUTORS_CODE,
@@ -15,35 +19,13 @@ from kitsune.dashboards.models import (
     WikiMetric,
 )
 from kitsune.dashboards.readouts import l10n_overview_rows
+from kitsune.dashboards.utils import unhelpful_articles_key
 from kitsune.products.models import Product
 from kitsune.sumo.decorators import skip_if_read_only_mode
 from kitsune.sumo.redis_utils import redis_client
-from kitsune.wiki.models import Document
+from kitsune.wiki.models import Document, HelpfulVote
 from kitsune.wiki.utils import num_active_contributors
 
-HELPFUL_AGGREGATE = "SUM(CASE WHEN limitedvotes.helpful THEN 1 ELSE 0 END)"
-UNHELPFUL_AGGREGATE = "SUM(CASE WHEN limitedvotes.helpful THEN 0 ELSE 1 END)"
-SQL_UNHELPFUL = f"""
-    SELECT doc_id, yes, no
-    FROM
-        (SELECT wiki_revision.document_id as doc_id,
-            {HELPFUL_AGGREGATE} as yes,
-            {UNHELPFUL_AGGREGATE} as no
-        FROM
-            (SELECT *
-             FROM wiki_helpfulvote
-             WHERE {{}}) as limitedvotes
-        INNER JOIN wiki_revision ON
-            limitedvotes.revision_id=wiki_revision.id
-        INNER JOIN wiki_document ON
-            wiki_document.id=wiki_revision.document_id
-        WHERE wiki_document.locale='en-US'
-        GROUP BY doc_id
-        HAVING {UNHELPFUL_AGGREGATE} > {HELPFUL_AGGREGATE}) as calculated
-"""
-TWO_WEEKS_AGO = "created <= (CURRENT_DATE - 7) AND created >= (CURRENT_DATE - 14)"
-PAST_WEEK = "created >= CURRENT_DATE - 7"
-
 
 @shared_task
 @skip_if_read_only_mode
@@ -63,8 +45,9 @@ def update_l10n_coverage_metrics() -> None:
 
         # Loop through all enabled products, including None (really All).
         for product in [None, *list(Product.objects.filter(visible=True))]:
-            # (Ab)use the l10n_overview_rows helper from the readouts.
-            rows = l10n_overview_rows(locale=locale, product=product)
+            # (Ab)use the l10n_overview_rows helper from the readouts, with up to date
+            # counts rather than a snapshot which may be stale.
+            rows = l10n_overview_rows(locale=locale, product=product, fresh=True)
 
             # % of top 20 articles
             top20 = rows["top-20"]
@@ -114,122 +97,119 @@ def update_l10n_coverage_metrics() -> None:
 def reload_wiki_traffic_stats(verbose: bool = True) -> None:
     for period, _ in PERIODS:
         WikiDocumentVisits.reload_period_from_analytics(period, verbose=verbose)
+    # The readouts are ordered by visits.
+    snapshots.invalidate()
 
 
-def _get_old_unhelpful():
-    """
-    Gets the data from 2 weeks ago and formats it as output so that we can
-    get a percent change.
-    """
-
-    old_formatted = {}
-    with connection.cursor() as cursor:
-        cursor.execute(SQL_UNHELPFUL.format(TWO_WEEKS_AGO))
-        old_data = cursor.fetchall()
-
-    for data in old_data:
-        doc_id = data[0]
-        yes = float(data[1])
-        no = float(data[2])
-        total = yes + no
-        if total == 0:
-            continue
-        old_formatted[doc_id] = {"total": total, "percentage": yes / total}
-
-    return old_formatted
+@shared_task
+def refresh_readout_snapshot(name, audience, locale, product_id, mode, category) -> None:
+    """Recompute a snapshot of a KB dashboard readout that is out of date."""
+    snapshots.refresh_by_product_id(name, audience, locale, product_id, mode, category)
 
 
-def _get_current_unhelpful(old_formatted):
-    """Gets the data for the past week and formats it as return value."""
+def _get_unhelpful_stats():
+    """
+    Return the helpful and unhelpful vote counts of the past week, and of the week
+    before, of each document that got more unhelpful votes than helpful ones in the past
+    week, along with its locale, slug and title.
+    """
+    today = datetime.combine(timezone.now().astimezone(UTC).date(), time.min, tzinfo=UTC)
+    week_ago = today - timedelta(days=7)
+    current = Q(created__gte=week_ago)
+    old = Q(created__lte=week_ago)
+    return list(
+        HelpfulVote.objects.filter(created__gte=today - timedelta(days=14))
+        .values(
+            doc_id=F("revision__document_id"),
+            locale=F("revision__document__locale"),
+            slug=F("revision__document__slug"),
+            title=F("revision__document__title"),
+        )
+        .annotate(
+            yes=Count("id", filter=current & Q(helpful=True)),
+            no=Count("id", filter=current & Q(helpful=False)),
+            old_yes=Count("id", filter=old & Q(helpful=True)),
+            old_no=Count("id", filter=old & Q(helpful=False)),
+        )
+        .filter(no__gt=F("yes"))
+        .order_by()
+    )
 
-    final = {}
-    with connection.cursor() as cursor:
-        cursor.execute(SQL_UNHELPFUL.format(PAST_WEEK))
-        current_data = cursor.fetchall()
 
-    for data in current_data:
-        doc_id = data[0]
-        yes = float(data[1])
-        no = float(data[2])
-        total = yes + no
-        if total == 0:
-            continue
-        percentage = yes / total
-        if doc_id in old_formatted:
-            final[doc_id] = {
-                "total": total,
-                "currperc": percentage,
-                "diffperc": percentage - old_formatted[doc_id]["percentage"],
-            }
+def _rank_unhelpful(stats):
+    """
+    Return the given document stats as entries of the unhelpful articles list, ranked by
+    the Bayesian average of their helpfulness, the most unhelpful first.
+    """
+    totals = [float(row["yes"] + row["no"]) for row in stats]
+    percentages = [row["yes"] / total for row, total in zip(stats, totals, strict=True)]
+    mean_total = sum(totals) / len(totals)
+    mean_percentage = sum(percentages) / len(percentages)
+    max_total = max(totals)
+
+    entries = []
+    for row, total, percentage in zip(stats, totals, percentages, strict=True):
+        # Documents that weren't unhelpful the week before show no change.
+        old_total = row["old_yes"] + row["old_no"]
+        if row["old_no"] > row["old_yes"]:
+            difference = percentage - row["old_yes"] / old_total
         else:
-            final[doc_id] = {"total": total, "currperc": percentage, "diffperc": 0.0}
+            difference = 0.0
+        bayes_avg = (mean_percentage * mean_total + percentage * total) / (mean_total + total)
+        entry = "{}::{}::{}::{}::{}::{}::{}".format(
+            row["doc_id"],  # Document ID
+            total,  # Total Votes
+            percentage,  # Current Percentage
+            difference,  # Difference in Percentage
+            1 - (total / max_total),  # Graph Color
+            row["slug"],  # Document slug
+            row["title"],  # Document title
+        )
+        entries.append((bayes_avg, entry))
 
-    return final
+    entries.sort(key=itemgetter(0))
+    return [entry for bayes_avg, entry in entries]
 
 
 @shared_task
 @skip_if_read_only_mode
 def cache_most_unhelpful_kb_articles() -> None:
-    """Calculate and save the most unhelpful KB articles in the past two weeks."""
-
-    REDIS_KEY = settings.HELPFULVOTES_UNHELPFUL_KEY
-
-    old_formatted = _get_old_unhelpful()
-    final = _get_current_unhelpful(old_formatted)
-
-    if final == {}:
-        return
-
-    def _mean(vals):
-        """Argument: List of floats"""
-        if len(vals) == 0:
-            return None
-        return sum(vals) / len(vals)
-
-    def _bayes_avg(C, m, R, v):
-        # Bayesian Average
-        # C = mean vote, v = number of votes,
-        # R = mean rating, m = minimum votes to list in topranked
-        return (C * m + R * v) / (m + v)
-
-    mean_perc = _mean([float(final[key]["currperc"]) for key in list(final.keys())])
-    mean_total = _mean([float(final[key]["total"]) for key in list(final.keys())])
-
-    #  TODO: Make this into namedtuples
-    sorted_final = [
-        (
-            key,
-            final[key]["total"],
-            final[key]["currperc"],
-            final[key]["diffperc"],
-            _bayes_avg(mean_perc, mean_total, final[key]["currperc"], final[key]["total"]),
-        )
-        for key in list(final.keys())
-    ]
-    sorted_final.sort(key=lambda entry: entry[4])  # Sort by Bayesian Avg
+    """
+    Calculate and save the most unhelpful KB articles in the past two weeks, for each
+    locale and for each product within it.
+    """
+    stats = _get_unhelpful_stats()
 
-    redis = redis_client("helpfulvotes")
+    product_ids = defaultdict(list)
+    for doc_id, product_id in Document.products.through.objects.filter(
+        document_id__in=[row["doc_id"] for row in stats]
+    ).values_list("document_id", "product_id"):
+        product_ids[doc_id].append(product_id)
 
-    redis.delete(REDIS_KEY)
-
-    max_total = max([b[1] for b in sorted_final])
-
-    for entry in sorted_final:
-        doc = Document.objects.get(pk=entry[0])
-        redis.rpush(
-            REDIS_KEY,
-            (
-                "{}::{}::{}::{}::{}::{}::{}".format(
-                    entry[0],  # Document ID
-                    entry[1],  # Total Votes
-                    entry[2],  # Current Percentage
-                    entry[3],  # Difference in Percentage
-                    1 - (entry[1] / max_total),  # Graph Color
-                    doc.slug,  # Document slug
-                    doc.title,  # Document title
-                )
-            ),
-        )
+    variants = defaultdict(list)
+    for row in stats:
+        variants[unhelpful_articles_key(row["locale"])].append(row)
+        for product_id in product_ids[row["doc_id"]]:
+            variants[unhelpful_articles_key(row["locale"], product_id)].append(row)
+
+    redis = redis_client("helpfulvotes")
+    # Drop the lists of the variants without any unhelpful articles anymore.
+    stale_keys = (
+        redis.smembers(settings.HELPFULVOTES_UNHELPFUL_KEYS_KEY)
+        | {settings.HELPFULVOTES_UNHELPFUL_KEY}
+    ) - variants.keys()
+
+    # Replace all the lists at once, so the readout never sees them half-written.
+    pipe = redis.pipeline()
+    if stale_keys:
+        pipe.delete(*stale_keys)
+    for key, rows in variants.items():
+        pipe.delete(key)
+        pipe.rpush(key, *_rank_unhelpful(rows))
+    pipe.delete(settings.HELPFULVOTES_UNHELPFUL_KEYS_KEY)
+    if variants:
+        pipe.sadd(settings.HELPFULVOTES_UNHELPFUL_KEYS_KEY, *variants)
+    pipe.execute()
 
 
 @shared_task
@@ -1,4 +1,5 @@
 from datetime import date, timedelta
+from unittest import mock
 
 from django.conf import settings
 from django.test import tag
@@ -10,12 +11,12 @@ from kitsune.dashboards.models import (
     WikiMetric,
 )
 from kitsune.dashboards.tasks import (
-    _get_current_unhelpful,
-    _get_old_unhelpful,
+    _get_unhelpful_stats,
     cache_most_unhelpful_kb_articles,
     update_l10n_contributor_metrics,
     update_l10n_coverage_metrics,
 )
+from kitsune.dashboards.utils import unhelpful_articles_key
 from kitsune.products.tests import ProductFactory
 from kitsune.sumo.redis_utils import RedisError, redis_client
 from kitsune.sumo.tests import SkipTest, TestCase
@@ -39,46 +40,12 @@ def _make_backdated_revision(backdate):
 
 
 class TopUnhelpfulArticlesTests(TestCase):
-    def test_no_old_articles(self):
-        """Make sure _get_old_articles() returns nothing with no votes."""
-        result = _get_old_unhelpful()
-        self.assertEqual(0, len(result))
-
-    def test_no_current_articles(self):
-        """Make sure _get_current_articles() returns nothing with no votes."""
-        result = _get_current_unhelpful({})
-        self.assertEqual(0, len(result))
-
-    def test_old_articles(self):
-        """Returns unhelpful votes within time range"""
-        r = _make_backdated_revision(10)
-
-        # Add 4 no votes 1.5 weeks ago
-        for x in range(4):
-            _add_vote_in_past(r, 0, 10)
-
-        # Add 1 yes vote 1.5 weeks ago
-        _add_vote_in_past(r, 1, 10)
-
-        result = _get_old_unhelpful()
-        self.assertEqual(1, len(result))
-        self.assertAlmostEqual(0.2, result[r.document.id]["percentage"])
-        self.assertEqual(5, result[r.document.id]["total"])
-
-    def test_old_articles_helpful(self):
-        """Doesn't return helpful votes within range"""
-        r = _make_backdated_revision(90)
-
-        for x in range(0, 4):
-            _add_vote_in_past(r, 1, 10)
-
-        _add_vote_in_past(r, 0, 10)
-
-        result = _get_old_unhelpful()
-        self.assertEqual(0, len(result))
+    def test_no_articles(self):
+        """Make sure _get_unhelpful_stats() returns nothing with no votes."""
+        self.assertEqual([], _get_unhelpful_stats())
 
-    def test_current_articles(self):
-        """Returns unhelpful votes within time range"""
+    def test_current_and_old_votes(self):
+        """Counts the votes of the past week and of the week before."""
         r = _make_backdated_revision(90)
 
         for x in range(0, 3):
@@ -87,18 +54,22 @@ class TopUnhelpfulArticlesTests(TestCase):
         for x in range(0, 2):
             _add_vote_in_past(r, 1, 3)
 
-        old_data = {r.document.id: {"percentage": 0.2, "total": 5.0}}
+        for x in range(0, 4):
+            _add_vote_in_past(r, 0, 10)
 
-        result = _get_current_unhelpful(old_data)
-        self.assertEqual(1, len(result))
-        self.assertAlmostEqual(0.4, result[r.document.id]["currperc"])
-        self.assertAlmostEqual(
-            0.4 - old_data[r.document.id]["percentage"], result[r.document.id]["diffperc"]
-        )
-        self.assertEqual(5, result[r.document.id]["total"])
+        _add_vote_in_past(r, 1, 10)
+
+        # Votes older than two weeks aren't counted.
+        _add_vote_in_past(r, 0, 20)
+
+        (row,) = _get_unhelpful_stats()
+        self.assertEqual(r.document.id, row["doc_id"])
+        self.assertEqual(r.document.locale, row["locale"])
+        self.assertEqual(r.document.slug, row["slug"])
+        self.assertEqual((2, 3, 1, 4), (row["yes"], row["no"], row["old_yes"], row["old_no"]))
 
     def test_current_articles_helpful(self):
-        """Doesn't return helpful votes within time range"""
+        """Doesn't return documents helpful in the past week."""
         r = _make_backdated_revision(90)
 
         for x in range(0, 3):
@@ -107,29 +78,19 @@ class TopUnhelpfulArticlesTests(TestCase):
         for x in range(0, 2):
             _add_vote_in_past(r, 0, 3)
 
-        old_data = {r.document.id: {"percentage": 0.2, "total": 5.0}}
+        for x in range(0, 4):
+            _add_vote_in_past(r, 0, 10)
 
-        result = _get_current_unhelpful(old_data)
-        self.assertEqual(0, len(result))
+        self.assertEqual([], _get_unhelpful_stats())
 
-    def test_current_articles_not_in_old(self):
-        """Unhelpful articles in current but not in old works"""
+    def test_old_articles_only(self):
+        """Doesn't return documents that only got votes the week before."""
         r = _make_backdated_revision(90)
 
-        for x in range(0, 3):
-            _add_vote_in_past(r, 0, 3)
-
-        for x in range(0, 2):
-            _add_vote_in_past(r, 1, 3)
-
-        old_data = {}
-
-        result = _get_current_unhelpful(old_data)
+        for x in range(0, 4):
+            _add_vote_in_past(r, 0, 10)
 
-        self.assertEqual(1, len(result))
-        self.assertAlmostEqual(0.4, result[r.document.id]["currperc"])
-        self.assertAlmostEqual(0, result[r.document.id]["diffperc"])
-        self.assertEqual(5, result[r.document.id]["total"])
+        self.assertEqual([], _get_unhelpful_stats())
 
 
 @tag("no_parallel")
@@ -252,8 +213,40 @@ class TopUnhelpfulArticlesCommandTests(TestCase):
         assert "%d::%.1f:" % (r3.document.id, 122.0) in result[1]
         assert "%d::%.1f:" % (r.document.id, 102.0) in result[2]
 
+    def test_caching_by_locale_and_product(self):
+        """Each locale, and each product within it, gets its own list."""
+        product = ProductFactory()
+        r = _make_backdated_revision(90)
+        r.document.products.add(product)
+        r2 = RevisionFactory(document__locale="de", created=date.today() - timedelta(days=90))
+
+        for rev in (r, r2):
+            _add_vote_in_past(rev, 0, 3)
+
+        cache_most_unhelpful_kb_articles()
+
+        def doc_ids(key):
+            return [int(entry.split("::")[0]) for entry in self.redis.lrange(key, 0, -1)]
+
+        self.assertEqual([r.document.id], doc_ids(self.REDIS_KEY))
+        self.assertEqual([r.document.id], doc_ids(unhelpful_articles_key(product_id=product.id)))
+        self.assertEqual([r2.document.id], doc_ids(unhelpful_articles_key("de")))
+
+        # Lists without any unhelpful articles anymore are dropped.
+        _add_vote_in_past(r2, 1, 3)
+        _add_vote_in_past(r2, 1, 3)
+        cache_most_unhelpful_kb_articles()
+        self.assertEqual(0, self.redis.llen(unhelpful_articles_key("de")))
+        self.assertEqual([r.document.id], doc_ids(self.REDIS_KEY))
+
 
 class L10nMetricsTests(TestCase):
+    @mock.patch("kitsune.dashboards.snapshots.fetch")
+    def test_update_l10n_coverage_metrics_skips_snapshots(self, fetch):
+        """The metrics are computed from the documents, never from a stale snapshot."""
+        update_l10n_coverage_metrics()
+        fetch.assert_not_called()
+
     def test_update_l10n_coverage_metrics(self):
         """Test the command that updates l10n coverage metrics."""
         p = ProductFactory(visible=True)
@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from kitsune.dashboards import LAST_7_DAYS
+from kitsune.dashboards import LAST_7_DAYS, LAST_30_DAYS
 from kitsune.dashboards.models import WikiDocumentVisits, googleanalytics
 from kitsune.sumo.tests import TestCase
 from kitsune.wiki.tests import ApprovedRevisionFactory
@@ -9,21 +9,21 @@ from kitsune.wiki.tests import ApprovedRevisionFactory
 class DocumentVisitsTests(TestCase):
     """Tests for the pageview statistics gathering."""
 
-    @patch.object(googleanalytics, "pageviews_by_document")
-    def test_visit_count_from_analytics(self, pageviews_by_document):
+    @patch.object(googleanalytics, "iter_pageviews_by_document")
+    def test_visit_count_from_analytics(self, iter_pageviews_by_document):
         """Verify stored visit counts."""
         d1 = ApprovedRevisionFactory(document__slug="doc1-slug").document
         d2 = ApprovedRevisionFactory(document__slug="doc2-slug").document
         d3 = ApprovedRevisionFactory(document__slug="doc3-slüg").document
 
-        pageviews_by_document.return_value = dict(
-            row
-            for row in (
-                (("en-US", d1.slug), 1000),
-                (("es", "no-existe"), 150),
-                (("en-US", d2.slug), 2000),
-                (("en-US", d3.slug), 3000),
-                (("de", "nicht-existent"), 350),
+        iter_pageviews_by_document.return_value = iter(
+            (
+                ("en-US", d1.slug, 1000),
+                ("es", "no-existe", 150),
+                ("en-US", d2.slug, 1500),
+                ("en-US", d3.slug, 3000),
+                ("de", "nicht-existent", 350),
+                ("en-US", d2.slug, 500),
             )
         )
 
@@ -39,3 +39,21 @@ class DocumentVisitsTests(TestCase):
         wdv3 = WikiDocumentVisits.objects.get(document=d3)
         self.assertEqual(3000, wdv3.visits)
         self.assertEqual(LAST_7_DAYS, wdv2.period)
+
+    @patch.object(googleanalytics, "iter_pageviews_by_document")
+    def test_reload_replaces_only_the_given_period(self, iter_pageviews_by_document):
+        """Stale stats are replaced or removed, and other periods are left alone."""
+        d1 = ApprovedRevisionFactory().document
+        d2 = ApprovedRevisionFactory().document
+        WikiDocumentVisits.objects.create(document=d1, period=LAST_7_DAYS, visits=1)
+        WikiDocumentVisits.objects.create(document=d2, period=LAST_7_DAYS, visits=2)
+        WikiDocumentVisits.objects.create(document=d2, period=LAST_30_DAYS, visits=3)
+
+        iter_pageviews_by_document.return_value = iter(((d1.locale, d1.slug, 10),))
+
+        WikiDocumentVisits.reload_period_from_analytics(LAST_7_DAYS)
+
+        self.assertEqual(
+            set(WikiDocumentVisits.objects.values_list("document", "period", "visits")),
+            {(d1.id, LAST_7_DAYS, 10), (d2.id, LAST_30_DAYS, 3)},
+        )
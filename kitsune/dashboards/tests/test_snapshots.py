@@ -0,0 +1,64 @@
+from django.conf import settings
+
+from kitsune.dashboards import snapshots
+from kitsune.dashboards.readouts import MostVisitedDefaultLanguageReadout
+from kitsune.sumo.tests import TestCase
+from kitsune.users.tests import UserFactory, add_permission
+from kitsune.wiki.models import Revision
+from kitsune.wiki.tests import ApprovedRevisionFactory, DocumentFactory, RevisionFactory
+
+
+class MockRequest:
+    LANGUAGE_CODE = settings.WIKI_DEFAULT_LANGUAGE
+
+
+class SnapshotTests(TestCase):
+    def readout(self, user=None):
+        request = MockRequest()
+        if user:
+            request.user = user
+        return MostVisitedDefaultLanguageReadout(request)
+
+    def titles(self, readout):
+        return [row["title"] for row in readout.rows()]
+
+    def test_rows_are_shared(self):
+        first = ApprovedRevisionFactory().document
+        readout = self.readout()
+        self.assertEqual([first.title], self.titles(readout))
+        self.assertIsNotNone(readout.computed)
+
+        with self.assertNumQueries(0):
+            self.assertEqual([first.title], self.titles(self.readout()))
+
+    def test_changes_refresh_rows(self):
+        first = ApprovedRevisionFactory().document
+        self.assertEqual([first.title], self.titles(self.readout()))
+
+        second = ApprovedRevisionFactory().document
+        self.assertEqual({first.title, second.title}, set(self.titles(self.readout())))
+
+    def test_audiences(self):
+        contributor = UserFactory()
+        self.assertEqual(snapshots.PUBLIC, snapshots.get_audience(contributor, "de"))
+        self.assertEqual(
+            snapshots.ALL, snapshots.get_audience(UserFactory(is_superuser=True), "de")
+        )
+
+        reviewer = UserFactory()
+        add_permission(reviewer, Revision, "review_revision")
+        self.assertIsNone(snapshots.get_audience(reviewer, "de"))
+
+        author = UserFactory()
+        RevisionFactory(document=DocumentFactory(), creator=author, is_approved=False)
+        self.assertIsNone(snapshots.get_audience(author, "de"))
+
+    def test_private_rows_are_not_shared(self):
+        author = UserFactory()
+        unapproved = RevisionFactory(creator=author, is_approved=False).document
+        approved = ApprovedRevisionFactory().document
+        self.assertEqual([approved.title], self.titles(self.readout()))
+
+        readout = self.readout(user=author)
+        self.assertEqual({approved.title, unapproved.title}, set(self.titles(readout)))
+        self.assertIsNone(readout.computed)
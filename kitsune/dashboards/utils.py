@@ -19,6 +19,13 @@ from kitsune.wiki.events import (
 log = logging.getLogger("k.dashboards")
 
 
+def unhelpful_articles_key(locale=settings.WIKI_DEFAULT_LANGUAGE, product_id=None):
+    """Return the redis key of the list of unhelpful articles of a locale and product."""
+    if locale == settings.WIKI_DEFAULT_LANGUAGE and product_id is None:
+        return settings.HELPFULVOTES_UNHELPFUL_KEY
+    return f"{settings.HELPFULVOTES_UNHELPFUL_KEY}:{locale}:{product_id or 'all'}"
+
+
 def render_readouts(request, readouts, template, locale=None, extra_data=None, product=None):
     """Render a readouts, possibly with overview page.
 
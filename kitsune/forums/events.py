@@ -22,9 +22,11 @@ class NewPostEvent(InstanceEvent):
         # Need to store the reply for _mails
         self.reply = reply
 
-    def send_emails(self, exclude=None):
+    def send_emails(self, exclude=None, fan_out=None):
         """Notify not only watchers of this thread but of the parent forum."""
-        return EventUnion(self, NewThreadEvent(self.reply)).send_emails(exclude=exclude)
+        return EventUnion(self, NewThreadEvent(self.reply)).send_emails(
+            exclude=exclude, fan_out=fan_out
+        )
 
     def _mails(self, users_and_watches):
         post_url = add_utm(self.reply.get_absolute_url(), "forums-post")
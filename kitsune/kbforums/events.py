@@ -68,11 +68,11 @@ class NewPostEvent(InstanceEvent):
         # Need to store the reply for _mails
         self.reply = reply
 
-    def send_emails(self, exclude=None):
+    def send_emails(self, exclude=None, fan_out=None):
         """Notify watchers of this thread, of the document, and of the locale."""
         return EventUnion(
             self, NewThreadEvent(self.reply), NewPostInLocaleEvent(self.reply)
-        ).send_emails(exclude=exclude)
+        ).send_emails(exclude=exclude, fan_out=fan_out)
 
     def _users_watching(self, **kwargs):
         users_and_watches = super()._users_watching(**kwargs)
@@ -106,9 +106,11 @@ class NewThreadEvent(InstanceEvent):
         # Need to store the post for _mails
         self.post = post
 
-    def send_emails(self, exclude=None):
+    def send_emails(self, exclude=None, fan_out=None):
         """Notify watches of the document and of the locale."""
-        return EventUnion(self, NewThreadInLocaleEvent(self.post)).send_emails(exclude=exclude)
+        return EventUnion(self, NewThreadInLocaleEvent(self.post)).send_emails(
+            exclude=exclude, fan_out=fan_out
+        )
 
     def _users_watching(self, **kwargs):
         users_and_watches = super()._users_watching(**kwargs)
@@ -1,15 +1,10 @@
-from collections import defaultdict
-from datetime import date, timedelta
-from functools import reduce
+import time
 from operator import itemgetter
 
 import django_filters
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connections, router
-from django.db.models import Count, F
-from django.db.models.functions import Now
-from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import serializers, viewsets
 from rest_framework.response import Response
@@ -26,14 +21,19 @@ from kitsune.kpi.models import (
     MetricKind,
     RetentionMetric,
 )
-from kitsune.questions.models import Answer, AnswerVote, Question
+from kitsune.kpi.rollups import ANSWER_VOTE_CODES, KB_VOTE_CODES, QUESTION_CODES, daily_counts
 from kitsune.sumo.api_utils import OrderingFilter
-from kitsune.wiki.models import HelpfulVote
+
+REFRESH_LOCK_TIMEOUT = 60 * 5
 
 
 class CachedAPIView(APIView):
     """An APIView that caches the objects to be returned.
 
+    The objects are kept for twice CACHE_MEDIUM_TIMEOUT, and once they're older than
+    that timeout, the first request to see them recomputes them while the others are
+    still served the stale ones, so they don't all recompute them at once.
+
     Subclasses must implement the get_objects() method.
     """
 
@@ -41,17 +41,25 @@ class CachedAPIView(APIView):
         params = []
         for key, value in list(request.GET.items()):
             params.append("{}={}".format(key, value))
-        return "{viewname}:{params}".format(
+        # Versioned, since the cached value became an (objects, fresh until) pair.
+        return "{viewname}:v2:{params}".format(
             viewname=self.__class__.__name__, params=":".join(sorted(params))
         )
 
     def get(self, request):
         cache_key = self._cache_key(request)
 
-        objs = cache.get(cache_key)
-        if objs is None:
+        cached = cache.get(cache_key)
+        if cached is None or (
+            cached[1] <= time.time()
+            and cache.add(f"{cache_key}:refreshing", True, REFRESH_LOCK_TIMEOUT)
+        ):
             objs = self.get_objects(request)
-            cache.add(cache_key, objs, settings.CACHE_MEDIUM_TIMEOUT)
+            fresh_until = time.time() + settings.CACHE_MEDIUM_TIMEOUT
+            cache.set(cache_key, (objs, fresh_until), settings.CACHE_MEDIUM_TIMEOUT * 2)
+            cache.delete(f"{cache_key}:refreshing")
+        else:
+            objs = cached[0]
 
         return Response({"objects": objs})
 
@@ -120,46 +128,10 @@ class QuestionsMetricList(CachedAPIView):
     """
 
     def get_objects(self, request):
-        # Set up the queries for the data we need
-        locale = request.GET.get("locale")
-        product = request.GET.get("product")
-
-        # Set up the query for the data we need.
-        qs = _daily_qs_for(Question)
-
-        # Don't count locked questions
-        qs = qs.exclude(is_locked=True)
-
-        # Don't count spam questions
-        qs = qs.exclude(is_spam=True)
-
-        if locale:
-            qs = qs.filter(locale=locale)
-
-        if product:
-            qs = qs.filter(product__slug=product)
-
-        # All answers that were created within 3 days of the question.
-        # Use "__range" to ensure the database index is used in Postgres.
-        aq_72 = Answer.objects.filter(
-            created__range=(F("question__created"), F("question__created") + timedelta(days=3))
-        )
-        # Questions of said answers.
-        rs_72 = qs.filter(id__in=aq_72.values_list("question"))
-
-        # All answers that were created within 24 hours of the question.
-        # Use "__range" to ensure the database index is used in Postgres.
-        aq_24 = Answer.objects.filter(
-            created__range=(F("question__created"), F("question__created") + timedelta(hours=24))
-        )
-        # Questions of said answers.
-        rs_24 = qs.filter(id__in=aq_24.values_list("question"))
-
-        # Questions with a solution.
-        qs_with_solutions = qs.exclude(solution_id=None)
-
-        return merge_results(
-            questions=qs, solved=qs_with_solutions, responded_72=rs_72, responded_24=rs_24
+        return daily_counts(
+            QUESTION_CODES,
+            locale=request.GET.get("locale"),
+            product=request.GET.get("product"),
         )
 
 
@@ -167,59 +139,20 @@ class VoteMetricList(CachedAPIView):
     """The API list view for vote metrics."""
 
     def get_objects(self, request):
-        # Set up the queries for the data we need
-        qs_kb_votes = _qs_for(HelpfulVote)
-        qs_ans_votes = _qs_for(AnswerVote)
-
-        # Filter on helpful
-        qs_kb_helpful_votes = qs_kb_votes.filter(helpful=True)
-        qs_ans_helpful_votes = qs_ans_votes.filter(helpful=True)
-
-        return merge_results(
-            kb_votes=qs_kb_votes,
-            kb_helpful=qs_kb_helpful_votes,
-            ans_votes=qs_ans_votes,
-            ans_helpful=qs_ans_helpful_votes,
-        )
+        return daily_counts(KB_VOTE_CODES + ANSWER_VOTE_CODES)
 
 
 class KBVoteMetricList(CachedAPIView):
     """The API list view for KB vote metrics."""
 
     def get_objects(self, request):
-        # Set up the queries for the data we need
-        locale = request.GET.get("locale")
         product = request.GET.get("product")
-
-        # Use "__range" to ensure the database index is used in Postgres,
-        # and only show the helpful votes from the last 365 days.
-        qs_kb_votes = HelpfulVote.objects.filter(
-            created__range=(timezone.now() - timedelta(days=365), Now())
+        return daily_counts(
+            KB_VOTE_CODES,
+            locale=request.GET.get("locale"),
+            product=product if product != "null" else None,
         )
 
-        if locale:
-            qs_kb_votes = qs_kb_votes.filter(revision__document__locale=locale)
-
-        if product and product != "null":
-            qs_kb_votes = qs_kb_votes.filter(revision__document__products__slug=product)  # WHOA
-
-        qs_kb_votes = (
-            qs_kb_votes.extra(
-                select={
-                    "day": "extract( day from wiki_helpfulvote.created )",
-                    "month": "extract( month from wiki_helpfulvote.created )",
-                    "year": "extract( year from wiki_helpfulvote.created )",
-                }
-            )
-            .values("year", "month", "day")
-            .annotate(count=Count("created"))
-        )
-
-        # Filter on helpful
-        qs_kb_helpful_votes = qs_kb_votes.filter(helpful=True)
-
-        return merge_results(kb_votes=qs_kb_votes, kb_helpful=qs_kb_helpful_votes)
-
 
 class ContributorsMetricList(CachedAPIView):
     """The API list view for active contributor metrics.
@@ -279,105 +212,6 @@ class L10nCoverageMetricList(CachedAPIView):
         return [{"date": m.start, "coverage": m.value} for m in qs]
 
 
-def _daily_qs_for(model_cls):
-    """Return the daily grouped queryset we need for model_cls."""
-    # Limit to newer than 2011/1/1 and active creators.
-    return (
-        # Use "__range" to ensure the database index is used in Postgres,
-        # and only get the objects from the last 365 days.
-        model_cls.objects.filter(
-            created__range=(timezone.now() - timedelta(days=365), Now()), creator__is_active=1
-        )
-        .extra(
-            select={
-                "day": "extract( day from created )",
-                "month": "extract( month from created )",
-                "year": "extract( year from created )",
-            }
-        )
-        .values("year", "month", "day")
-        .annotate(count=Count("created"))
-    )
-
-
-def _qs_for(model_cls):
-    """Return the monthly grouped queryset we need for model_cls."""
-    return (
-        # Use "__range" to ensure the database index is used in Postgres,
-        # and only get the objects from the last 365 days.
-        model_cls.objects.filter(created__range=(timezone.now() - timedelta(days=365), Now()))
-        .extra(
-            select={
-                "day": "extract( day from created )",
-                "month": "extract( month from created )",
-                "year": "extract( year from created )",
-            }
-        )
-        .values("year", "month", "day")
-        .annotate(count=Count("created"))
-    )
-
-
-def _start_date():
-    """The date from which we start querying monthly data."""
-    # Lets start on the first day of the month a year ago
-    year_ago = date.today() - timedelta(days=365)
-    return date(year_ago.year, year_ago.month, 1)
-
-
-def _remap_date_counts(**kwargs):
-    """Remap the query result.
-    kwargs = {
-        <label>=[
-            {'count': 45, 'month': 2L, 'year': 2010L},
-            {'count': 6, 'month': 2L, 'year': 2010L},   # Note duplicate date
-            {'count': 12, 'month': 1L, 'year': 2010L},
-            {'count': 1, 'month': 12L, 'year': 2009L},
-            ...
-        ],
-        <label>=[{...},...],
-    }
-    returns [
-        {
-            datetime.date(2009, 12, 1): {'<label>': 1},
-            datetime.date(2010, 1, 1): {'<label>': 12},
-            datetime.date(2010, 2, 1): {'<label>': 51}  # Note summed counts
-            ...
-        },
-        ...]
-    """
-    for label, qs in kwargs.items():
-        res = defaultdict(lambda: {label: 0})
-        # For each date mentioned in qs, sum up the counts for that day
-        # Note: days may be duplicated
-        for x in qs:
-            key = date(int(x["year"]), int(x["month"]), int(x.get("day", 1)))
-            res[key][label] += x["count"]
-        yield res
-
-
-def merge_results(**kwargs):
-    res_dict = reduce(_merge_results, _remap_date_counts(**kwargs))
-    res_list = [dict(date=k, **v) for k, v in list(res_dict.items())]
-    return [dict(**x) for x in sorted(res_list, key=itemgetter("date"), reverse=True)]
-
-
-def _merge_results(x, y):
-    """Merge query results arrays into one array.
-
-    From:
-        [{"date": "2011-10-01", "votes": 3},...]
-        and
-        [{"date": "2011-10-01", "helpful": 7},...]
-    To:
-        [{"date": "2011-10-01", "votes": 3, "helpful": 7},...]
-    """
-    return {
-        s: dict(list(x.get(s, {}).items()) + list(y.get(s, {}).items()))
-        for s in set(list(x.keys()) + list(y.keys()))
-    }
-
-
 def _cursor():
     """Return a DB cursor for reading."""
     return connections[router.db_for_read(Metric)].cursor()
@@ -1,9 +1,6 @@
-import operator
-from datetime import datetime
-from functools import reduce
+from bisect import bisect_right
 
-from django.db.models import Q
-from django.utils import timezone
+from django.db.models import Min
 
 from kitsune.dashboards import LAST_90_DAYS
 from kitsune.dashboards.models import WikiDocumentVisits
@@ -77,48 +74,49 @@ def _get_up_to_date_count(top_60_docs, locale):
     return up_to_date_docs, num_docs
 
 
-def _count_contributors_in_range(querysets, users, date_range):
-    """Of the group ``users``, count how many made a contribution in ``date_range``."""
-    start, end = date_range
-    retained_users = set()
-
-    for queryset, fields in querysets:
-        for field in fields:
-            filters = {"{}__in".format(field): users, "created__gte": start, "created__lt": end}
-            retained_users |= {getattr(o, field) for o in queryset.filter(**filters)}
-
-    return len(retained_users)
+def _get_cohort_activity(querysets, boundaries):
+    """
+    For each week between consecutive (timezone-aware) ``boundaries``, return the ids
+    of the users who made their first contribution to one of the ``querysets`` that
+    week, and the ids of the users who made any contribution that week.
 
+    Each item of ``querysets`` is a (queryset, fields) tuple, where ``fields`` are the
+    names of the user fields that count as contributing.
+    """
+    start, end = boundaries[0], boundaries[-1]
+    joined = [set() for _ in boundaries[1:]]
+    active = [set() for _ in boundaries[1:]]
 
-def _get_cohort(querysets, date_range):
-    start, end = date_range
-    cohort = set()
+    def week_of(created):
+        return bisect_right(boundaries, created) - 1
 
     for queryset, fields in querysets:
-        contributions_in_range = queryset.filter(created__gte=start, created__lt=end)
-        potential_users = set()
-
+        active_users = set()
         for field in fields:
-            potential_users |= {getattr(cont, field) for cont in contributions_in_range}
-
-        def is_in_cohort(u):
-            qs = [Q(**{field: u}) for field in fields]
-            filters = reduce(operator.or_, qs)
-
-            first_contrib = queryset.filter(filters).order_by("id")[0]
-            # Make start and end timezone-aware if they're naive datetimes
-            start_aware = (
-                timezone.make_aware(start)
-                if isinstance(start, datetime) and timezone.is_naive(start)
-                else start
-            )
-            end_aware = (
-                timezone.make_aware(end)
-                if isinstance(end, datetime) and timezone.is_naive(end)
-                else end
+            contributions = queryset.filter(
+                created__gte=start, created__lt=end, **{f"{field}__isnull": False}
+            ).values_list(field, "created")
+            for user_id, created in contributions.iterator():
+                active[week_of(created)].add(user_id)
+                active_users.add(user_id)
+
+        # Only users who contributed in the range can have made their first contribution
+        # in it, so there's no need to look any further back for anyone else.
+        first_contributions = {}
+        for field in fields:
+            firsts = (
+                queryset.filter(**{f"{field}__in": active_users})
+                .order_by()
+                .values(field)
+                .annotate(first=Min("created"))
+                .values_list(field, "first")
             )
-            return start_aware <= first_contrib.created < end_aware
+            for user_id, first in firsts:
+                if first < first_contributions.get(user_id, end):
+                    first_contributions[user_id] = first
 
-        cohort |= set(filter(is_in_cohort, potential_users))
+        for user_id, first in first_contributions.items():
+            if first >= start:
+                joined[week_of(first)].add(user_id)
 
-    return cohort
+    return joined, active
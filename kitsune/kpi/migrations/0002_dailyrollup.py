@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kpi", "0001_squashed_0002_cohort_retention_models"),
+        ("products", "0046_firefox_enterprise_zendesk_topics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("code", models.CharField(max_length=255)),
+                ("date", models.DateField()),
+                ("locale", models.CharField(max_length=7)),
+                ("value", models.PositiveIntegerField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("code", "date", "locale", "product")},
+            },
+        ),
+    ]
@@ -96,3 +96,26 @@ class RetentionMetric(ModelBase):
 
     class Meta:
         unique_together = [("cohort", "start", "end")]
+
+
+class DailyRollup(ModelBase):
+    """The number of things of some kind, like questions asked, created on a (UTC) day
+
+    There's a row per locale, and per product as well as one with a null product for
+    all products. The rows are maintained by kitsune.kpi.rollups.
+
+    """
+
+    code = CharField(max_length=255)
+    date = DateField()
+    locale = CharField(max_length=7)
+    product = ForeignKey("products.Product", null=True, on_delete=CASCADE)
+    value = PositiveIntegerField()
+
+    class Meta:
+        unique_together = [("code", "date", "locale", "product")]
+
+    def __str__(self):
+        return "{} on {} ({}, {}): {}".format(
+            self.code, self.date, self.locale, self.product_id, self.value
+        )
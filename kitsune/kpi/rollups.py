@@ -0,0 +1,187 @@
+"""
+Daily rollups of the support forum and vote counts behind the KPI dashboard.
+
+Counting a year of questions and votes by day on every cache miss is slow, so the
+counts of days that are over are kept in the DailyRollup table, one row per count,
+day, locale and product, with a null product for the count over all products. The
+days since the last rollup are still counted live.
+
+Days are UTC days, the same as ``extract(day from created)`` would give.
+"""
+
+from collections import defaultdict
+from datetime import UTC, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from kitsune.kpi.models import DailyRollup
+from kitsune.products.models import Product
+from kitsune.questions.models import Answer, AnswerVote, Question
+from kitsune.wiki.models import HelpfulVote
+
+QUESTION_CODES = ("questions", "solved", "responded_24", "responded_72")
+KB_VOTE_CODES = ("kb_votes", "kb_helpful")
+ANSWER_VOTE_CODES = ("ans_votes", "ans_helpful")
+
+# How many days the rollups go back.
+WINDOW_DAYS = 365
+# How many days are rolled up in one transaction when backfilling.
+BATCH_DAYS = 30
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min, tzinfo=UTC)
+
+
+def _count_by_day(qs, locale, product=None):
+    """Count the objects of ``qs`` by UTC day and the given locale and product paths."""
+    fields = {"day": TruncDate("created", tzinfo=UTC), "row_locale": F(locale)}
+    if product:
+        fields["row_product"] = F(product)
+    return (
+        qs.annotate(**fields)
+        .order_by()
+        .values(*fields)
+        .annotate(count=Count("id"))
+        .values_list(*fields, "count")
+    )
+
+
+def _question_querysets(start, end):
+    qs = (
+        Question.objects.filter(created__gte=start, created__lt=end, creator__is_active=True)
+        .exclude(is_locked=True)
+        .exclude(is_spam=True)
+    )
+    # Use "__range" to ensure the database index is used in Postgres.
+    aq_72 = Answer.objects.filter(
+        created__range=(F("question__created"), F("question__created") + timedelta(days=3))
+    )
+    aq_24 = Answer.objects.filter(
+        created__range=(F("question__created"), F("question__created") + timedelta(hours=24))
+    )
+    return {
+        "questions": qs,
+        "solved": qs.exclude(solution_id=None),
+        "responded_24": qs.filter(id__in=aq_24.values_list("question")),
+        "responded_72": qs.filter(id__in=aq_72.values_list("question")),
+    }
+
+
+def compute_rollups(start, end, codes=None):
+    """
+    Return the unsaved DailyRollup rows of the objects created between the ``start``
+    and ``end`` datetimes, for the given codes or all of them.
+    """
+    codes = set(codes or QUESTION_CODES + KB_VOTE_CODES + ANSWER_VOTE_CODES)
+    counts = defaultdict(int)
+
+    for code, qs in _question_querysets(start, end).items():
+        if code not in codes:
+            continue
+        for day, locale, product_id, count in _count_by_day(qs, "locale", "product_id"):
+            counts[code, day, locale, None] += count
+            if product_id is not None:
+                counts[code, day, locale, product_id] += count
+
+    kb_votes = HelpfulVote.objects.filter(created__gte=start, created__lt=end)
+    for code, qs in zip(KB_VOTE_CODES, (kb_votes, kb_votes.filter(helpful=True)), strict=True):
+        if code not in codes:
+            continue
+        for day, locale, count in _count_by_day(qs, "revision__document__locale"):
+            counts[code, day, locale, None] += count
+        # A document can be in several products, so count them separately.
+        by_product = _count_by_day(
+            qs.filter(revision__document__products__isnull=False),
+            "revision__document__locale",
+            "revision__document__products",
+        )
+        for day, locale, product_id, count in by_product:
+            counts[code, day, locale, product_id] += count
+
+    ans_votes = AnswerVote.objects.filter(created__gte=start, created__lt=end)
+    for code, qs in zip(
+        ANSWER_VOTE_CODES, (ans_votes, ans_votes.filter(helpful=True)), strict=True
+    ):
+        if code not in codes:
+            continue
+        for day, locale, count in _count_by_day(qs, "answer__question__locale"):
+            counts[code, day, locale, None] += count
+
+    return [
+        DailyRollup(code=code, date=day, locale=locale, product_id=product_id, value=value)
+        for (code, day, locale, product_id), value in counts.items()
+    ]
+
+
+def update_rollups():
+    """
+    Roll up the days that are over since the last update, and the refreshed days
+    before them, and drop the days which fell out of the window.
+
+    Later changes to old objects, like a question that was solved or locked, are
+    picked up for KPI_ROLLUP_REFRESH_DAYS days.
+    """
+    today = timezone.now().astimezone(UTC).date()
+    window_start = today - timedelta(days=WINDOW_DAYS)
+
+    last_day = DailyRollup.objects.aggregate(last_day=Max("date"))["last_day"]
+    if last_day is None:
+        day = window_start
+    else:
+        day = max(window_start, last_day + timedelta(days=1 - settings.KPI_ROLLUP_REFRESH_DAYS))
+
+    DailyRollup.objects.filter(date__lt=window_start).delete()
+
+    while day < today:
+        end = min(day + timedelta(days=BATCH_DAYS), today)
+        rows = compute_rollups(_day_start(day), _day_start(end))
+        with transaction.atomic():
+            DailyRollup.objects.filter(date__gte=day, date__lt=end).delete()
+            DailyRollup.objects.bulk_create(rows)
+        day = end
+
+
+def daily_counts(codes, locale=None, product=None):
+    """
+    Return the daily counts of the last year for the given codes, with the given locale
+    and product slug if not None, as a list of dicts like
+    ``{"date": date(2024, 10, 1), "questions": 7, "solved": 2}``, latest first.
+    Counts of zero are left out.
+    """
+    product_id = None
+    if product:
+        product_id = Product.objects.filter(slug=product).values_list("id", flat=True).first()
+        if product_id is None:
+            return []
+
+    today = timezone.now().astimezone(UTC).date()
+    window_start = today - timedelta(days=WINDOW_DAYS)
+
+    rollups = DailyRollup.objects.filter(code__in=codes, date__gte=window_start, date__lt=today)
+    live_start = rollups.aggregate(last_day=Max("date"))["last_day"]
+    live_start = live_start + timedelta(days=1) if live_start else window_start
+
+    if locale:
+        rollups = rollups.filter(locale=locale)
+
+    results = defaultdict(dict)
+
+    def add(code, day, value):
+        results[day][code] = results[day].get(code, 0) + value
+
+    for code, day, value in rollups.filter(product_id=product_id).values_list(
+        "code", "date", "value"
+    ):
+        add(code, day, value)
+
+    # Count the days since the last rollup live.
+    for row in compute_rollups(_day_start(live_start), timezone.now(), codes):
+        if (not locale or row.locale == locale) and row.product_id == product_id:
+            add(row.code, row.date, row.value)
+
+    return [dict(date=day, **results[day]) for day in sorted(results, reverse=True)]
@@ -1,9 +1,12 @@
+import itertools
 from datetime import date, datetime, timedelta
 
 from celery import shared_task
 from django.conf import settings
 from django.db.models import Count, F
+from django.utils import timezone
 
+from kitsune.kpi import rollups
 from kitsune.kpi.management import utils
 from kitsune.kpi.models import (
     CONTRIBUTOR_COHORT_CODE,
@@ -280,7 +283,8 @@ def cohort_analysis() -> None:
         previous_week = boundaries[-1] - timedelta(weeks=1)
         boundaries.append(previous_week)
     boundaries.reverse()
-    ranges = list(zip(boundaries[:-1], boundaries[1:], strict=False))
+    boundaries = [timezone.make_aware(boundary) for boundary in boundaries]
+    ranges = [(start.date(), end.date()) for start, end in itertools.pairwise(boundaries)]
 
     reports = [
         (
@@ -307,27 +311,39 @@ def cohort_analysis() -> None:
     for kind, querysets in reports:
         cohort_kind, _ = CohortKind.objects.get_or_create(code=kind)
 
-        for i, cohort_range in enumerate(ranges):
-            cohort_users = utils._get_cohort(querysets, cohort_range)
+        # Find who joined and who was active each week in one pass, and work out the
+        # whole cohort/retention matrix from that.
+        joined, active = utils._get_cohort_activity(querysets, boundaries)
 
-            # Sometimes None will be added to the cohort_users list, so remove it
-            if None in cohort_users:
-                cohort_users.remove(None)
-
-            cohort, _ = Cohort.objects.update_or_create(
-                kind=cohort_kind,
-                start=cohort_range[0],
-                end=cohort_range[1],
-                defaults={"size": len(cohort_users)},
-            )
+        cohorts = Cohort.objects.bulk_create(
+            [
+                Cohort(kind=cohort_kind, start=start, end=end, size=len(joined[i]))
+                for i, (start, end) in enumerate(ranges)
+            ],
+            update_conflicts=True,
+            unique_fields=["kind", "start", "end"],
+            update_fields=["size"],
+        )
 
-            for retention_range in ranges[i:]:
-                retained_user_count = utils._count_contributors_in_range(
-                    querysets, cohort_users, retention_range
-                )
-                RetentionMetric.objects.update_or_create(
+        RetentionMetric.objects.bulk_create(
+            [
+                RetentionMetric(
                     cohort=cohort,
-                    start=retention_range[0],
-                    end=retention_range[1],
-                    defaults={"size": retained_user_count},
+                    start=ranges[j][0],
+                    end=ranges[j][1],
+                    size=len(joined[i] & active[j]),
                 )
+                for i, cohort in enumerate(cohorts)
+                for j in range(i, len(ranges))
+            ],
+            update_conflicts=True,
+            unique_fields=["cohort", "start", "end"],
+            update_fields=["size"],
+        )
+
+
+@shared_task
+@skip_if_read_only_mode
+def update_kpi_rollups() -> None:
+    """Roll up the daily question and vote counts behind the KPI dashboard."""
+    rollups.update_rollups()
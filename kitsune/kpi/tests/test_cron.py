@@ -15,6 +15,7 @@ from kitsune.kpi.models import (
     VISITORS_METRIC_CODE,
     Cohort,
     Metric,
+    RetentionMetric,
 )
 from kitsune.kpi.tasks import cohort_analysis, update_l10n_metric
 from kitsune.kpi.tests import MetricFactory, MetricKindFactory
@@ -152,6 +153,18 @@ class CohortAnalysisTests(TestCase):
 
         self.assertEqual(c2r1.size, 2)
 
+    def test_rerun_updates_cohorts_in_place(self):
+        AnswerFactory(created=self.start_of_first_week + timedelta(weeks=1, days=3))
+        cohort_analysis()
+
+        self.assertEqual(Cohort.objects.count(), 4 * 12)
+        self.assertEqual(RetentionMetric.objects.count(), 4 * (12 * 13 // 2))
+        c2 = Cohort.objects.get(
+            kind__code=SUPPORT_FORUM_HELPER_COHORT_CODE,
+            start=self.start_of_first_week + timedelta(weeks=1),
+        )
+        self.assertEqual(c2.size, 8)
+
 
 class CronJobTests(TestCase):
     @patch.object(googleanalytics, "visitors")
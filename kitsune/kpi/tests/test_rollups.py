@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from kitsune.kpi import rollups
+from kitsune.kpi.models import DailyRollup
+from kitsune.kpi.tasks import update_kpi_rollups
+from kitsune.products.tests import ProductFactory
+from kitsune.questions.tests import AnswerFactory, AnswerVoteFactory, QuestionFactory
+from kitsune.sumo.tests import TestCase
+from kitsune.wiki.tests import HelpfulVoteFactory, RevisionFactory
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.days_ago = timezone.now() - timedelta(days=3)
+        self.firefox = ProductFactory(slug="firefox")
+        self.mobile = ProductFactory(slug="mobile")
+
+        q = QuestionFactory(created=self.days_ago, locale="en-US", product=self.firefox)
+        a = AnswerFactory(question=q, created=self.days_ago + timedelta(hours=1))
+        q.solution = a
+        q.save()
+        QuestionFactory(created=self.days_ago, locale="es", product=self.mobile)
+        QuestionFactory(created=self.days_ago, locale="en-US", is_locked=True)
+
+        r1 = RevisionFactory(document__locale="en-US")
+        r2 = RevisionFactory(document__locale="es")
+        r1.document.products.add(self.firefox)
+        r2.document.products.add(self.firefox, self.mobile)
+        HelpfulVoteFactory(revision=r1, helpful=True, created=self.days_ago)
+        HelpfulVoteFactory(revision=r2, helpful=False, created=self.days_ago)
+        AnswerVoteFactory(answer=a, helpful=True, created=self.days_ago)
+
+    def _day(self, codes, **kwargs):
+        (row,) = rollups.daily_counts(codes, **kwargs)
+        self.assertEqual(self.days_ago.date(), row.pop("date"))
+        return row
+
+    def test_update_rollups(self):
+        update_kpi_rollups()
+        self.assertEqual(
+            1, DailyRollup.objects.get(code="questions", locale="es", product=None).value
+        )
+        self.assertEqual(
+            {"questions": 2, "solved": 1, "responded_24": 1, "responded_72": 1},
+            self._day(rollups.QUESTION_CODES),
+        )
+        self.assertEqual(
+            {"questions": 1, "solved": 1, "responded_24": 1, "responded_72": 1},
+            self._day(rollups.QUESTION_CODES, locale="en-US"),
+        )
+        self.assertEqual({"questions": 1}, self._day(rollups.QUESTION_CODES, product="mobile"))
+        self.assertEqual(
+            {"kb_votes": 2, "kb_helpful": 1, "ans_votes": 1, "ans_helpful": 1},
+            self._day(rollups.KB_VOTE_CODES + rollups.ANSWER_VOTE_CODES),
+        )
+        self.assertEqual(
+            {"kb_votes": 2, "kb_helpful": 1},
+            self._day(rollups.KB_VOTE_CODES, product="firefox"),
+        )
+        self.assertEqual({"kb_votes": 1}, self._day(rollups.KB_VOTE_CODES, product="mobile"))
+        self.assertEqual([], rollups.daily_counts(rollups.QUESTION_CODES, product="unknown"))
+
+    def test_rerun_does_not_duplicate(self):
+        update_kpi_rollups()
+        count = DailyRollup.objects.count()
+        update_kpi_rollups()
+        self.assertEqual(count, DailyRollup.objects.count())
+        self.assertEqual({"questions": 1}, self._day(["questions"], locale="es"))
+
+    def test_days_since_last_rollup_are_counted_live(self):
+        update_kpi_rollups()
+        QuestionFactory(locale="es", product=self.mobile)
+        (today, days_ago) = rollups.daily_counts(["questions"], locale="es")
+        self.assertEqual({"date": timezone.now().date(), "questions": 1}, today)
+        self.assertEqual({"date": self.days_ago.date(), "questions": 1}, days_ago)
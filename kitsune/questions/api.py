@@ -7,7 +7,7 @@ from django import forms
 from django.db.models import Q
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import mixins, pagination, permissions, serializers, status, viewsets
+from rest_framework import mixins, permissions, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
@@ -25,6 +25,7 @@ from kitsune.questions.models import (
 from kitsune.sumo.api_utils import (
     DateTimeUTCField,
     GenericAPIException,
+    KeysetOrPageNumberPagination,
     OnlyCreatorEdits,
     OrderingFilter,
     SplitSourceField,
@@ -294,7 +295,7 @@ class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
             "tags",
         )
     )
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = KeysetOrPageNumberPagination
     permission_classes = [
         OnlyCreatorEdits,
         permissions.IsAuthenticatedOrReadOnly,
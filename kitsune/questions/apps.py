@@ -8,6 +8,7 @@ class QuestionsConfig(AppConfig):
     def ready(self):
         import actstream.registry
 
+        from kitsune.questions import contributor_stats, facets
         from kitsune.questions.badges import register_signals
 
         Question = self.get_model("Question")
@@ -17,3 +18,9 @@ class QuestionsConfig(AppConfig):
 
         # register signals for badges
         register_signals()
+
+        # keep the question list facets fresh
+        facets.register_signals()
+
+        # keep the contributor stats up to date
+        contributor_stats.register_signals()
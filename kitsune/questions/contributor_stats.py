@@ -0,0 +1,175 @@
+"""
+Contribution counts of support forum users, behind profiles, the answer sidebar and the
+user API.
+
+Counting a user's questions, answers and solutions on every profile or answer shown
+is slow for busy contributors, so the counts are kept in the ContributorStats table,
+one row per user. The row of a user is recounted whenever one of their questions or
+answers is posted or deleted, or a question they asked or answered is marked as spam
+or gets a solution, in the same transaction. A nightly task recounts every row, which
+moves the weekly and monthly solution windows and fixes any drift. The rows of past
+contributors were filled in by a data migration.
+
+The counts are the same as those of num_questions(), num_answers() and num_solutions()
+in kitsune.questions.utils.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from kitsune.community.models import DeletedContribution
+from kitsune.community.signals import skip_on_user_deletion
+from kitsune.questions.models import Answer, ContributorStats, Question
+
+# How many users are recounted in one go by update_all_stats().
+BATCH_SIZE = 1000
+
+STATS_FIELDS = [
+    "questions",
+    "spam_questions",
+    "answers",
+    "solutions",
+    "weekly_solutions",
+    "monthly_solutions",
+    "last_answer_date",
+    "updated",
+]
+
+
+def compute_stats(user_ids):
+    """Return the unsaved ContributorStats rows of the given existing users."""
+    now = timezone.now()
+    stats = {
+        user_id: ContributorStats(user_id=user_id, updated=now)
+        for user_id in User.objects.filter(id__in=user_ids).values_list("id", flat=True)
+    }
+    if not stats:
+        return []
+    user_ids = list(stats)
+
+    questions = (
+        Question.objects.filter(creator__in=user_ids)
+        .values("creator_id")
+        .annotate(total=Count("id"), spam=Count("id", filter=Q(is_spam=True)))
+    )
+    for row in questions:
+        stats[row["creator_id"]].questions = row["total"] - row["spam"]
+        stats[row["creator_id"]].spam_questions = row["spam"]
+
+    answers = (
+        Answer.objects.filter(creator__in=user_ids)
+        .values("creator_id")
+        .annotate(total=Count("id"), last=Max("created"))
+    )
+    for row in answers:
+        stats[row["creator_id"]].answers = row["total"]
+        stats[row["creator_id"]].last_answer_date = row["last"]
+
+    solutions = (
+        Question.objects.filter(solution__creator__in=user_ids)
+        .values("solution__creator_id")
+        .annotate(
+            total=Count("id"),
+            weekly=Count("id", filter=Q(solution__created__gte=now - timedelta(days=7))),
+            monthly=Count("id", filter=Q(solution__created__gte=now - timedelta(days=30))),
+        )
+    )
+    for row in solutions:
+        row_stats = stats[row["solution__creator_id"]]
+        row_stats.solutions = row["total"]
+        row_stats.weekly_solutions = row["weekly"]
+        row_stats.monthly_solutions = row["monthly"]
+
+    deleted = (
+        DeletedContribution.objects.filter(
+            content_type=ContentType.objects.get_for_model(Answer), contributor__in=user_ids
+        )
+        .values("contributor_id")
+        .annotate(total=Count("id"), solutions=Count("id", filter=Q(metadata__is_solution=True)))
+    )
+    for row in deleted:
+        stats[row["contributor_id"]].answers += row["total"]
+        stats[row["contributor_id"]].solutions += row["solutions"]
+
+    return list(stats.values())
+
+
+def update_stats(user_ids):
+    """Recount the stats of the given users, and return their rows by user id."""
+    rows = compute_stats(user_ids)
+    ContributorStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["user"], update_fields=STATS_FIELDS
+    )
+    return {row.user_id: row for row in rows}
+
+
+def update_all_stats():
+    """Recount the stats of everyone who ever asked or answered a question."""
+    user_ids = sorted(
+        set(Question.objects.values_list("creator_id", flat=True).distinct())
+        | set(Answer.objects.values_list("creator_id", flat=True).distinct())
+        | set(
+            DeletedContribution.objects.filter(
+                content_type=ContentType.objects.get_for_model(Answer)
+            )
+            .values_list("contributor_id", flat=True)
+            .distinct()
+        )
+        | set(ContributorStats.objects.values_list("user_id", flat=True))
+    )
+    for i in range(0, len(user_ids), BATCH_SIZE):
+        update_stats(user_ids[i : i + BATCH_SIZE])
+
+
+def get_stats(user):
+    """
+    Return the ContributorStats of the user, counting them if there's no row yet.
+
+    Rows are only written when contributions change, never while reading, so the
+    counts of a user without a row, like one who never contributed, aren't saved.
+    """
+    try:
+        return user.contributor_stats
+    except ContributorStats.DoesNotExist:
+        (stats,) = compute_stats([user.id]) or [ContributorStats(user_id=user.id)]
+        user.contributor_stats = stats
+        return stats
+
+
+def _update_question_stats(sender, instance, created=False, **kwargs):
+    stats_fields = (instance.is_spam, instance.solution_id)
+    loaded = getattr(instance, "_loaded_stats_fields", None)
+    instance._loaded_stats_fields = stats_fields
+    if not created and loaded == stats_fields:
+        return
+
+    # Both the old and the new solution's creators, if it changed.
+    solution_ids = {fields[1] for fields in (loaded, stats_fields) if fields and fields[1]}
+    user_ids = {instance.creator_id}
+    user_ids.update(
+        Answer.objects.filter(id__in=solution_ids).values_list("creator_id", flat=True)
+    )
+    update_stats(user_ids)
+
+
+def _update_answer_stats(sender, instance, created=False, **kwargs):
+    if created:
+        update_stats([instance.creator_id])
+
+
+def _update_creator_stats(sender, instance, origin=None, **kwargs):
+    # The stats of a user being deleted go along with them.
+    if not skip_on_user_deletion(instance.creator, origin):
+        update_stats([instance.creator_id])
+
+
+def register_signals():
+    post_save.connect(_update_question_stats, sender=Question)
+    post_save.connect(_update_answer_stats, sender=Answer)
+    post_delete.connect(_update_creator_stats, sender=Question)
+    post_delete.connect(_update_creator_stats, sender=Answer)
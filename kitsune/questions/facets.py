@@ -0,0 +1,137 @@
+"""
+Summaries behind the question list and its facets: the recent answer stats, the locales
+with forums, the topic lists and the tag counts.
+
+They're computed in bulk and cached for QUESTION_FACETS_TIMEOUT. The recent stats are
+also refreshed periodically, and dropped whenever a question or an answer is posted, so
+rendering a question list doesn't run any aggregate queries of its own.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Now
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from kitsune.products.models import ProductSupportConfig, Topic
+from kitsune.questions.models import AAQConfig, Answer, Question
+
+RECENT_STATS_CACHE_KEY = "questions:facets:recent-stats"
+FORUM_LOCALES_CACHE_KEY = "questions:facets:forum-locales"
+TOPICS_VERSION_CACHE_KEY = "questions:facets:topics-version"
+TOPIC_LIST_CACHE_KEY = "questions:facets:topics:{version}:{products}"
+TAG_FACETS_CACHE_KEY = "questions:facets:tags:{digest}"
+
+
+def compute_recent_stats():
+    """
+    Return the number of questions asked in the last 24 hours, and the number of those
+    still without an answer, keyed by (locale, product id).
+    """
+    # Use "__range" to ensure the database index is used in Postgres.
+    start = timezone.now() - timedelta(hours=24)
+    rows = (
+        Question.objects.filter(created__range=(start, Now()), creator__is_active=True)
+        .values("locale", "product_id")
+        .annotate(
+            asked=Count("id"),
+            unanswered=Count(
+                "id",
+                filter=Q(num_answers=0, is_spam=False, is_locked=False, is_archived=False),
+            ),
+        )
+        .order_by()
+    )
+    return {(row["locale"], row["product_id"]): (row["asked"], row["unanswered"]) for row in rows}
+
+
+def refresh_recent_stats():
+    stats = compute_recent_stats()
+    cache.set(RECENT_STATS_CACHE_KEY, stats, settings.QUESTION_FACETS_TIMEOUT)
+    return stats
+
+
+def recent_stats(locales, product_ids=None):
+    """
+    Return the numbers of questions asked and left unanswered in the last 24 hours, and
+    the percentage answered, for the given locales and, unless None, products.
+    """
+    stats = cache.get(RECENT_STATS_CACHE_KEY)
+    if stats is None:
+        stats = refresh_recent_stats()
+
+    asked = unanswered = 0
+    for (locale, product_id), (num_asked, num_unanswered) in stats.items():
+        if locale in locales and (product_ids is None or product_id in product_ids):
+            asked += num_asked
+            unanswered += num_unanswered
+
+    answered_percent = int((asked - unanswered) / asked * 100) if asked else 0
+    return asked, unanswered, answered_percent
+
+
+def forum_locales():
+    """Return the set of locales that have active forum support configurations."""
+    return cache.get_or_set(
+        FORUM_LOCALES_CACHE_KEY,
+        lambda: set(ProductSupportConfig.objects.locales_list()),
+        settings.QUESTION_FACETS_TIMEOUT,
+    )
+
+
+def topic_list(product_ids=None):
+    """
+    Return the topics to choose from on the question list of the given products, or
+    of all products if None.
+    """
+    version = cache.get_or_set(TOPICS_VERSION_CACHE_KEY, lambda: uuid4().hex, None)
+    products = ",".join(map(str, sorted(product_ids))) if product_ids is not None else "all"
+    key = TOPIC_LIST_CACHE_KEY.format(version=version, products=products)
+
+    topics = cache.get(key)
+    if topics is None:
+        topics = Topic.active.filter(in_aaq=True, visible=True)
+        if product_ids is not None:
+            topics = topics.filter(products__in=product_ids).distinct()
+        else:
+            topics = topics.filter(in_nav=True)
+        topics = list(topics)
+        cache.set(key, topics, settings.QUESTION_FACETS_TIMEOUT)
+    return topics
+
+
+def tag_facets_cache_key(**params):
+    """Return the cache key for the tag facets of a question list with the given params."""
+    data = json.dumps(params, sort_keys=True, default=str)
+    return TAG_FACETS_CACHE_KEY.format(digest=hashlib.sha256(data.encode()).hexdigest())
+
+
+def _drop_recent_stats(sender, instance, created, **kwargs):
+    if created:
+        cache.delete(RECENT_STATS_CACHE_KEY)
+
+
+def _drop_forum_locales(sender, **kwargs):
+    cache.delete(FORUM_LOCALES_CACHE_KEY)
+
+
+def _drop_topic_lists(sender, **kwargs):
+    cache.delete(TOPICS_VERSION_CACHE_KEY)
+
+
+def register_signals():
+    post_save.connect(_drop_recent_stats, sender=Question)
+    post_save.connect(_drop_recent_stats, sender=Answer)
+    for sender in (ProductSupportConfig, AAQConfig):
+        post_save.connect(_drop_forum_locales, sender=sender)
+        post_delete.connect(_drop_forum_locales, sender=sender)
+    m2m_changed.connect(_drop_forum_locales, sender=AAQConfig.enabled_locales.through)
+    post_save.connect(_drop_topic_lists, sender=Topic)
+    post_delete.connect(_drop_topic_lists, sender=Topic)
+    m2m_changed.connect(_drop_topic_lists, sender=Topic.products.through)
@@ -0,0 +1,27 @@
+import django.contrib.postgres.operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The indexes are built concurrently, so writes to the questions aren't blocked
+    # meanwhile, which can't be done in a transaction.
+    atomic = False
+
+    dependencies = [
+        ("questions", "0024_remove_aaqconfig_unique_active_config_and_more"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="question",
+            index=models.Index(fields=["updated", "id"], name="question_updated_id_idx"),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="question",
+            index=models.Index(fields=["num_answers", "id"], name="question_answers_id_idx"),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="question",
+            index=models.Index(fields=["num_votes_past_week", "id"], name="question_votes_id_idx"),
+        ),
+    ]
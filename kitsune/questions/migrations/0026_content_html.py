@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0025_question_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answer",
+            name="content_html",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="content_html",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
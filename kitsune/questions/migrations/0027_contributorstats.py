@@ -0,0 +1,38 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0026_content_html"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContributorStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="contributor_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("questions", models.PositiveIntegerField(default=0)),
+                ("spam_questions", models.PositiveIntegerField(default=0)),
+                ("answers", models.PositiveIntegerField(default=0)),
+                ("solutions", models.PositiveIntegerField(default=0)),
+                ("weekly_solutions", models.PositiveIntegerField(db_index=True, default=0)),
+                ("monthly_solutions", models.PositiveIntegerField(db_index=True, default=0)),
+                ("last_answer_date", models.DateTimeField(null=True)),
+                ("updated", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
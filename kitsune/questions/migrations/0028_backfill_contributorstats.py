@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_contributor_stats(apps, schema_editor):
+    """
+    Count the stats of everyone who ever asked or answered a question, the same way
+    kitsune.questions.contributor_stats does, so the reads never find a row missing.
+    """
+    Question = apps.get_model("questions", "Question")
+    Answer = apps.get_model("questions", "Answer")
+    ContributorStats = apps.get_model("questions", "ContributorStats")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    DeletedContribution = apps.get_model("community", "DeletedContribution")
+
+    answer_type = ContentType.objects.filter(app_label="questions", model="answer").first()
+    user_ids = sorted(
+        set(Question.objects.values_list("creator_id", flat=True).distinct())
+        | set(Answer.objects.values_list("creator_id", flat=True).distinct())
+        | set(
+            DeletedContribution.objects.filter(content_type=answer_type)
+            .values_list("contributor_id", flat=True)
+            .distinct()
+        )
+    )
+    now = timezone.now()
+
+    for i in range(0, len(user_ids), BATCH_SIZE):
+        batch = user_ids[i : i + BATCH_SIZE]
+        stats = {user_id: ContributorStats(user_id=user_id, updated=now) for user_id in batch}
+
+        questions = (
+            Question.objects.filter(creator__in=batch)
+            .values("creator_id")
+            .annotate(total=Count("id"), spam=Count("id", filter=Q(is_spam=True)))
+        )
+        for row in questions:
+            stats[row["creator_id"]].questions = row["total"] - row["spam"]
+            stats[row["creator_id"]].spam_questions = row["spam"]
+
+        answers = (
+            Answer.objects.filter(creator__in=batch)
+            .values("creator_id")
+            .annotate(total=Count("id"), last=Max("created"))
+        )
+        for row in answers:
+            stats[row["creator_id"]].answers = row["total"]
+            stats[row["creator_id"]].last_answer_date = row["last"]
+
+        solutions = (
+            Question.objects.filter(solution__creator__in=batch)
+            .values("solution__creator_id")
+            .annotate(
+                total=Count("id"),
+                weekly=Count("id", filter=Q(solution__created__gte=now - timedelta(days=7))),
+                monthly=Count("id", filter=Q(solution__created__gte=now - timedelta(days=30))),
+            )
+        )
+        for row in solutions:
+            row_stats = stats[row["solution__creator_id"]]
+            row_stats.solutions = row["total"]
+            row_stats.weekly_solutions = row["weekly"]
+            row_stats.monthly_solutions = row["monthly"]
+
+        if answer_type:
+            deleted = (
+                DeletedContribution.objects.filter(content_type=answer_type, contributor__in=batch)
+                .values("contributor_id")
+                .annotate(
+                    total=Count("id"), solutions=Count("id", filter=Q(metadata__is_solution=True))
+                )
+            )
+            for row in deleted:
+                stats[row["contributor_id"]].answers += row["total"]
+                stats[row["contributor_id"]].solutions += row["solutions"]
+
+        ContributorStats.objects.bulk_create(stats.values(), ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    # Each batch is committed on its own, rather than locking every row until the end.
+    atomic = False
+
+    dependencies = [
+        ("questions", "0027_contributorstats"),
+        ("community", "0001_initial"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_contributor_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0028_backfill_contributorstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answer",
+            name="content_html_version",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="content_html_version",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -2,6 +2,7 @@ import itertools
 import json
 import logging
 import re
+from collections import Counter, defaultdict
 from datetime import timedelta
 from functools import cached_property
 from typing import override
@@ -14,8 +15,8 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
-from django.db import IntegrityError, models, transaction
-from django.db.models import Count, Subquery
+from django.db import connection, models, transaction
+from django.db.models import Count, Q
 from django.db.models.functions import Now
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -23,6 +24,7 @@ from django.urls import is_valid_path
 from django.utils import timezone, translation
 from django.utils.translation import pgettext
 from elasticsearch import ApiError, TransportError
+from markupsafe import Markup
 from product_details import product_details
 
 from kitsune.flagit.models import FlaggedObject
@@ -33,6 +35,8 @@ from kitsune.questions.managers import AAQConfigManager, AnswerManager, Question
 from kitsune.sumo.i18n import split_into_language_and_path
 from kitsune.sumo.models import LocaleField, ModelBase
 from kitsune.sumo.parser import BASE_ALLOWED_ATTRIBUTES
+from kitsune.sumo.redis_utils import SlidingWindowCounter
+from kitsune.sumo.staging import CountStagingTable
 from kitsune.sumo.templatetags.jinja_helpers import urlparams, wiki_to_html
 from kitsune.sumo.urlresolvers import reverse
 from kitsune.tags.models import BigVocabTaggableManager, SumoTag
@@ -42,6 +46,10 @@ log = logging.getLogger("k.questions")
 
 VOTE_METADATA_MAX_LENGTH = 1000
 
+# Bump this when the parser's output changes, so the HTML stored on questions and
+# answers is parsed again as they're shown.
+CONTENT_HTML_VERSION = 0
+
 
 class InvalidUserException(ValueError):
     pass
@@ -66,6 +74,10 @@ class AAQBase(ModelBase):
     created = models.DateTimeField(default=timezone.now, db_index=True)
     updated = models.DateTimeField(default=timezone.now, db_index=True)
     content = models.TextField()
+    # The parsed content, unless it depends on other objects. See content_is_static().
+    content_html = models.TextField(blank=True, default="")
+    # The CONTENT_HTML_VERSION the content was parsed with.
+    content_html_version = models.PositiveSmallIntegerField(default=0)
     is_spam = models.BooleanField(default=False)
     marked_as_spam = models.DateTimeField(default=None, null=True)
     updated_column_name = "updated"
@@ -73,6 +85,34 @@ class AAQBase(ModelBase):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        # Remember the content as loaded, to tell whether it changed when saving.
+        obj._loaded_content = obj.__dict__.get("content")
+        return obj
+
+    def content_is_static(self):
+        """Whether the parsed content depends on nothing but the content itself.
+
+        [[Links]] and [[Image:]] tags render differently as the documents and images
+        they refer to come and go, so that content is only cached for a while.
+        """
+        return "[[" not in self.content
+
+    def update_content_html(self):
+        """Parse and store the content along with it, if it was changed."""
+        if "content" not in self.__dict__ or self.content == getattr(
+            self, "_loaded_content", None
+        ):
+            return
+        self.__dict__.pop("_content_parsed", None)
+        self.content_html = ""
+        if self.content_is_static():
+            self.content_html = _parse_content(self)
+        self.content_html_version = CONTENT_HTML_VERSION
+        self._loaded_content = self.content
+
     def has_voted(self, request):
         """Is the user eligible to vote or
         did the user already vote for this answer or question?"""
@@ -156,6 +196,12 @@ class Question(AAQBase):
             ("tag_question", "Can add tags to and remove tags from questions"),
             ("change_solution", "Can change/remove the solution to a question"),
         )
+        # For seeking to the pages of question lists, ordered by these and then by id.
+        indexes = [
+            models.Index(fields=["updated", "id"], name="question_updated_id_idx"),
+            models.Index(fields=["num_answers", "id"], name="question_answers_id_idx"),
+            models.Index(fields=["num_votes_past_week", "id"], name="question_votes_id_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -176,9 +222,20 @@ class Question(AAQBase):
     def needs_info(self):
         return self.tags.filter(slug=config.NEEDS_INFO_TAG_NAME).count() > 0
 
+    @property
+    def content_locale(self):
+        return self.locale
+
     @property
     def content_parsed(self):
-        return _content_parsed(self, self.locale)
+        return _content_parsed(self)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        # Remember what the contributor stats depend on, to tell whether it changed.
+        obj._loaded_stats_fields = (obj.__dict__.get("is_spam"), obj.__dict__.get("solution_id"))
+        return obj
 
     def clear_cached_contributors(self):
         cache.delete(self.contributors_cache_key % self.id)
@@ -194,6 +251,8 @@ class Question(AAQBase):
             if update:
                 self.updated = timezone.now()
 
+        self.update_content_html()
+
         # Clear cached product_slug
         self._product_slug = None
 
@@ -831,83 +890,38 @@ class QuestionVisits(ModelBase):
 
     @classmethod
     def reload_from_analytics(cls, verbose=False):
-        """Update the stats from Google Analytics."""
-        from kitsune.sumo import googleanalytics
+        """
+        Update the stats from Google Analytics.
 
-        with transaction.atomic():
-            if verbose:
-                log.info("Gathering pageviews per question from GA4 data API...")
+        The GA4 report is consumed page by page as it arrives, and added to a temporary
+        staging table, so memory use doesn't grow with the size of the report. The stats
+        are then upserted from the staging table in a single transaction.
+        """
+        from kitsune.sumo import googleanalytics
 
-            pageviews_by_question_id = googleanalytics.pageviews_by_question(verbose=verbose)
+        if verbose:
+            log.info("Staging pageviews per question from GA4 data API...")
 
-            total_count = len(pageviews_by_question_id)
+        with CountStagingTable(f"{cls._meta.db_table}_staging") as staging:
+            rows = googleanalytics.iter_pageviews_by_question(verbose=verbose)
+            for page in itertools.batched(rows, googleanalytics.REPORT_PAGE_SIZE, strict=False):
+                visits_by_question_id = Counter()
+                for question_id, visits in page:
+                    visits_by_question_id[question_id] += visits
+                staging.add(visits_by_question_id)
 
             if verbose:
-                log.info(f"Gathered pageviews for {total_count} questions.")
-
-            def create_batch(batch_of_question_ids):
-                """
-                Create a batch of instances in one shot, but only include instances that
-                refer to an existing Question, so we avoid triggering an integrity error.
-                A call to this function makes only two databases queries no matter how
-                many instances we need to validate and create.
-                """
-                cls.objects.bulk_create(
-                    [
-                        instance_by_question_id[id]
-                        for id in Question.objects.filter(
-                            id__in=batch_of_question_ids
-                        ).values_list("id", flat=True)
-                    ]
+                log.info(f"Updating the instances of {cls.__name__}...")
+
+            # Only copy rows that refer to an existing Question.
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {cls._meta.db_table} (question_id, visits) "
+                    f"SELECT s.key, s.value FROM {staging.name} s "
+                    f"JOIN {Question._meta.db_table} q ON q.id = s.key "
+                    "ON CONFLICT (question_id) DO UPDATE SET visits = EXCLUDED.visits"
                 )
 
-            instance_by_question_id = {}
-
-            for i, (question_id, visits) in enumerate(pageviews_by_question_id.items(), start=1):
-                instance_by_question_id[question_id] = cls(
-                    question_id=Subquery(Question.objects.filter(id=question_id).values("id")),
-                    visits=visits,
-                )
-
-                # Update the question visits in batches of 30K to avoid memory issues.
-                if ((i % 30000) != 0) and (i != total_count):
-                    continue
-
-                # We've got a batch, so let's update them.
-
-                question_ids = list(instance_by_question_id)
-
-                # Next, let's clear out the stale instances that have new results.
-                if verbose:
-                    log.info(f"Deleting {len(question_ids)} stale instances of {cls.__name__}...")
-
-                cls.objects.filter(question_id__in=question_ids).delete()
-
-                # Then we can create fresh instances for the questions that have results.
-                if verbose:
-                    log.info(f"Creating {len(question_ids)} fresh instances of {cls.__name__}...")
-
-                # Let's create the fresh instances in batches of 1K, so we avoid exposing
-                # ourselves to the possibility of transgressing some query size limit.
-                for batch_of_question_ids in itertools.batched(question_ids, 1000, strict=False):
-                    if verbose:
-                        log.info(f"Creating a batch of {len(batch_of_question_ids)} instances...")
-
-                    try:
-                        with transaction.atomic():
-                            create_batch(batch_of_question_ids)
-                    except IntegrityError:
-                        # There is a very slim chance that one or more Questions have been
-                        # deleted in the moment of time between the formation of the list
-                        # of valid instances and actually creating them, so let's give it
-                        # one more try, assuming there's an even slimmer chance that
-                        # lightning will strike twice. If this one fails, we'll roll-back
-                        # everything and give up on the entire effort.
-                        create_batch(batch_of_question_ids)
-
-                # We're done with this batch, so let's clear the memory for the next one.
-                instance_by_question_id.clear()
-
         if verbose:
             log.info("Done.")
 
@@ -974,9 +988,13 @@ class Answer(AAQBase):
     def __str__(self):
         return "{}: {}".format(self.question.title, self.content[:50])
 
+    @property
+    def content_locale(self):
+        return self.question.locale
+
     @property
     def content_parsed(self):
-        return _content_parsed(self, self.question.locale)
+        return _content_parsed(self)
 
     @override
     def save(self, update=True, no_notify=False, *args, **kwargs):
@@ -994,6 +1012,8 @@ class Answer(AAQBase):
             self.updated = timezone.now()
             self.clear_cached_html()
 
+        self.update_content_html()
+
         super().save(*args, **kwargs)
 
         self.question.num_answers = Answer.objects.filter(
@@ -1082,17 +1102,17 @@ class Answer(AAQBase):
 
     @property
     def creator_num_answers(self):
-        # Avoid circular import, utils.py imports Question
-        from kitsune.questions.utils import num_answers
+        # Avoid circular import, contributor_stats.py imports Answer
+        from kitsune.questions.contributor_stats import get_stats
 
-        return num_answers(self.creator)
+        return get_stats(self.creator).answers
 
     @property
     def creator_num_solutions(self):
-        # Avoid circular import, utils.py imports Question
-        from kitsune.questions.utils import num_solutions
+        # Avoid circular import, contributor_stats.py imports Answer
+        from kitsune.questions.contributor_stats import get_stats
 
-        return num_solutions(self.creator)
+        return get_stats(self.creator).solutions
 
     @classmethod
     def last_activity_for(cls, user):
@@ -1158,6 +1178,37 @@ class Answer(AAQBase):
         self.save()
 
 
+class ContributorStats(ModelBase):
+    """A user's support forum contribution counts.
+
+    Deleted answers that were recorded as contributions are counted too. The rows are
+    maintained by kitsune.questions.contributor_stats.
+
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="contributor_stats"
+    )
+    questions = models.PositiveIntegerField(default=0)
+    spam_questions = models.PositiveIntegerField(default=0)
+    answers = models.PositiveIntegerField(default=0)
+    solutions = models.PositiveIntegerField(default=0)
+    # Solutions among the answers posted in the last 7 and 30 days.
+    weekly_solutions = models.PositiveIntegerField(default=0, db_index=True)
+    monthly_solutions = models.PositiveIntegerField(default=0, db_index=True)
+    last_answer_date = models.DateTimeField(null=True)
+    updated = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return "Contributor stats of {}".format(self.user_id)
+
+    def question_count(self, viewer=None):
+        """The number of questions, with spam if the viewer can moderate it."""
+        if viewer and viewer.has_perm("flagit.can_moderate"):
+            return self.questions + self.spam_questions
+        return self.questions
+
+
 class QuestionVote(VoteBase):
     """I have this problem too.
     Keeps track of users that have problem over time."""
@@ -1188,12 +1239,19 @@ class VoteMetadata(ModelBase):
     value = models.CharField(max_length=VOTE_METADATA_MAX_LENGTH)
 
 
+# The votes of each question today and in the 7 days before, written to
+# Question.num_votes_past_week by the update_weekly_votes task.
+question_votes_counter = SlidingWindowCounter("question-votes", days=7)
+
+
 def send_vote_update_task(**kwargs):
     from kitsune.questions.tasks import update_question_votes
 
     if kwargs.get("created"):
         q = kwargs.get("instance").question
-        update_question_votes.delay(q.id)
+        # Recount the question's votes right away only if they can't be counted in Redis.
+        if not question_votes_counter.incr(q.id):
+            update_question_votes.delay(q.id)
 
 
 post_save.connect(send_vote_update_task, sender=QuestionVote)
@@ -1215,13 +1273,62 @@ def _tenths_version(full_version):
     return ""
 
 
-def _content_parsed(obj, locale):
-    cache_key = obj.html_cache_key % obj.id
-    html = cache.get(cache_key)
-    if html is None:
-        html = wiki_to_html(obj.content, locale, attributes=BASE_ALLOWED_ATTRIBUTES)
-        cache.add(cache_key, html, settings.CACHE_MEDIUM_TIMEOUT)
-    return html
+def _parse_content(obj):
+    return wiki_to_html(obj.content, obj.content_locale, attributes=BASE_ALLOWED_ATTRIBUTES)
+
+
+def load_content_parsed(objs):
+    """Load the parsed content of the given questions and answers for their
+    content_parsed.
+
+    The HTML stored on the rows is used as is, if it was parsed with the current
+    CONTENT_HTML_VERSION. The rest is read from the cache in one
+    round trip, and what's missing from it is parsed, cached in another and stored on
+    the rows that can keep it, unless the site is read-only.
+    """
+    pending = {}
+    for obj in objs:
+        if "_content_parsed" in obj.__dict__:
+            continue
+        if obj.content_html and obj.content_html_version == CONTENT_HTML_VERSION:
+            obj._content_parsed = Markup(obj.content_html)
+        elif obj.id is None:
+            obj._content_parsed = _parse_content(obj)
+        else:
+            pending[obj.html_cache_key % obj.id] = obj
+    if not pending:
+        return
+
+    cached = cache.get_many(list(pending))
+    parsed = {}
+    to_store = defaultdict(list)
+    for key, obj in pending.items():
+        html = cached.get(key)
+        if html is None:
+            html = parsed[key] = _parse_content(obj)
+            if obj.content_is_static():
+                obj.content_html = html
+                obj.content_html_version = CONTENT_HTML_VERSION
+                to_store[type(obj)].append(obj)
+        obj._content_parsed = html
+
+    cache.set_many(parsed, settings.CACHE_MEDIUM_TIMEOUT)
+    if settings.READ_ONLY:
+        return
+    for model, rows in to_store.items():
+        for obj in rows:
+            # Only fill in the HTML of content that's unchanged since it was loaded,
+            # so a concurrent edit's HTML is never overwritten with a stale one.
+            model.objects.filter(
+                Q(content_html="") | ~Q(content_html_version=CONTENT_HTML_VERSION),
+                pk=obj.pk,
+                content=obj.content,
+            ).update(content_html=obj.content_html, content_html_version=CONTENT_HTML_VERSION)
+
+
+def _content_parsed(obj):
+    load_content_parsed([obj])
+    return obj._content_parsed
 
 
 @receiver(post_save, sender=Question, dispatch_uid="question_create_actionstream")
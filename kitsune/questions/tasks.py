@@ -1,14 +1,14 @@
-import itertools
 import logging
 import textwrap
-from datetime import date, datetime, timedelta
+from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
 
 from celery import shared_task
 from django.conf import settings
 from django.contrib.auth.models import Group, User
 from django.core.mail import send_mail
 from django.db.models import Count, OuterRef, Subquery
-from django.db.models.functions import Coalesce, Now
+from django.db.models.functions import Coalesce, Now, TruncDate
 from django.utils import timezone
 from sentry_sdk import capture_exception
 
@@ -217,28 +217,45 @@ def report_employee_answers() -> None:
 @shared_task
 @skip_if_read_only_mode
 def update_weekly_votes() -> None:
-    from kitsune.questions.models import Question, QuestionVote
+    """Write the votes of the past week of the questions whose count changed."""
+    from kitsune.questions.models import Question, QuestionVote, question_votes_counter
 
-    # Get all questions (id) with a vote in the last week.
-    recent = timezone.now() - timedelta(days=7)
-    q = QuestionVote.objects.filter(created__range=(recent, Now()))
-    q = q.values_list("question_id", flat=True).order_by("question")
-    q = q.distinct()
-    q_with_recent_votes = list(q)
+    past_week = (timezone.now() - timedelta(days=7)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
 
-    # Get all questions with num_votes_past_week > 0
-    q = Question.objects.filter(num_votes_past_week__gt=0)
-    q = q.values_list("id", flat=True)
-    q_with_nonzero_votes = list(q)
+    if not question_votes_counter.redis:
+        # Without the counter, recount the questions with votes in the past week and
+        # those whose votes are now older than that.
+        recent = QuestionVote.objects.filter(created__range=(past_week, Now()))
+        question_ids = set(recent.values_list("question_id", flat=True).order_by())
+        question_ids.update(
+            Question.objects.filter(num_votes_past_week__gt=0).values_list("id", flat=True)
+        )
+        update_question_vote_chunk(list(question_ids))
+        return
+
+    if not question_votes_counter.is_seeded():
+        question_votes_counter.seed(
+            # Use "__range" to ensure the database index is used in Postgres.
+            QuestionVote.objects.filter(created__range=(past_week, Now()))
+            .annotate(day=TruncDate("created", tzinfo=UTC))
+            .order_by()
+            .values("question_id", "day")
+            .annotate(count=Count("id"))
+            .values_list("question_id", "day", "count")
+        )
 
-    # Union.
-    qs_to_update = list(set(q_with_recent_votes + q_with_nonzero_votes))
+    counts = question_votes_counter.counts(question_votes_counter.pop_changed())
 
-    log.info(f"Started update of {len(qs_to_update)} questions.")
+    # Most questions share a handful of counts, so update them by count.
+    question_ids_by_count = defaultdict(list)
+    for question_id, count in counts.items():
+        question_ids_by_count[count].append(question_id)
+    for count, question_ids in question_ids_by_count.items():
+        Question.objects.filter(id__in=question_ids).update(num_votes_past_week=count)
 
-    # Chunk them for tasks.
-    for chunk in itertools.batched(qs_to_update, 50, strict=False):
-        update_question_vote_chunk.delay(list(chunk))
+    log.info(f"Updated the weekly votes of {len(counts)} questions.")
 
 
 @shared_task
@@ -274,3 +291,20 @@ def auto_archive_old_questions() -> None:
 @skip_if_read_only_mode
 def reload_question_traffic_stats(verbose: bool = True) -> None:
     QuestionVisits.reload_from_analytics(verbose=verbose)
+
+
+@shared_task
+def refresh_question_list_facets() -> None:
+    """Recompute the recent answer stats shown on the question lists."""
+    from kitsune.questions.facets import refresh_recent_stats
+
+    refresh_recent_stats()
+
+
+@shared_task
+@skip_if_read_only_mode
+def update_contributor_stats() -> None:
+    """Recount the contribution counts of every forum contributor."""
+    from kitsune.questions.contributor_stats import update_all_stats
+
+    update_all_stats()
@@ -22,6 +22,7 @@ from kitsune.questions.tests import (
     QuestionVoteFactory,
     tags_eq,
 )
+from kitsune.sumo.api_utils import KeysetOrPageNumberPagination
 from kitsune.sumo.tests import TestCase
 from kitsune.sumo.urlresolvers import reverse
 from kitsune.tags.tests import TagFactory
@@ -363,6 +364,28 @@ class TestQuestionViewSet(TestCase):
                 q.refresh_from_db()
                 self.assertIsNone(q.solution)
 
+    def test_cursor_pagination(self):
+        questions = QuestionFactory.create_batch(5)
+        for q, num_answers in zip(questions, (2, 0, 1, 0, 2), strict=True):
+            Question.objects.filter(id=q.id).update(num_answers=num_answers)
+
+        url = reverse("question-list") + "?ordering=-num_answers&cursor="
+        ids = []
+        with mock.patch.object(KeysetOrPageNumberPagination, "page_size", 2):
+            while url:
+                res = self.client.get(url)
+                self.assertEqual(res.status_code, 200)
+                self.assertNotIn("count", res.data)
+                ids.extend(q["id"] for q in res.data["results"])
+                url = res.data["next"]
+
+        q1, q2, q3, q4, q5 = (q.id for q in questions)
+        self.assertEqual(ids, [q5, q1, q3, q4, q2])
+
+    def test_invalid_cursor(self):
+        res = self.client.get(reverse("question-list") + "?cursor=nonsense")
+        self.assertEqual(res.status_code, 404)
+
     def test_filter_is_taken_true(self):
         q1 = QuestionFactory()
         q2 = QuestionFactory()
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from kitsune.questions.contributor_stats import get_stats, update_all_stats
+from kitsune.questions.models import ContributorStats
+from kitsune.questions.tests import AnswerFactory, QuestionFactory, SolutionAnswerFactory
+from kitsune.sumo.tests import TestCase
+from kitsune.users.tests import UserFactory
+
+
+class ContributorStatsTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def _stats(self):
+        return ContributorStats.objects.get(user=self.user)
+
+    def test_questions(self):
+        q = QuestionFactory(creator=self.user)
+        QuestionFactory(creator=self.user)
+        self.assertEqual(2, self._stats().questions)
+
+        q.mark_as_spam(UserFactory())
+        stats = self._stats()
+        self.assertEqual(1, stats.questions)
+        self.assertEqual(1, stats.spam_questions)
+
+    def test_answers(self):
+        q = QuestionFactory()
+        a1 = AnswerFactory(creator=self.user, question=q)
+        a2 = AnswerFactory(creator=self.user, question=q)
+        self.assertEqual(2, self._stats().answers)
+        self.assertEqual(a2.created, self._stats().last_answer_date)
+
+        # Deleted answers are still counted as contributions.
+        a1.delete()
+        self.assertEqual(2, self._stats().answers)
+
+    def test_solutions(self):
+        q1 = QuestionFactory()
+        q2 = QuestionFactory()
+        a1 = AnswerFactory(creator=self.user, question=q1)
+        a2 = AnswerFactory(creator=self.user, question=q2)
+        self.assertEqual(0, self._stats().solutions)
+
+        q1.solution = a1
+        q1.save()
+        q2.solution = a2
+        q2.save()
+        stats = self._stats()
+        self.assertEqual(2, stats.solutions)
+        self.assertEqual(2, stats.weekly_solutions)
+
+        q1.solution = None
+        q1.save()
+        self.assertEqual(1, self._stats().solutions)
+
+        a2.delete()
+        self.assertEqual(1, self._stats().solutions)
+
+    def test_windows_move_nightly(self):
+        a = SolutionAnswerFactory(creator=self.user)
+        self.assertEqual(1, self._stats().weekly_solutions)
+
+        a.created = timezone.now() - timedelta(days=8)
+        a.save()
+        update_all_stats()
+        stats = self._stats()
+        self.assertEqual(0, stats.weekly_solutions)
+        self.assertEqual(1, stats.monthly_solutions)
+
+    def test_missing_stats_are_counted_but_not_saved(self):
+        AnswerFactory(creator=self.user)
+        ContributorStats.objects.all().delete()
+        self.assertEqual(1, get_stats(self.user).answers)
+        self.assertFalse(ContributorStats.objects.exists())
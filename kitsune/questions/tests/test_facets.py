@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from kitsune.products.tests import ProductFactory, TopicFactory
+from kitsune.questions import facets
+from kitsune.questions.tests import AnswerFactory, QuestionFactory
+from kitsune.sumo.tests import TestCase
+
+
+class RecentStatsTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.firefox = ProductFactory()
+        self.mobile = ProductFactory()
+        QuestionFactory(created=now, locale="en-US", product=self.firefox)
+        QuestionFactory(created=now, locale="en-US", product=self.firefox, is_locked=True)
+        AnswerFactory(question=QuestionFactory(created=now, locale="en-US", product=self.mobile))
+        QuestionFactory(created=now, locale="pt-BR", product=self.firefox)
+        # 25 hours instead of 24 to avoid random test fails.
+        QuestionFactory(created=now - timedelta(hours=25), locale="en-US", product=self.firefox)
+
+    def test_recent_stats(self):
+        self.assertEqual((4, 2, 50), facets.recent_stats({"en-US", "pt-BR"}))
+        self.assertEqual((3, 1, 66), facets.recent_stats({"en-US"}))
+        self.assertEqual((2, 1, 50), facets.recent_stats({"en-US"}, {self.firefox.id}))
+        self.assertEqual((1, 0, 100), facets.recent_stats({"en-US"}, {self.mobile.id}))
+        self.assertEqual((0, 0, 0), facets.recent_stats({"de"}))
+
+    def test_recent_stats_are_cached(self):
+        facets.recent_stats({"en-US"})
+        with self.assertNumQueries(0):
+            self.assertEqual((1, 1, 0), facets.recent_stats({"pt-BR"}))
+
+    def test_new_question_drops_recent_stats(self):
+        self.assertEqual((1, 1, 0), facets.recent_stats({"pt-BR"}))
+        QuestionFactory(locale="pt-BR", product=self.firefox)
+        self.assertEqual((2, 2, 0), facets.recent_stats({"pt-BR"}))
+
+
+class TopicListTests(TestCase):
+    def test_topic_list(self):
+        product = ProductFactory()
+        topic = TopicFactory(products=[product], in_aaq=True, visible=True)
+        TopicFactory(products=[product], in_aaq=False, visible=True)
+        self.assertEqual([topic], facets.topic_list({product.id}))
+
+        with self.assertNumQueries(0):
+            self.assertEqual([topic], facets.topic_list({product.id}))
+
+        topic.visible = False
+        topic.save()
+        self.assertEqual([], facets.topic_list({product.id}))
@@ -6,6 +6,7 @@ import waffle
 from actstream.models import Action, Follow
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
+from django.test.utils import override_settings
 from django.utils import timezone
 
 import kitsune.sumo.models
@@ -21,6 +22,7 @@ from kitsune.questions.models import (
     QuestionVisits,
     VoteMetadata,
     _tenths_version,
+    load_content_parsed,
 )
 from kitsune.questions.tasks import auto_archive_old_questions, update_answer_pages
 from kitsune.questions.tests import (
@@ -183,6 +185,69 @@ class TestAnswer(TestCase):
         self.assertEqual(answer_follow.actor_only, False)
 
 
+class ContentParsedTests(TestCase):
+    def test_content_html_is_stored_when_content_changes(self):
+        a = AnswerFactory(content="Hello")
+        self.assertEqual("<p>Hello\n</p>", a.content_html)
+
+        a = Answer.objects.get(id=a.id)
+        with self.assertNumQueries(0):
+            self.assertEqual("<p>Hello\n</p>", a.content_parsed)
+
+        a.content = "Bye"
+        a.save()
+        self.assertEqual("<p>Bye\n</p>", Answer.objects.get(id=a.id).content_html)
+        self.assertEqual("<p>Bye\n</p>", a.content_parsed)
+
+    def test_content_with_links_is_only_cached(self):
+        a = AnswerFactory(content="[[Some article]]")
+        self.assertEqual("", a.content_html)
+        self.assertIn("Some article", Answer.objects.get(id=a.id).content_parsed)
+        self.assertEqual("", Answer.objects.get(id=a.id).content_html)
+
+    @override_settings(READ_ONLY=True)
+    def test_load_content_parsed_when_read_only(self):
+        a = AnswerFactory(content="Answer")
+        Answer.objects.filter(id=a.id).update(content_html="")
+        a = Answer.objects.get(id=a.id)
+        with self.assertNumQueries(0):
+            load_content_parsed([a])
+        self.assertEqual("<p>Answer\n</p>", a.content_parsed)
+        self.assertEqual("", Answer.objects.get(id=a.id).content_html)
+
+    def test_load_content_parsed_keeps_concurrent_edits(self):
+        a = AnswerFactory(content="Answer")
+        Answer.objects.filter(id=a.id).update(content_html="")
+        a = Answer.objects.get(id=a.id)
+        Answer.objects.filter(id=a.id).update(content="Edited", content_html="<p>Edited\n</p>")
+        load_content_parsed([a])
+        self.assertEqual("<p>Edited\n</p>", Answer.objects.get(id=a.id).content_html)
+
+    def test_content_html_of_another_version_is_parsed_again(self):
+        a = AnswerFactory(content="Answer")
+        Answer.objects.filter(id=a.id).update(content_html="<p>Old</p>")
+        with mock.patch("kitsune.questions.models.CONTENT_HTML_VERSION", 1):
+            self.assertEqual("<p>Answer\n</p>", Answer.objects.get(id=a.id).content_parsed)
+            a = Answer.objects.get(id=a.id)
+            self.assertEqual("<p>Answer\n</p>", a.content_html)
+            self.assertEqual(1, a.content_html_version)
+
+    def test_load_content_parsed(self):
+        q = QuestionFactory(content="Question")
+        AnswerFactory.create_batch(3, question=q, content="Answer")
+        Answer.objects.filter(question=q).update(content_html="")
+        answers = list(q.answers.all())
+
+        # A cache round trip to read, one to write, and a query per answer to store
+        # the HTML.
+        with self.assertNumQueries(3):
+            load_content_parsed([q, *answers])
+        self.assertEqual(["<p>Answer\n</p>"] * 3, [a.content_parsed for a in answers])
+        self.assertEqual(
+            ["<p>Answer\n</p>"] * 3, list(q.answers.values_list("content_html", flat=True))
+        )
+
+
 class TestQuestionMetadata(TestCase):
     """Tests handling question metadata"""
 
@@ -731,20 +796,20 @@ class QuestionVisitsTests(TestCase):
 
     # Need to monkeypatch close_old_connections out because it
     # does something screwy with the testing infra around transactions.
-    @mock.patch.object(googleanalytics, "pageviews_by_question")
-    def test_visit_count_from_analytics(self, pageviews_by_question):
+    @mock.patch.object(googleanalytics, "iter_pageviews_by_question")
+    def test_visit_count_from_analytics(self, iter_pageviews_by_question):
         """Verify stored visit counts from mocked data."""
         q1 = QuestionFactory()
         q2 = QuestionFactory()
         q3 = QuestionFactory()
 
-        pageviews_by_question.return_value = dict(
-            row
-            for row in (
+        iter_pageviews_by_question.return_value = iter(
+            (
                 (q1.id, 42),
                 (q2.id, 27),
-                (q3.id, 1337),
+                (q3.id, 1000),
                 (123459, 3),
+                (q3.id, 337),
             )
         )
 
@@ -755,9 +820,8 @@ class QuestionVisitsTests(TestCase):
         self.assertEqual(1337, QuestionVisits.objects.get(question_id=q3.id).visits)
 
         # Change the data and run again to cover the update case.
-        pageviews_by_question.return_value = dict(
-            row
-            for row in (
+        iter_pageviews_by_question.return_value = iter(
+            (
                 (q1.id, 100),
                 (q2.id, 200),
                 (q3.id, 300),
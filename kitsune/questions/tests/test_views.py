@@ -1,5 +1,6 @@
 import json
 from datetime import datetime, timedelta
+from unittest import mock
 
 from django.conf import settings
 from django.test.utils import override_settings
@@ -633,6 +634,29 @@ class TestQuestionList(TestCase):
         # de is not in AAQ_LANGUAGES, so should show en-US, but not pt-BR
         sub_test("de", "cupcakes?", "donuts?", "pastries?")
 
+    @mock.patch("kitsune.questions.config.QUESTIONS_PER_PAGE", 2)
+    def test_cursor_pages(self):
+        """Pages are linked by cursor, and old page numbers go back to the first page."""
+        p = ProductFactory(slug="firefox")
+        for title in ("older", "old", "new"):
+            QuestionFactory(title=title, product=p)
+        url = urlparams(reverse("questions.list", args=["firefox"]), show="all")
+
+        doc = pq(self.client.get(url).content)
+        self.assertEqual(
+            ["new", "old"], [a.text.strip() for a in doc(".question-entry--title-link")]
+        )
+        next_url = doc(".btn-page-next").attr("href")
+
+        doc = pq(self.client.get(next_url).content)
+        self.assertEqual(["older"], [a.text.strip() for a in doc(".question-entry--title-link")])
+        self.assertEqual(0, len(doc(".btn-page-next")))
+        self.assertEqual(1, len(doc(".btn-page-prev")))
+
+        response = self.client.get(urlparams(url, page=3))
+        self.assertEqual(302, response.status_code)
+        assert response["location"].endswith("page=1")
+
 
 class TestQuestionReply(TestCase):
     def setUp(self):
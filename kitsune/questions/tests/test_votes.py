@@ -1,4 +1,6 @@
-from kitsune.questions.models import Question
+from unittest import mock
+
+from kitsune.questions.models import Question, question_votes_counter
 from kitsune.questions.tasks import update_weekly_votes
 from kitsune.questions.tests import QuestionFactory, QuestionVoteFactory
 from kitsune.sumo.tests import TestCase
@@ -7,11 +9,27 @@ from kitsune.sumo.tests import TestCase
 class TestVotes(TestCase):
     """Test QuestionVote counting and cron job."""
 
+    def setUp(self):
+        super().setUp()
+        if question_votes_counter.redis:
+            question_votes_counter.reset()
+
     def test_vote_updates_count(self):
         q = QuestionFactory()
         self.assertEqual(0, q.num_votes_past_week)
 
         QuestionVoteFactory(question=q, anonymous_id="abc123")
+        QuestionVoteFactory(question=q, anonymous_id="def456")
+        update_weekly_votes()
+
+        q = Question.objects.get(id=q.id)
+        self.assertEqual(2, q.num_votes_past_week)
+
+    def test_vote_updates_count_without_redis(self):
+        q = QuestionFactory()
+
+        with mock.patch.object(question_votes_counter, "incr", return_value=False):
+            QuestionVoteFactory(question=q, anonymous_id="abc123")
 
         q = Question.objects.get(id=q.id)
         self.assertEqual(1, q.num_votes_past_week)
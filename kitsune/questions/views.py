@@ -9,8 +9,9 @@ from django.contrib import messages
 from django.contrib.auth.views import redirect_to_login
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.core.paginator import InvalidPage
 from django.db.models import Exists, F, OuterRef, Q
 from django.db.models.functions import Now
 from django.http import (
@@ -42,7 +43,7 @@ from kitsune.flagit.views import get_hierarchical_topics
 from kitsune.products import get_product_redirect_response
 from kitsune.products.managers import ProductSupportConfigManager
 from kitsune.products.models import Product, ProductSupportConfig, Topic, TopicSlugHistory
-from kitsune.questions import config
+from kitsune.questions import config, facets
 from kitsune.questions.events import QuestionReplyEvent, QuestionSolvedEvent
 from kitsune.questions.feeds import AnswersFeed, QuestionsFeed, TaggedQuestionsFeed
 from kitsune.questions.forms import (
@@ -56,7 +57,13 @@ from kitsune.questions.forms import (
     NewQuestionForm,
     WatchQuestionForm,
 )
-from kitsune.questions.models import Answer, AnswerVote, Question, QuestionVote
+from kitsune.questions.models import (
+    Answer,
+    AnswerVote,
+    Question,
+    QuestionVote,
+    load_content_parsed,
+)
 from kitsune.questions.utils import (
     get_ga_submit_event_parameters_as_json,
     get_mobile_product_from_ua,
@@ -70,9 +77,9 @@ from kitsune.sumo.utils import (
     get_next_url,
     has_support_config,
     is_ratelimited,
+    keyset_paginate,
     paginate,
     set_aaq_context,
-    simple_paginate,
 )
 from kitsune.tags.models import SumoTag, SumoTaggedItem
 from kitsune.tags.utils import add_existing_tag
@@ -80,6 +87,7 @@ from kitsune.tidings.events import ActivationRequestFailed
 from kitsune.tidings.models import Watch
 from kitsune.upload.models import ImageAttachment
 from kitsune.users.models import Setting
+from kitsune.users.profiles import prefetch_profiles
 from kitsune.users.utils import user_is_contributor
 from kitsune.wiki.facets import topics_for
 from kitsune.wiki.utils import build_topics_data, get_featured_articles, get_kb_visited
@@ -307,13 +315,12 @@ def question_list(request, product_slug=None, topic_slug=None):
         question_qs = question_qs.filter(topic__in=topics)
 
     # Filter by locale for AAQ locales, and by locale + default for others.
-    if request.LANGUAGE_CODE in ProductSupportConfig.objects.locales_list():
-        locale_query = Q(locale=request.LANGUAGE_CODE)
+    if request.LANGUAGE_CODE in facets.forum_locales():
+        locales = {request.LANGUAGE_CODE}
     else:
-        locale_query = Q(locale=request.LANGUAGE_CODE)
-        locale_query |= Q(locale=settings.WIKI_DEFAULT_LANGUAGE)
+        locales = {request.LANGUAGE_CODE, settings.WIKI_DEFAULT_LANGUAGE}
 
-    question_qs = question_qs.filter(locale_query)
+    question_qs = question_qs.filter(locale__in=locales)
 
     # Apply tag filter.
     if tagged:
@@ -349,48 +356,41 @@ def question_list(request, product_slug=None, topic_slug=None):
     # Set a default value if a user requested a non existing order parameter
     order_by = ORDER_BY.get(order, ["updated"])[0]
 
-    # Use Django's built-in NULL sorting features
-    if sort == "asc":
-        order_by_expression = F(order_by).asc(nulls_first=True)
-    else:
-        order_by_expression = F(order_by).desc(nulls_last=True)
-
-    question_qs = question_qs.order_by(order_by_expression)
-
+    # Pages are fetched by seeking past a cursor, so deep pages cost the same as the
+    # first. The paginator orders by the field and then by id, with nulls first when
+    # ascending and last when descending.
     try:
-        questions_page = simple_paginate(request, question_qs, per_page=config.QUESTIONS_PER_PAGE)
-    except PageNotAnInteger, EmptyPage:
+        questions_page = keyset_paginate(
+            request,
+            question_qs,
+            order_by,
+            descending=sort != "asc",
+            nulls_last=sort != "asc",
+            per_page=config.QUESTIONS_PER_PAGE,
+        )
+    except InvalidPage:
         # If we aren't on page 1, redirect there.
         # TODO: Is 404 more appropriate?
         if request.GET.get("page", "1") != "1":
             url = build_paged_url(request)
             return HttpResponseRedirect(urlparams(url, page=1))
+    else:
+        prefetch_profiles(
+            user
+            for question in questions_page
+            for user in (question.creator, question.last_answer and question.last_answer.creator)
+        )
 
     # Recent answered stats.
-    extra_filters = locale_query
-
-    if products:
-        extra_filters &= Q(product__in=products)
-
-    recent_asked_count = Question.recent_asked_count(extra_filters)
-    recent_unanswered_count = Question.recent_unanswered_count(extra_filters)
-
-    if recent_asked_count:
-        recent_answered_percent = int(
-            (float(recent_asked_count - recent_unanswered_count) / recent_asked_count) * 100
-        )
-    else:
-        recent_answered_percent = 0
+    recent_asked_count, recent_unanswered_count, recent_answered_percent = facets.recent_stats(
+        locales, product_ids={p.id for p in products} if products else None
+    )
 
     # List of products to fill the selector.
     product_list = Product.active.filter(visible=True)
 
     # List of topics to fill the selector.
-    topic_list = Topic.active.filter(in_aaq=True, visible=True)
-    if product_slugs:
-        topic_list = topic_list.filter(products__in=products).distinct()
-    else:
-        topic_list = topic_list.filter(in_nav=True)
+    topic_list = facets.topic_list(product_ids={p.id for p in products} if product_slugs else None)
 
     # Store current filters in the session
     if request.user.is_authenticated:
@@ -469,58 +469,11 @@ def _apply_question_filters(search, **kwargs):
     return search
 
 
-@require_GET
-@ratelimit("question-tags", "30/m", method="GET")
-def question_tags(request):
-    """Return tag filter HTML for the sidebar, populated from Elasticsearch."""
-    if request.limited:
-        return HttpResponse(status=429)
-
-    show = request.GET.get("show", "needs-attention")
-    if show not in FILTER_GROUPS or show == "spam":
-        return HttpResponse("")
-
-    tagged = request.GET.get("tagged", "")
-    locale = request.LANGUAGE_CODE
-    product_slug = request.GET.get("product_slug", "")
-    topic_slug = request.GET.get("topic_slug", "")
-    topic_navigation = request.GET.get("topic_navigation") == "1"
-    owner = request.GET.get("owner", "")
-
-    product_ids = []
-    if product_slug and product_slug != "all":
-        product_ids = list(
-            Product.objects.filter(slug__in=product_slug.split(",")).values_list("id", flat=True)
-        )
-
-    topic_id = None
-    if topic_slug:
-        topic = Topic.active.filter(slug=topic_slug).first()
-        if topic:
-            topic_id = topic.id
-
-    if topic_navigation and topic_slug:
-        base_list_url = reverse("questions.list_by_topic", kwargs={"topic_slug": topic_slug})
-    elif product_slug:
-        base_list_url = reverse("questions.list", kwargs={"product_slug": product_slug})
-    else:
-        base_list_url = reverse("questions.list", kwargs={"product_slug": "all"})
-
-    preserve_params = {
-        k: v
-        for k, v in request.GET.items()
-        if k not in ("product_slug", "topic_slug", "topic_navigation", "tagged", "page")
-    }
-    # When the topic was selected via ?topic= (not the /by-topic/<slug>/ route),
-    # re-expose it under its list-page name so tag hrefs keep the topic filter.
-    if topic_slug and not topic_navigation:
-        preserve_params["topic"] = topic_slug
-    base_list_url_with_params = urlparams(base_list_url, **preserve_params)
-
-    filter_ = request.GET.get("filter", "")
-    if filter_ not in FILTER_GROUPS.get(show, {}):
-        filter_ = None
-
+def _search_available_tags(locale, product_ids, topic_id, show, filter_, q, user_id=None):
+    """
+    Return the tags of the questions matching a question list's filters, with their
+    counts, aggregated in Elasticsearch, or None if Elasticsearch couldn't be reached.
+    """
     now = timezone.now()
 
     FILTER_PRESETS = {
@@ -563,7 +516,7 @@ def question_tags(request):
         if product_ids:
             search = search.filter("terms", question_product_id=product_ids)
 
-        if locale in ProductSupportConfig.objects.locales_list():
+        if locale in facets.forum_locales():
             search = search.filter("term", locale=locale)
         else:
             search = search.filter(
@@ -581,8 +534,7 @@ def question_tags(request):
             DSLQ("range", question_created={"lt": now - timedelta(days=90)})
             & DSLQ("term", question_has_answers=False)
         )
-        if owner == "mine" and request.user.is_authenticated:
-            user_id = str(request.user.id)
+        if user_id:
             search = search.filter(
                 DSLQ("term", question_creator_id=user_id)
                 | DSLQ("term", question_answer_creator_ids=user_id)
@@ -619,8 +571,6 @@ def question_tags(request):
         TAG_AGGREGATION_SIZE = 50
         search = search.extra(size=0)
 
-        q = request.GET.get("q", "").strip().lower()[:TAG_QUERY_MAX_LENGTH]
-
         nested_agg = search.aggs.bucket("nested_tags", DSLA("nested", path="question_tags"))
 
         if q:
@@ -658,7 +608,89 @@ def question_tags(request):
             display_name = display_buckets[0].key if display_buckets else b.key
             available_tags.append({"slug": b.key, "name": display_name, "count": b.doc_count})
     except TransportError:
-        pass
+        return None
+
+    return available_tags
+
+
+@require_GET
+@ratelimit("question-tags", "30/m", method="GET")
+def question_tags(request):
+    """Return tag filter HTML for the sidebar, populated from Elasticsearch."""
+    if request.limited:
+        return HttpResponse(status=429)
+
+    show = request.GET.get("show", "needs-attention")
+    if show not in FILTER_GROUPS or show == "spam":
+        return HttpResponse("")
+
+    tagged = request.GET.get("tagged", "")
+    locale = request.LANGUAGE_CODE
+    product_slug = request.GET.get("product_slug", "")
+    topic_slug = request.GET.get("topic_slug", "")
+    topic_navigation = request.GET.get("topic_navigation") == "1"
+    owner = request.GET.get("owner", "")
+
+    product_ids = []
+    if product_slug and product_slug != "all":
+        product_ids = list(
+            Product.objects.filter(slug__in=product_slug.split(",")).values_list("id", flat=True)
+        )
+
+    topic_id = None
+    if topic_slug:
+        topic = Topic.active.filter(slug=topic_slug).first()
+        if topic:
+            topic_id = topic.id
+
+    if topic_navigation and topic_slug:
+        base_list_url = reverse("questions.list_by_topic", kwargs={"topic_slug": topic_slug})
+    elif product_slug:
+        base_list_url = reverse("questions.list", kwargs={"product_slug": product_slug})
+    else:
+        base_list_url = reverse("questions.list", kwargs={"product_slug": "all"})
+
+    preserve_params = {
+        k: v
+        for k, v in request.GET.items()
+        if k not in ("product_slug", "topic_slug", "topic_navigation", "tagged", "page")
+    }
+    # When the topic was selected via ?topic= (not the /by-topic/<slug>/ route),
+    # re-expose it under its list-page name so tag hrefs keep the topic filter.
+    if topic_slug and not topic_navigation:
+        preserve_params["topic"] = topic_slug
+    base_list_url_with_params = urlparams(base_list_url, **preserve_params)
+
+    filter_ = request.GET.get("filter", "")
+    if filter_ not in FILTER_GROUPS.get(show, {}):
+        filter_ = None
+
+    q = request.GET.get("q", "").strip().lower()[:TAG_QUERY_MAX_LENGTH]
+
+    if owner == "mine" and request.user.is_authenticated:
+        available_tags = _search_available_tags(
+            locale, product_ids, topic_id, show, filter_, q, user_id=str(request.user.id)
+        )
+        available_tags = available_tags or []
+    else:
+        # Everyone looking at the same list sees the same tags, so share them for a while.
+        cache_key = facets.tag_facets_cache_key(
+            locale=locale,
+            product_ids=sorted(product_ids),
+            topic_id=topic_id,
+            show=show,
+            filter=filter_,
+            q=q,
+        )
+        available_tags = cache.get(cache_key)
+        if available_tags is None:
+            available_tags = _search_available_tags(
+                locale, product_ids, topic_id, show, filter_, q
+            )
+            if available_tags is None:
+                available_tags = []
+            else:
+                cache.set(cache_key, available_tags, settings.QUESTION_FACETS_TIMEOUT)
 
     tags = None
     if tagged:
@@ -1904,12 +1936,20 @@ def _answers_data(request, question_id, form=None, watch_form=None, answer_previ
         ).prefetch_related("tags", "metadata_set"),
         pk=question_id,
     )
-    answers_ = question.answers.all()
+    answers_ = question.answers.select_related("creator__contributor_stats")
 
     if not request.user.has_perm("flagit.can_moderate"):
         answers_ = answers_.filter(is_spam=False)
 
     answers_ = paginate(request, answers_, per_page=config.ANSWERS_PER_PAGE)
+    # Load the parsed content of the whole page at once, rather than one by one.
+    posts = [question, *answers_]
+    if question.solution:
+        posts.append(question.solution)
+    load_content_parsed(posts)
+    prefetch_profiles(
+        [question.creator, question.updated_by, *(answer.creator for answer in answers_)]
+    )
     feed_urls = (
         (
             reverse("questions.answers.feed", kwargs={"question_id": question_id}),
@@ -72,9 +72,18 @@ def query_configuration_problems() -> list[str]:
             f"of at least {MIN_EMBEDDING_TIMEOUT_SECONDS}"
         )
 
+    window = settings.RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS
+    if not is_finite_number(window) or window < 0:
+        problems.append(
+            "RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS must be a finite, non-negative "
+            "number of seconds"
+        )
+
     ttl = settings.RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS
     if not is_positive_int(ttl):
         problems.append("RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS must be a positive integer")
+    if not is_nonnegative_int(settings.RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE):
+        problems.append("RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE must be a non-negative integer")
 
     bounds = (
         ("RETRIEVAL_SEMANTIC_K", settings.RETRIEVAL_SEMANTIC_K),
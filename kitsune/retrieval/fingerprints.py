@@ -121,6 +121,11 @@ def content_hash(chunks: Sequence[Chunk]) -> str:
     return _digest([chunk.text for chunk in chunks])
 
 
+def chunk_fingerprint(chunk: Chunk) -> str:
+    """Hash one chunk's embedding input, so an unchanged chunk can keep its stored vector."""
+    return _digest(chunk.text)
+
+
 def index_state_hash(chunks: Sequence[Chunk], source: ChunkStateSource) -> str:
     """Hash metadata whose drift requires reindexing without recomputing vectors."""
     payload = {
@@ -20,6 +20,7 @@ from kitsune.retrieval.embeddings import (
 from kitsune.retrieval.fingerprints import (
     InvalidIndexMeta,
     build_index_meta,
+    chunk_fingerprint,
     content_hash,
     index_state_hash,
     mapping_fingerprint,
@@ -142,6 +143,8 @@ class ChunkDocument(SumoDocument):
     applies_to = field.Keyword(multi=True)  # lossy flattened union; coarse selection only
     heading_path = field.Text()
     position = field.Integer()
+    # Hash of this chunk's text: a later sync reuses the vector of any chunk it still produces.
+    chunk_fingerprint = field.Keyword()
 
     # identity fields (content_type/object_id/locale are shared by both kinds)
     content_type = field.Keyword()
@@ -426,6 +429,9 @@ def _chunk_metadata(
         "applies_to": sorted(chunk.applies_to),
         "scope": scope_envelope(chunk.scope),
         "scope_clause_count": len(chunk.scope),
+        # Derived from text the expected state has already proven unchanged, so a metadata
+        # update can backfill it for chunks written before fingerprints were stored.
+        "chunk_fingerprint": chunk_fingerprint(chunk),
         "family_id": source.family_id,
         "visibility": source.visibility,
         "access_group_ids": list(source.access_group_ids),
@@ -613,6 +619,39 @@ def read_chunk_summaries(*, index: str, identity: ChunkIdentity) -> tuple[Stored
         return _sorted_chunk_summaries(_chunk_summary(hit.get("_source", {})) for hit in hits)
 
 
+def read_chunk_vectors(*, index: str, identity: ChunkIdentity) -> dict[str, list[float]]:
+    """Read this document's stored vectors keyed by the fingerprint of the chunk they embed.
+
+    Chunks without a fingerprint or a vector are skipped, so they are simply embedded again.
+    """
+    _require_concrete_index(index)
+    vectors: dict[str, list[float]] = {}
+    with closing(
+        scan(
+            es_client(),
+            index=index,
+            query={
+                "query": {
+                    "bool": {
+                        "filter": [*_identity_filters(identity), {"term": {"kind": CHUNK_KIND}}]
+                    }
+                },
+                "_source": {
+                    "includes": ["chunk_fingerprint", "content_vector"],
+                    "exclude_vectors": False,
+                },
+            },
+        )
+    ) as hits:
+        for hit in hits:
+            source = hit.get("_source", {})
+            fingerprint = source.get("chunk_fingerprint")
+            vector = source.get("content_vector")
+            if isinstance(fingerprint, str) and isinstance(vector, list):
+                vectors[fingerprint] = vector
+    return vectors
+
+
 def read_index_summaries(
     *, index: str, content_type: str, locales: tuple[str, ...] = ()
 ) -> dict[ChunkIdentity, IndexedDocumentSummary]:
@@ -0,0 +1,76 @@
+"""Micro-batch query embeddings requested by concurrent searches in one process.
+
+The first cache miss for a recipe opens a batch and waits for
+``RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS``; misses from other threads which arrive in
+the meantime join it, and the whole batch is embedded with one ``get_embeddings`` call.
+A query which is already pending or being embedded is never requested twice: later callers
+wait for the vector that is on its way, which keeps a burst of identical searches from
+turning into a burst of provider calls.
+
+Only threads of the same process share batches, so a window only pays off with threaded
+workers. With synchronous workers each miss would wait for it alone, so it defaults to 0,
+which embeds every miss right away.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+from kitsune.retrieval.embeddings import EmbeddingRecipe, EmbeddingUnavailable, get_embeddings
+
+
+class QueryEmbeddingBatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[EmbeddingRecipe, dict[str, Future]] = {}
+        self._in_flight: dict[tuple[EmbeddingRecipe, str], Future] = {}
+
+    def embed(self, query: str, recipe: EmbeddingRecipe) -> list[float]:
+        """Return the query vector, embedding it in a batch with concurrent misses."""
+        window = settings.RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS
+        with self._lock:
+            future = self._in_flight.get((recipe, query))
+            leader = future is None and recipe not in self._pending
+            if future is None:
+                future = Future()
+                self._in_flight[(recipe, query)] = future
+                self._pending.setdefault(recipe, {})[query] = future
+
+        if leader:
+            if window > 0:
+                time.sleep(window)
+            self._embed_pending(recipe)
+
+        try:
+            # The leader has resolved every future in its batch before reaching this point.
+            vector = future.result(
+                timeout=window + settings.RETRIEVAL_QUERY_EMBEDDING_TIMEOUT_SECONDS
+            )
+        except FutureTimeoutError as exc:
+            raise EmbeddingUnavailable("query embedding is unavailable") from exc
+        return list(vector)
+
+    def _embed_pending(self, recipe: EmbeddingRecipe) -> None:
+        with self._lock:
+            batch = self._pending.pop(recipe)
+        queries = list(batch)
+        try:
+            vectors = get_embeddings(queries, task="query", recipe=recipe)
+            # Fail the whole batch, rather than leave it waiting, if a vector is missing.
+            results = dict(zip(queries, vectors, strict=True))
+        except Exception as exc:
+            for future in batch.values():
+                future.set_exception(exc)
+        else:
+            for query, vector in results.items():
+                batch[query].set_result(vector)
+        finally:
+            with self._lock:
+                for query in queries:
+                    self._in_flight.pop((recipe, query), None)
+
+
+query_embedding_batcher = QueryEmbeddingBatcher()
@@ -1,6 +1,16 @@
-"""Exact-query vector caching shared by interactive retrieval consumers."""
+"""Query vector caching shared by interactive retrieval consumers.
+
+Queries are normalized before they are embedded, so trivially different spellings of the same
+search ("Firefox crashes", "firefox crashes?") share one vector. Vectors are cached in two
+tiers: a small per-process LRU in front of the shared Django cache, so that repeated queries on
+one web worker skip the network round trip as well as the provider call.
+"""
 
 import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
 from typing import Literal
 
 from django.conf import settings
@@ -9,22 +19,97 @@ from django.core.cache import cache
 from kitsune.retrieval.embeddings import (
     EmbeddingRecipe,
     InvalidEmbeddingResponse,
-    get_embeddings,
     recipe_to_payload,
     validate_embeddings,
 )
 from kitsune.retrieval.fingerprints import query_embedding_fingerprint
+from kitsune.retrieval.query_batching import query_embedding_batcher
 
-_CACHE_NAMESPACE = "retrieval:query-vector:v1"
-CacheLookupOutcome = Literal["hit", "miss", "invalid", "read_failed"]
+_CACHE_NAMESPACE = "retrieval:query-vector:v2"
+# "local_hit" is served by this process; "hit" by the shared cache.
+CacheLookupOutcome = Literal["local_hit", "hit", "miss", "invalid", "read_failed"]
 CacheWriteOutcome = Literal["stored", "write_failed"]
 
+# Languages whose case mapping pairs dotted and dotless I differently from the default.
+_DOTTED_I_LANGUAGES = frozenset({"tr", "az"})
+
+
+def normalize_query(query: str, locale: str | None = None) -> str:
+    """Return the form of a query which is embedded and used as its cache identity.
+
+    Folds compatibility characters, case (honoring Turkish and Azeri dotted I), whitespace,
+    and punctuation at the edges of words. A query of nothing but punctuation keeps it.
+    """
+    text = unicodedata.normalize("NFKC", query)
+    if locale and locale.split("-")[0].lower() in _DOTTED_I_LANGUAGES:
+        text = text.replace("I", "ı").replace("İ", "i")
+    words = text.casefold().split()
+    stripped = [word for word in map(_strip_punctuation, words) if word]
+    return " ".join(stripped or words)
+
+
+def _strip_punctuation(word: str) -> str:
+    start, end = 0, len(word)
+    while start < end and unicodedata.category(word[start]).startswith("P"):
+        start += 1
+    while end > start and unicodedata.category(word[end - 1]).startswith("P"):
+        end -= 1
+    return word[start:end]
+
+
+class _LocalVectorCache:
+    """A bounded, thread-safe LRU of query vectors which expire with the shared cache ttl."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, tuple[float, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, vector = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(vector)
+
+    def set(self, key: str, vector: list[float]) -> None:
+        size = settings.RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE
+        if size <= 0:
+            return
+        expires = time.monotonic() + settings.RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS
+        with self._lock:
+            self._entries[key] = (expires, tuple(vector))
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = _LocalVectorCache()
+
+
+def clear_local_query_vector_cache() -> None:
+    """Empty this process's query vector tier."""
+    _local_cache.clear()
+
 
 def get_cached_query_vector(
-    query: str, recipe: EmbeddingRecipe
+    query: str, recipe: EmbeddingRecipe, *, locale: str | None = None
 ) -> tuple[list[float] | None, CacheLookupOutcome]:
-    """Return a validated exact-query cache hit and its bounded lookup outcome."""
+    """Return a validated normalized-query cache hit and its bounded lookup outcome."""
+    query = normalize_query(query, locale)
     key = _query_vector_cache_key(query, recipe)
+    vector = _local_cache.get(key)
+    if vector is not None:
+        return vector, "local_hit"
+
     try:
         vector = cache.get(key)
     except Exception:
@@ -42,20 +127,21 @@ def get_cached_query_vector(
         except Exception:
             pass
         return None, "invalid"
-    return [float(value) for value in vector], "hit"
+    vector = [float(value) for value in vector]
+    _local_cache.set(key, vector)
+    return vector, "hit"
 
 
 def embed_and_cache_query_vector(
-    query: str, recipe: EmbeddingRecipe
+    query: str, recipe: EmbeddingRecipe, *, locale: str | None = None
 ) -> tuple[list[float], CacheWriteOutcome]:
-    """Embed one authorized cache miss and report whether the cache write succeeded."""
-    [vector] = get_embeddings([query], task="query", recipe=recipe)
+    """Embed one authorized cache miss and report whether the shared cache write succeeded."""
+    query = normalize_query(query, locale)
+    vector = query_embedding_batcher.embed(query, recipe)
+    key = _query_vector_cache_key(query, recipe)
+    _local_cache.set(key, vector)
     try:
-        cache.set(
-            _query_vector_cache_key(query, recipe),
-            vector,
-            timeout=settings.RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS,
-        )
+        cache.set(key, vector, timeout=settings.RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS)
     except Exception:
         return vector, "write_failed"
     return vector, "stored"
@@ -3,6 +3,10 @@
 ``plan_target`` is pure — it names an outcome and touches nothing — so the whole outcome
 matrix is testable without Elasticsearch, Redis, or the database. A batch runs the same
 decisions as a single document and only shares the provider calls.
+
+A replacement only embeds the chunks the index doesn't already hold a vector for: stored
+chunks carry a fingerprint of their text, so an edit to one section of a long article pays
+for that section rather than the whole article.
 """
 
 import logging
@@ -24,10 +28,13 @@ from kitsune.retrieval.eligibility import (
 )
 from kitsune.retrieval.embeddings import (
     EmbeddingRecipe,
+    InvalidEmbeddingResponse,
     get_embeddings,
+    validate_embeddings,
 )
 from kitsune.retrieval.events import emit
 from kitsune.retrieval.fingerprints import (
+    chunk_fingerprint,
     content_hash,
     index_state_hash,
 )
@@ -42,6 +49,7 @@ from kitsune.retrieval.index import (
     delete_chunks_for,
     delete_chunks_for_object,
     read_chunk_summaries,
+    read_chunk_vectors,
     read_manifest,
     recipe_for_index,
     replace_chunks,
@@ -87,9 +95,9 @@ def plan_target(
 ) -> SyncOutcome:
     """Name the cheapest outcome that makes this index correct for this document.
 
-    A final manifest is the commit marker. Stored text and vectors are intentionally not read:
-    exceptional incomplete writes are replaced instead of making every normal sync prove that
-    their individual vectors are reusable.
+    A final manifest is the commit marker. Stored text and vectors are intentionally not read
+    here: exceptional incomplete writes are replaced instead of making every normal sync prove
+    that their layout is reusable. The replacement itself reuses vectors by chunk fingerprint.
     """
     if _stored_is_newer(manifest, expected_state):
         return SyncOutcome.ABORTED_STALE
@@ -117,6 +125,10 @@ class SyncReport:
     # Embedding-adapter calls attributable to this document. A batch's shared call belongs to
     # the batch report; a document-specific fallback remains attributable here.
     embedding_calls: int = 0
+    # Chunks written with a vector already stored for the same text, and chunks sent to the
+    # provider. Both are zero unless the outcome wrote chunk text and vectors.
+    reused_chunks: int = 0
+    embedded_chunks: int = 0
 
 
 @dataclass(frozen=True)
@@ -127,6 +139,8 @@ class BatchSyncReport:
     index: str | None = None
     redispatch: tuple[int, ...] = ()
     embedding_calls: int = 0
+    reused_chunks: int = 0
+    embedded_chunks: int = 0
 
 
 def _report(
@@ -137,6 +151,8 @@ def _report(
     *,
     object_id: str | None = None,
     approved_at: datetime | None = None,
+    reused_chunks: int = 0,
+    embedded_chunks: int = 0,
 ) -> SyncReport:
     """Emit and return one consistent result for every terminal sync path."""
     approval_latency_ms = (
@@ -152,11 +168,13 @@ def _report(
         index=index,
         outcome=outcome.value,
         embedding_calls=embedding_calls,
+        reused_chunks=reused_chunks,
+        embedded_chunks=embedded_chunks,
         # Approval to searchable: null on paths with no approved revision, never a false zero.
         # Negative values deliberately expose clock skew or a future-dated review.
         approval_latency_ms=approval_latency_ms,
     )
-    return SyncReport(identity, index, outcome, embedding_calls)
+    return SyncReport(identity, index, outcome, embedding_calls, reused_chunks, embedded_chunks)
 
 
 def build_source(document) -> ChunkSource:
@@ -264,30 +282,72 @@ class _DocumentWork:
     # Approval time, for the freshness SLI only. Deliberately not part of the indexed payload
     # or any hash: it must not make a document look changed.
     approved_at: datetime | None = None
+    # Stored vectors for chunks whose text is unchanged, by the position they'll be written to.
+    reusable: dict[int, list[float]] = field(default_factory=dict)
+
+    def chunks_to_embed(self) -> list[Chunk]:
+        """The chunks a replacement has to send to the provider."""
+        if self.outcome is not SyncOutcome.EMBED_REPLACE:
+            return []
+        return [chunk for chunk in self.chunks if chunk.position not in self.reusable]
 
 
 def _embed_for_works(
     works: dict[int, _DocumentWork], recipe: EmbeddingRecipe
 ) -> tuple[dict[int, list[list[float]]], int]:
-    """Embed all documents needing replacement in one flattened provider call."""
+    """Embed the new chunks of all documents needing replacement in one flattened provider call,
+    and merge them with each document's reusable vectors."""
     inputs: list[str] = []
-    spans: dict[int, tuple[int, int]] = {}
-    for document_id, work in works.items():
-        if work.outcome is SyncOutcome.EMBED_REPLACE:
-            spans[document_id] = (len(inputs), len(inputs) + len(work.chunks))
-            inputs.extend(chunk.text for chunk in work.chunks)
+    for work in works.values():
+        inputs.extend(chunk.text for chunk in work.chunks_to_embed())
+
+    embedded = iter(get_embeddings(inputs, task="document", recipe=recipe) if inputs else ())
+    vectors = {
+        document_id: [
+            work.reusable[chunk.position] if chunk.position in work.reusable else next(embedded)
+            for chunk in work.chunks
+        ]
+        for document_id, work in works.items()
+        if work.outcome is SyncOutcome.EMBED_REPLACE
+    }
+    return vectors, 1 if inputs else 0
+
+
+def _reusable_vectors(
+    chunks: list[Chunk], index: str, identity: ChunkIdentity, recipe: EmbeddingRecipe
+) -> dict[int, list[float]]:
+    """Match stored vectors to the chunks whose text they embed, skipping any that are unusable."""
+    stored = read_chunk_vectors(index=index, identity=identity)
+    reusable = {}
+    for item in chunks:
+        vector = stored.get(chunk_fingerprint(item))
+        if vector is None:
+            continue
+        try:
+            validate_embeddings([vector], [item.text], recipe)
+        except InvalidEmbeddingResponse:
+            continue
+        reusable[item.position] = [float(value) for value in vector]
+    return reusable
 
-    if not inputs:
-        return {}, 0
-    combined = get_embeddings(inputs, task="document", recipe=recipe)
-    return {document_id: combined[start:stop] for document_id, (start, stop) in spans.items()}, 1
 
+def _chunk_counts(work: _DocumentWork, written: SyncOutcome) -> tuple[int, int]:
+    """How many written chunks reused a stored vector and how many were embedded."""
+    if written is not SyncOutcome.EMBED_REPLACE:
+        return 0, 0
+    if work.outcome is SyncOutcome.METADATA_ONLY:
+        # The incomplete-layout fallback embeds every chunk.
+        return 0, len(work.chunks)
+    embedded = len(work.chunks_to_embed())
+    return len(work.chunks) - embedded, embedded
 
-def _plan_document(document, index) -> _DocumentWork | SyncReport:
+
+def _plan_document(document, index, recipe: EmbeddingRecipe) -> _DocumentWork | SyncReport:
     """Plan one locked, eligible document for one index—or finish it outright.
 
     Returns a report when the document needs no provider work: it is stale or already agrees
-    with the target.
+    with the target. A replacement of a committed document also collects the stored vectors
+    it can reuse.
     """
     identity = _identity_for(document)
     source = build_source(document)
@@ -318,6 +378,11 @@ def _plan_document(document, index) -> _DocumentWork | SyncReport:
         expected=expected,
         outcome=plan,
         approved_at=document.current_revision.reviewed,
+        reusable=(
+            _reusable_vectors(chunks, index, identity, recipe)
+            if plan is SyncOutcome.EMBED_REPLACE and manifest is not None
+            else {}
+        ),
     )
     if plan is SyncOutcome.NO_OP:
         return _report(identity, index, SyncOutcome.NO_OP)
@@ -441,7 +506,7 @@ def sync_document_chunks(document_id: int, *, target_index: str | None = None) -
 
         # The recipe must fail before anything is paid for.
         recipe = recipe_for_index(index)
-        work = _plan_document(document, index)
+        work = _plan_document(document, index, recipe)
         if isinstance(work, SyncReport):
             return work
 
@@ -460,7 +525,16 @@ def sync_document_chunks(document_id: int, *, target_index: str | None = None) -
         if terminal is not None:
             return terminal
 
-    return _report(identity, index, outcome, calls, approved_at=work.approved_at)
+    reused, embedded = _chunk_counts(work, outcome)
+    return _report(
+        identity,
+        index,
+        outcome,
+        calls,
+        approved_at=work.approved_at,
+        reused_chunks=reused,
+        embedded_chunks=embedded,
+    )
 
 
 def ordered_document_ids(document_ids) -> tuple[int, ...]:
@@ -553,7 +627,7 @@ def sync_document_batch(document_ids, *, target_index: str | None = None) -> Bat
         recipe = recipe_for_index(index)
         planned_works: dict[int, _DocumentWork] = {}
         for document_id, document in eligible.items():
-            planned = _plan_document(document, index)
+            planned = _plan_document(document, index, recipe)
             if isinstance(planned, SyncReport):
                 reports[document_id] = planned
             else:
@@ -564,7 +638,7 @@ def sync_document_batch(document_ids, *, target_index: str | None = None) -> Bat
         works: dict[int, _DocumentWork] = {}
         used_inputs = 0
         for document_id, work in planned_works.items():
-            needed = len(work.chunks) if work.outcome is SyncOutcome.EMBED_REPLACE else 0
+            needed = len(work.chunks_to_embed())
             if works and used_inputs + needed > max_inputs:
                 redispatch.append(document_id)
                 continue
@@ -592,17 +666,22 @@ def sync_document_batch(document_ids, *, target_index: str | None = None) -> Bat
                         else:
                             reports[document_id] = terminal
                         continue
+                    reused, embedded = _chunk_counts(work, written_outcome)
                     reports[document_id] = _report(
                         work.identity,
                         index,
                         written_outcome,
                         fallback_calls,
                         approved_at=work.approved_at,
+                        reused_chunks=reused,
+                        embedded_chunks=embedded,
                     )
             except DocumentLockUnavailable:
                 redispatch.append(document_id)
 
     redispatch = sorted(set(redispatch))
+    reused_chunks = sum(report.reused_chunks for report in reports.values())
+    embedded_chunks = sum(report.embedded_chunks for report in reports.values())
     emit(
         "retrieval.batch.completed",
         content_type=CONTENT_TYPE,
@@ -610,6 +689,8 @@ def sync_document_batch(document_ids, *, target_index: str | None = None) -> Bat
         processed_count=len(reports),
         redispatched_count=len(redispatch),
         embedding_calls=calls,
+        reused_chunks=reused_chunks,
+        embedded_chunks=embedded_chunks,
         outcomes=dict(
             Counter(
                 report_outcome.value
@@ -623,6 +704,8 @@ def sync_document_batch(document_ids, *, target_index: str | None = None) -> Bat
         index=index,
         redispatch=tuple(redispatch),
         embedding_calls=calls,
+        reused_chunks=reused_chunks,
+        embedded_chunks=embedded_chunks,
     )
 
 
@@ -202,6 +202,26 @@ class BatchExecutorTests(BatchTestCase):
         self.assertEqual(report.embedding_calls, 0)
         self.assertNotEqual(self._stored(self.documents[0]).chunks[0]["product_ids"], [])
 
+    def test_unchanged_chunks_reuse_their_stored_vectors(self):
+        sync_document_batch(self.ids)
+        document = self.documents[0]
+        ApprovedRevisionFactory(
+            document=document, content="== One ==\nFirst part.\n\n== Two ==\nSecond part.\n"
+        )
+        document.refresh_from_db()
+        sync_document_batch(self.ids)
+        ApprovedRevisionFactory(
+            document=document, content="== One ==\nFirst part.\n\n== Two ==\nChanged part.\n"
+        )
+        document.refresh_from_db()
+
+        report = sync_document_batch(self.ids)
+
+        self.assertEqual(report.reports[self.ids[0]].outcome, SyncOutcome.EMBED_REPLACE)
+        self.assertGreater(report.reused_chunks, 0)
+        self.assertEqual(report.reused_chunks + report.embedded_chunks, len(self._texts(document)))
+        self._assert_embeds(document, configured_embedding_recipe())
+
     def test_a_deleted_row_is_evicted_without_stopping_the_batch(self):
         sync_document_batch(self.ids)
         missing = self.ids[0]
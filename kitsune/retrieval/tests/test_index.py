@@ -230,6 +230,7 @@ class ManifestSerializationTests(SimpleTestCase):
             "content_vector",
             "scope",
             "scope_clause_count",
+            "chunk_fingerprint",
             "visibility",
             "access_group_ids",
             "applies_to",
@@ -330,6 +331,7 @@ class ChunkDocumentMappingTests(ChunkIndexTestCase):
             "access_group_ids",
             "content_hash",
             "index_state_hash",
+            "chunk_fingerprint",
         ):
             self.assertEqual(props[keyword_field]["type"], "keyword")
         for integer_field in (
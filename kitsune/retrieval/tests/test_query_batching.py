@@ -0,0 +1,76 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from kitsune.retrieval.embeddings import EmbeddingUnavailable, get_embeddings
+from kitsune.retrieval.query_batching import QueryEmbeddingBatcher
+from kitsune.retrieval.tests.test_query_vectors import RECIPE
+
+
+def _embed_concurrently(batcher, queries):
+    results = {}
+    start = threading.Barrier(len(queries))
+
+    def run(index, query):
+        start.wait()
+        try:
+            results[index] = batcher.embed(query, RECIPE)
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [
+        threading.Thread(target=run, args=(index, query)) for index, query in enumerate(queries)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[index] for index in range(len(queries))]
+
+
+class QueryEmbeddingBatcherTests(SimpleTestCase):
+    @override_settings(RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS=0.2)
+    def test_concurrent_misses_share_one_deduplicated_request(self):
+        queries = ["firefox", "sync", "firefox", "firefox", "sync"]
+        with mock.patch(
+            "kitsune.retrieval.query_batching.get_embeddings", wraps=get_embeddings
+        ) as embed:
+            vectors = _embed_concurrently(QueryEmbeddingBatcher(), queries)
+
+        embed.assert_called_once()
+        self.assertEqual(sorted(embed.call_args.args[0]), ["firefox", "sync"])
+        firefox, sync = get_embeddings(["firefox", "sync"], task="query", recipe=RECIPE)
+        self.assertEqual(vectors, [firefox, sync, firefox, firefox, sync])
+
+    @override_settings(RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS=0)
+    def test_sequential_misses_are_embedded_separately(self):
+        batcher = QueryEmbeddingBatcher()
+        with mock.patch(
+            "kitsune.retrieval.query_batching.get_embeddings", wraps=get_embeddings
+        ) as embed:
+            batcher.embed("firefox", RECIPE)
+            batcher.embed("firefox", RECIPE)
+
+        self.assertEqual(embed.call_count, 2)
+
+    @override_settings(RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS=0.2)
+    def test_failure_reaches_every_waiting_caller(self):
+        with mock.patch(
+            "kitsune.retrieval.query_batching.get_embeddings",
+            side_effect=EmbeddingUnavailable("offline"),
+        ):
+            results = _embed_concurrently(QueryEmbeddingBatcher(), ["firefox", "sync", "sync"])
+
+        for result in results:
+            self.assertIsInstance(result, EmbeddingUnavailable)
+
+    @override_settings(RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS=0.2)
+    def test_missing_vectors_fail_every_waiting_caller(self):
+        with mock.patch(
+            "kitsune.retrieval.query_batching.get_embeddings", return_value=[[0.1, 0.2]]
+        ):
+            results = _embed_concurrently(QueryEmbeddingBatcher(), ["firefox", "sync", "sync"])
+
+        for result in results:
+            self.assertIsInstance(result, ValueError)
@@ -7,8 +7,10 @@ from django.test import SimpleTestCase, override_settings
 from kitsune.retrieval.checks import query_configuration_problems
 from kitsune.retrieval.embeddings import FAKE_BACKEND, EmbeddingRecipe
 from kitsune.retrieval.query_vectors import (
+    clear_local_query_vector_cache,
     embed_and_cache_query_vector,
     get_cached_query_vector,
+    normalize_query,
 )
 
 RECIPE = EmbeddingRecipe(
@@ -21,19 +23,43 @@ RECIPE = EmbeddingRecipe(
 )
 
 
+class NormalizeQueryTests(SimpleTestCase):
+    def test_case_whitespace_and_punctuation_are_folded(self):
+        for query in ("Firefox crashes", "  firefox\tCRASHES?", '"Firefox" crashes!!'):
+            with self.subTest(query=query):
+                self.assertEqual(normalize_query(query), "firefox crashes")
+        self.assertEqual(normalize_query("don't sync"), "don't sync")
+        self.assertEqual(normalize_query("?!"), "?!")
+
+    def test_compatibility_characters_are_folded(self):
+        self.assertEqual(normalize_query("ｆｉｒｅｆｏｘ"), "firefox")
+        self.assertEqual(normalize_query("Straße"), "strasse")
+
+    def test_dotted_i_follows_the_locale(self):
+        self.assertEqual(normalize_query("İSTANBUL IŞIK", "tr"), "istanbul ışık")
+        self.assertEqual(normalize_query("INDIR", "az"), "ındır")
+        self.assertEqual(normalize_query("INDIR", "en-US"), "indir")
+
+
 class QueryVectorCacheTests(SimpleTestCase):
     def setUp(self):
         cache.clear()
+        clear_local_query_vector_cache()
 
     def tearDown(self):
         cache.clear()
+        clear_local_query_vector_cache()
 
-    def test_cache_is_scoped_to_the_exact_query_and_query_recipe(self):
+    def test_cache_is_scoped_to_the_normalized_query_and_query_recipe(self):
         vector, cached = embed_and_cache_query_vector("Firefox crashes", RECIPE)
+        clear_local_query_vector_cache()
 
         self.assertEqual(cached, "stored")
         self.assertEqual(get_cached_query_vector("Firefox crashes", RECIPE), (vector, "hit"))
-        self.assertEqual(get_cached_query_vector("Firefox crashes ", RECIPE), (None, "miss"))
+        self.assertEqual(
+            get_cached_query_vector("firefox  crashes?", RECIPE), (vector, "local_hit")
+        )
+        self.assertEqual(get_cached_query_vector("Firefox crashed", RECIPE), (None, "miss"))
         self.assertEqual(
             get_cached_query_vector(
                 "Firefox crashes", replace(RECIPE, query_task="OTHER_QUERY_TASK")
@@ -46,7 +72,7 @@ class QueryVectorCacheTests(SimpleTestCase):
         query = "private-looking but public query"
         vector = [0.0] * RECIPE.dimensions
         with (
-            mock.patch("kitsune.retrieval.query_vectors.get_embeddings", return_value=[vector]),
+            mock.patch("kitsune.retrieval.query_batching.get_embeddings", return_value=[vector]),
             mock.patch("kitsune.retrieval.query_vectors.cache.set") as cache_set,
         ):
             self.assertEqual(embed_and_cache_query_vector(query, RECIPE), (vector, "stored"))
@@ -56,6 +82,28 @@ class QueryVectorCacheTests(SimpleTestCase):
         self.assertEqual(cached, vector)
         self.assertEqual(cache_set.call_args.kwargs["timeout"], 3600)
 
+    def test_local_tier_serves_repeats_without_the_shared_cache(self):
+        vector, _ = embed_and_cache_query_vector("Firefox crashes", RECIPE)
+        with mock.patch("kitsune.retrieval.query_vectors.cache.get") as cache_get:
+            self.assertEqual(
+                get_cached_query_vector("firefox crashes", RECIPE), (vector, "local_hit")
+            )
+        cache_get.assert_not_called()
+
+    @override_settings(RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE=1)
+    def test_local_tier_is_bounded(self):
+        first, _ = embed_and_cache_query_vector("first", RECIPE)
+        embed_and_cache_query_vector("second", RECIPE)
+
+        self.assertEqual(get_cached_query_vector("second", RECIPE)[1], "local_hit")
+        self.assertEqual(get_cached_query_vector("first", RECIPE), (first, "hit"))
+        self.assertEqual(get_cached_query_vector("second", RECIPE)[1], "hit")
+
+    @override_settings(RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE=0)
+    def test_local_tier_can_be_disabled(self):
+        vector, _ = embed_and_cache_query_vector("Firefox crashes", RECIPE)
+        self.assertEqual(get_cached_query_vector("Firefox crashes", RECIPE), (vector, "hit"))
+
     def test_invalid_or_unavailable_cache_is_a_miss(self):
         with (
             mock.patch("kitsune.retrieval.query_vectors.cache.get", return_value=[0.0]),
@@ -72,7 +120,7 @@ class QueryVectorCacheTests(SimpleTestCase):
     def test_cache_write_failure_still_returns_the_new_vector(self):
         vector = [0.0] * RECIPE.dimensions
         with (
-            mock.patch("kitsune.retrieval.query_vectors.get_embeddings", return_value=[vector]),
+            mock.patch("kitsune.retrieval.query_batching.get_embeddings", return_value=[vector]),
             mock.patch(
                 "kitsune.retrieval.query_vectors.cache.set", side_effect=RuntimeError("offline")
             ),
@@ -88,6 +136,7 @@ class QueryConfigurationTests(SimpleTestCase):
         for setting, value in (
             ("RETRIEVAL_QUERY_EMBEDDING_TIMEOUT_SECONDS", 0),
             ("RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS", 0),
+            ("RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE", -1),
         ):
             with self.subTest(setting=setting), override_settings(**{setting: value}):
                 self.assertTrue(query_configuration_problems())
@@ -287,6 +287,35 @@ class SyncExecutorTests(ChunkIndexTestCase):
         self.assertEqual(report.outcome, SyncOutcome.EMBED_REPLACE)
         self.assertEqual(report.embedding_calls, 1)
 
+    def test_an_edit_embeds_only_the_changed_chunks(self):
+        sections = "== Install ==\nDownload the installer.\n\n== Update ==\n{}\n"
+        ApprovedRevisionFactory(document=self.document, content=sections.format("Open About."))
+        self.document.refresh_from_db()
+        first = self._sync()
+        self.assertEqual(first.reused_chunks, 0)
+
+        ApprovedRevisionFactory(
+            document=self.document, content=sections.format("Open the menu, then About.")
+        )
+        self.document.refresh_from_db()
+        texts = [item.text for item in chunk("kb", self.document.html, title=self.document.title)]
+        with mock.patch(
+            "kitsune.retrieval.sync.get_embeddings", side_effect=get_embeddings
+        ) as embed:
+            report = self._sync()
+
+        self.assertEqual(report.outcome, SyncOutcome.EMBED_REPLACE)
+        self.assertEqual(report.embedding_calls, 1)
+        embedded = embed.call_args.args[0]
+        self.assertLess(len(embedded), len(texts))
+        self.assertEqual(report.embedded_chunks, len(embedded))
+        self.assertEqual(report.reused_chunks, len(texts) - len(embedded))
+        # Every stored vector is still the embedding of its own chunk's text.
+        expected = get_embeddings(texts, task="document", recipe=configured_embedding_recipe())
+        for stored, want in zip(self._stored_state().chunks, expected, strict=True):
+            for value, wanted in zip(stored["content_vector"], want, strict=True):
+                self.assertAlmostEqual(value, wanted, places=5)
+
     def test_a_missing_manifest_is_replaced(self):
         self._sync()
         es_client().delete(index=self.index, id=manifest_id(self.identity), refresh=True)
@@ -177,6 +177,28 @@ class SumoDocument(DSLDocument):
 
         return obj
 
+    @classmethod
+    def prepare_many(cls, queryset):
+        """Prepare a document for each object in `queryset`.
+
+        The queryset is evaluated once, and `preload` is given all the objects together so
+        related rows can be fetched for the whole batch in a constant number of queries,
+        rather than by each `prepare_*` method once per object.
+        """
+        instances = list(queryset)
+        if instances:
+            cls.preload(instances)
+        return [cls.prepare(instance) for instance in instances]
+
+    @classmethod
+    def preload(cls, instances):
+        """
+        Attach related data to a batch of model instances before they're prepared.
+        Child classes should store what they fetch in `es_` prefixed attributes, which their
+        `prepare_*` methods use when present.
+        """
+        pass
+
     def to_action(self, action=None, is_bulk=False, **kwargs):
         """Method to construct the data for save, delete, update operations.
 
@@ -241,6 +263,15 @@ class SumoDocument(DSLDocument):
         """
         return cls.get_model()._default_manager
 
+    @classmethod
+    def get_live_queryset(cls):
+        """
+        Return the queryset used to re-index objects which have just changed.
+        Unlike `get_queryset` this must not exclude objects which are no longer suitable for
+        indexing, so that their `prepare` can mark them to be removed from the index.
+        """
+        return cls.get_queryset()
+
     def get_field_value(self, field, instance, prepare_method):
         """Allow child classes to define their own logic for getting field values."""
         if prepare_method is not None:
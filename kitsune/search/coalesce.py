@@ -0,0 +1,143 @@
+"""Coalesce the index updates requested by the search signal receivers.
+
+A busy question can be saved, voted on and re-tagged dozens of times a minute, and each of
+those saves used to queue its own Celery task to re-index the same documents. When
+`settings.ES_INDEX_COALESCE_WINDOW` is set, receivers add (doc type, id) pairs to a Redis
+sorted set instead, scored by the time the pair was first requested. Requests for a pair
+which is already pending are collapsed into it, and `drain_index_queue` periodically sends
+every pair which has been pending for at least the window through `index_objects_bulk`.
+
+Pairs are removed from the set before their objects are read from the database, so an update
+which lands while a pair is being drained is either included in that indexing, or requests the
+pair again.
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+from celery import shared_task
+from django.conf import settings
+from redis import ConnectionError, TimeoutError
+
+from kitsune.search.es_utils import index_object, index_objects_bulk
+from kitsune.sumo.redis_utils import RedisError, redis_client
+
+log = logging.getLogger("k.search.es")
+
+PENDING_KEY = "search:coalesce:pending"
+STATS_KEY = "search:coalesce:stats"
+
+
+# The Redis client, created on demand and kept for the life of the process.
+_client = None
+
+
+def _redis():
+    """Return the Redis client, or None if Redis isn't available, in which case the next
+    call tries again."""
+    global _client
+    if _client is None:
+        try:
+            _client = redis_client("default")
+        except RedisError as err:
+            log.warning(f"Not coalescing index updates: {err}")
+    return _client
+
+
+def _forget_redis():
+    """Drop the Redis client after it failed, so the next call creates a new one."""
+    global _client
+    _client = None
+
+
+def enqueue_index(doc_type_name, obj_ids):
+    """Request that the objects with the given ids are (re-)indexed as `doc_type_name`.
+
+    Without a coalescing window, or if Redis is unavailable, the indexing task is queued
+    straight away.
+    """
+    obj_ids = list(obj_ids)
+    if not obj_ids:
+        return
+
+    redis = _redis() if settings.ES_INDEX_COALESCE_WINDOW > 0 else None
+    if redis is not None:
+        now = time.time()
+        try:
+            with redis.pipeline() as pipe:
+                # nx keeps the time the pair was first requested, which is what lag is
+                # measured from
+                pipe.zadd(
+                    PENDING_KEY, {f"{doc_type_name}:{obj_id}": now for obj_id in obj_ids}, nx=True
+                )
+                pipe.hincrby(STATS_KEY, "requested", len(obj_ids))
+                pipe.execute()
+            return
+        except (ConnectionError, TimeoutError) as err:
+            log.warning(f"Not coalescing index updates: {err}")
+            _forget_redis()
+
+    if len(obj_ids) == 1:
+        index_object.delay(doc_type_name, obj_ids[0])
+    else:
+        index_objects_bulk.delay(doc_type_name, obj_ids)
+
+
+def coalesce_stats(redis=None):
+    """Return the number of updates requested and dispatched, and the coalescing ratio."""
+    redis = redis or _redis()
+    stats = redis.hgetall(STATS_KEY) if redis else {}
+    requested = int(stats.get("requested", 0))
+    dispatched = int(stats.get("dispatched", 0))
+    return {
+        "requested": requested,
+        "dispatched": dispatched,
+        "pending": redis.zcard(PENDING_KEY) if redis else 0,
+        "ratio": requested / dispatched if dispatched else None,
+    }
+
+
+@shared_task
+def drain_index_queue():
+    """Send every update which has been pending for at least the coalescing window to ES."""
+    redis = _redis()
+    if redis is None:
+        return
+
+    now = time.time()
+    cutoff = now - settings.ES_INDEX_COALESCE_WINDOW
+    chunk_size = settings.ES_DEFAULT_SQL_CHUNK_SIZE
+    dispatched = 0
+    max_lag = 0.0
+
+    while True:
+        pending = redis.zrangebyscore(
+            PENDING_KEY, "-inf", cutoff, start=0, num=chunk_size, withscores=True
+        )
+        if not pending:
+            break
+        redis.zrem(PENDING_KEY, *(member for member, _ in pending))
+
+        ids_by_doc_type = defaultdict(list)
+        enqueued_at = {}
+        for member, score in pending:
+            doc_type_name, obj_id = member.rsplit(":", 1)
+            ids_by_doc_type[doc_type_name].append(int(obj_id))
+            enqueued_at[doc_type_name] = min(score, enqueued_at.get(doc_type_name, score))
+            max_lag = max(max_lag, now - score)
+
+        for doc_type_name, obj_ids in ids_by_doc_type.items():
+            index_objects_bulk.delay(
+                doc_type_name, obj_ids, live=True, enqueued_at=enqueued_at[doc_type_name]
+            )
+        dispatched += len(pending)
+
+    if dispatched:
+        redis.hincrby(STATS_KEY, "dispatched", dispatched)
+        stats = coalesce_stats(redis)
+        log.info(
+            f"Dispatched {dispatched} coalesced index updates, oldest pending for "
+            f"{max_lag:.1f}s; {stats['requested']} requested and {stats['dispatched']} "
+            f"dispatched overall (ratio {stats['ratio']:.2f})"
+        )
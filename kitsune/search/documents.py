@@ -1,3 +1,4 @@
+from django.contrib.auth.models import User
 from django.db.models import Count, Prefetch, Q
 from elasticsearch.dsl import InnerDoc, connections, field, normalizer
 
@@ -51,6 +52,19 @@ class WikiDocument(SumoDocument):
 
         return super().prepare(instance, parent_id=instance.parent_id)
 
+    @classmethod
+    def preload(cls, instances):
+        """Decide which documents are restricted with one query for the whole batch."""
+        # translations follow the restrictions of their parent
+        restricted = set(
+            wiki_models.Document.restrict_to_groups.through.objects.filter(
+                document_id__in={instance.parent_id or instance.id for instance in instances}
+            ).values_list("document_id", flat=True)
+        )
+        for instance in instances:
+            # fill the `is_restricted` cached property
+            instance.is_restricted = (instance.parent_id or instance.id) in restricted
+
     def prepare_updated(self, instance):
         return getattr(instance.current_revision, "created", None)
 
@@ -93,6 +107,13 @@ class WikiDocument(SumoDocument):
             .prefetch_related("topics", "products")
         )
 
+    @classmethod
+    def get_live_queryset(cls):
+        # include documents that have become restricted, so they're unindexed
+        return wiki_models.Document.objects.select_related("current_revision").prefetch_related(
+            "topics", "products"
+        )
+
 
 class QuestionDocument(SumoDocument):
     """
@@ -381,6 +402,34 @@ class ProfileDocument(SumoDocument):
     def prepare_product_ids(self, instance):
         return [product.id for product in instance.products.all()]
 
+    @classmethod
+    def preload(cls, instances):
+        """Fetch the searchable group ids of every profile in the batch with two queries."""
+        from kitsune.groups.models import GroupProfile
+
+        group_ids_by_user = {}
+        for user_id, group_id in User.groups.through.objects.filter(
+            user_id__in=[instance.user_id for instance in instances]
+        ).values_list("user_id", "group_id"):
+            group_ids_by_user.setdefault(user_id, []).append(group_id)
+
+        with_profiles = set()
+        visible = set()
+        for group_id, visibility in GroupProfile.objects.filter(
+            group_id__in={g for group_ids in group_ids_by_user.values() for g in group_ids}
+        ).values_list("group_id", "visibility"):
+            with_profiles.add(group_id)
+            if visibility != GroupProfile.Visibility.PRIVATE:
+                visible.add(group_id)
+
+        for instance in instances:
+            # groups without GroupProfiles are legacy groups, include them by default
+            instance.es_group_ids = [
+                group_id
+                for group_id in group_ids_by_user.get(instance.user_id, [])
+                if group_id in visible or group_id not in with_profiles
+            ]
+
     def prepare_group_ids(self, instance):
         """
         Index only public and moderated groups for search.
@@ -388,6 +437,9 @@ class ProfileDocument(SumoDocument):
         """
         from kitsune.groups.models import GroupProfile
 
+        if hasattr(instance, "es_group_ids"):
+            return instance.es_group_ids
+
         # Get visible groups with GroupProfiles (public + moderated)
         visible_group_profiles = GroupProfile.objects.filter(group__user=instance.user).exclude(
             visibility=GroupProfile.Visibility.PRIVATE
@@ -1,5 +1,8 @@
 import importlib
 import inspect
+import logging
+import time
+from dataclasses import dataclass, field
 
 from celery import shared_task
 from django.conf import settings
@@ -10,6 +13,8 @@ from elasticsearch.helpers.errors import BulkIndexError
 
 from kitsune.search import config
 
+log = logging.getLogger("k.search.es")
+
 
 def _insert_custom_filters(analyzer_name, filter_list, char=False):
     """
@@ -156,20 +161,41 @@ def index_object(doc_type_name, obj_id):
         doc_type.prepare(obj).to_action("index")
 
 
-@shared_task
-def index_objects_bulk(
-    doc_type_name,
+@dataclass
+class BulkIndexResult:
+    """The outcome of sending one chunk of objects to ES."""
+
+    indexed: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rejected(self):
+        """Number of documents ES refused because its write queue was full."""
+        return sum(
+            1 for error in self.errors if next(iter(error.values()), {}).get("status") == 429
+        )
+
+
+def bulk_index_objects(
+    doc_type,
     obj_ids,
     timeout=settings.ES_BULK_DEFAULT_TIMEOUT,
     elastic_chunk_size=settings.ES_DEFAULT_ELASTIC_CHUNK_SIZE,
+    live=False,
 ):
-    """Bulk index ORM objects given a list of object ids and a document type name."""
+    """Prepare the objects with the given ids and send them to ES in bulk.
 
-    doc_type = next(cls for cls in get_doc_types() if cls.__name__ == doc_type_name)
+    Unlike `index_objects_bulk` this doesn't raise on failed documents, it returns them in
+    a `BulkIndexResult` along with how long the bulk requests took.
+
+    live: the objects have changed since they were indexed, so select them with the doc
+    type's `get_live_queryset`, which includes objects that should now be unindexed.
+    """
 
-    db_objects = doc_type.get_queryset().filter(pk__in=obj_ids)
+    queryset = doc_type.get_live_queryset() if live else doc_type.get_queryset()
     # prepare the docs for indexing
-    docs = [doc_type.prepare(obj) for obj in db_objects]
+    docs = doc_type.prepare_many(queryset.filter(pk__in=obj_ids))
 
     # set the appropriate action per document type
     action = "index"
@@ -179,10 +205,11 @@ def index_objects_bulk(
         action = "update"
         kwargs.update({"doc_as_upsert": True})
 
+    start = time.monotonic()
     # if the request doesn't resolve within `timeout`,
     # sleep for `timeout` then try again up to `settings.ES_BULK_MAX_RETRIES` times,
     # before raising an exception:
-    _, errors = es_bulk(
+    indexed, errors = es_bulk(
         es_client(
             request_timeout=timeout,
             retry_on_timeout=True,
@@ -198,8 +225,36 @@ def index_objects_bulk(
         for error in errors
         if not (error.get("delete") and error["delete"]["status"] in [400, 404])
     ]
-    if errors:
-        raise BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
+    return BulkIndexResult(indexed=indexed, seconds=time.monotonic() - start, errors=errors)
+
+
+@shared_task
+def index_objects_bulk(
+    doc_type_name,
+    obj_ids,
+    timeout=settings.ES_BULK_DEFAULT_TIMEOUT,
+    elastic_chunk_size=settings.ES_DEFAULT_ELASTIC_CHUNK_SIZE,
+    live=False,
+    enqueued_at=None,
+):
+    """Bulk index ORM objects given a list of object ids and a document type name.
+
+    enqueued_at: timestamp at which the oldest of these updates was requested, used to log
+    the end-to-end indexing lag of coalesced updates.
+    """
+
+    doc_type = next(cls for cls in get_doc_types() if cls.__name__ == doc_type_name)
+
+    result = bulk_index_objects(
+        doc_type, obj_ids, timeout=timeout, elastic_chunk_size=elastic_chunk_size, live=live
+    )
+    if enqueued_at is not None:
+        log.info(
+            f"Indexed {result.indexed} {doc_type_name}(s) "
+            f"{time.time() - enqueued_at:.1f}s after the oldest update was requested"
+        )
+    if result.errors:
+        raise BulkIndexError(f"{len(result.errors)} document(s) failed to index.", result.errors)
 
 
 @shared_task
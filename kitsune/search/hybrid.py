@@ -117,7 +117,7 @@ def run_hybrid_search(
                 emit("retrieval.query.degraded", level=logging.WARNING, reason=fallback_reason)
             else:
                 phase = "cache"
-                query_vector, cache_lookup = get_cached_query_vector(query, recipe)
+                query_vector, cache_lookup = get_cached_query_vector(query, recipe, locale=locale)
                 if query_vector is None:
                     phase = "rate_limit"
                     rate = settings.RETRIEVAL_QUERY_EMBEDDING_RATE
@@ -144,7 +144,9 @@ def run_hybrid_search(
                         phase = "embedding"
                         embedding_started = perf_counter()
                         try:
-                            query_vector, cache_write = embed_and_cache_query_vector(query, recipe)
+                            query_vector, cache_write = embed_and_cache_query_vector(
+                                query, recipe, locale=locale
+                            )
                         except EmbeddingUnavailable:
                             fallback_reason = "embedding_unavailable"
                         finally:
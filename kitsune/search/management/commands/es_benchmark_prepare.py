@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kitsune.search.es_utils import get_doc_types
+from kitsune.search.reindex import iter_pk_chunks
+
+
+class Command(BaseCommand):
+    help = "Compare SQL queries and docs/sec of preparing ES documents one by one and in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=str,
+            dest="limit",
+            nargs="*",
+            default="",
+            help="Limit to specific doc types",
+        )
+        parser.add_argument(
+            "--sql-chunk-size",
+            type=int,
+            default=settings.ES_DEFAULT_SQL_CHUNK_SIZE,
+            help="Prepare this number of documents in each chunk",
+        )
+        parser.add_argument(
+            "--chunks",
+            type=int,
+            default=3,
+            help="Measure this number of chunks per doc type",
+        )
+
+    def handle(self, *args, **kwargs):
+        doc_types = get_doc_types()
+
+        limit = kwargs["limit"]
+        if limit:
+            doc_types = [dt for dt in doc_types if dt.__name__ in limit]
+
+        chunk_size = kwargs["sql_chunk_size"]
+        for dt in doc_types:
+            self.stdout.write(f"Benchmarking: {dt.__name__}")
+            chunks = iter_pk_chunks(
+                dt.get_model()._default_manager.all(),
+                chunk_size,
+                limit=chunk_size * kwargs["chunks"],
+            )
+            for ids in chunks:
+                queryset = dt.get_queryset().filter(pk__in=ids)
+                one_by_one = self._measure(
+                    lambda qs=queryset: [dt.prepare(obj) for obj in qs.all()]
+                )
+                batched = self._measure(lambda qs=queryset: dt.prepare_many(qs.all()))
+                self.stdout.write(
+                    f"{len(ids)} ids: one by one {one_by_one}; prepare_many {batched}"
+                )
+
+    def _measure(self, prepare):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.monotonic()
+            docs = prepare()
+            elapsed = time.monotonic() - start
+        rate = len(docs) / elapsed if elapsed else 0.0
+        return f"{len(queries)} queries, {rate:.1f} docs/s"
@@ -1,11 +1,14 @@
-from math import ceil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from dateutil.parser import parse as dateutil_parse
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import connection, reset_queries
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, reset_queries
 
-from kitsune.search.es_utils import get_doc_types, index_objects_bulk
+from kitsune.search.es_utils import bulk_index_objects, get_doc_types, index_objects_bulk
+from kitsune.search.reindex import ReindexCursor, ReindexStats, iter_pk_chunks
+from kitsune.sumo.redis_utils import RedisError
 
 
 class Command(BaseCommand):
@@ -67,6 +70,20 @@ class Command(BaseCommand):
             action="store_true",
             help="Print the number of SQL statements executed",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help=(
+                "Prepare and send chunks to ElasticSearch from this many threads in this "
+                "process, reporting throughput as it goes, instead of queueing Celery jobs"
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue each doc type from the last chunk a previous run completed",
+        )
 
     def handle(self, *args, **kwargs):
         doc_types = get_doc_types()
@@ -75,6 +92,17 @@ class Command(BaseCommand):
         if limit:
             doc_types = [dt for dt in doc_types if dt.__name__ in limit]
 
+        if kwargs["workers"] < 0:
+            raise CommandError("--workers must not be negative.")
+
+        try:
+            cursor = ReindexCursor()
+        except RedisError as err:
+            if kwargs["resume"]:
+                raise CommandError(f"Can't resume without a cursor store: {err}")
+            self.stdout.write(self.style.WARNING(f"{err}, progress won't be checkpointed."))
+            cursor = None
+
         for dt in doc_types:
             self.stdout.write(f"Reindexing: {dt.__name__}")
 
@@ -102,35 +130,106 @@ class Command(BaseCommand):
             percentage = kwargs["percentage"]
             if count:
                 count = min(count, total)
-                qs = qs[:count]
                 self.stdout.write(f"Indexing {count} documents out of {total}")
             else:
                 if percentage < 100:
                     count = int(total * percentage / 100)
-                    qs = qs[:count]
                 else:
                     count = total
                 self.stdout.write(f"Indexing {percentage}%, so {count} documents out of {total}")
 
-            id_list = list(qs.values_list("pk", flat=True))
-            sql_chunk_size = kwargs["sql_chunk_size"]
-
-            # slice the list of ids into chunks of `sql_chunk_size` and send a task to celery
-            # to process each chunk. we do this so as to not OOM on celery when processing
-            # tens of thousands of documents
-            for x in range(ceil(count / sql_chunk_size)):
-                start = x * sql_chunk_size
-                end = start + sql_chunk_size
-                index_objects_bulk.delay(
-                    dt.__name__,
-                    id_list[start:end],
+            last_pk = None
+            if kwargs["resume"]:
+                last_pk = cursor.get(dt.__name__)
+                if last_pk is not None:
+                    done = qs.filter(pk__lte=last_pk).count()
+                    count = max(count - done, 0)
+                    self.stdout.write(f"Resuming after id {last_pk}, {count} documents left")
+            elif cursor:
+                cursor.clear(dt.__name__)
+
+            # walk the table in chunks of `sql_chunk_size` ids, keyed on the last id of the
+            # previous chunk. we do this so as to not OOM when processing tens of thousands of
+            # documents, and so that late chunks cost as much to fetch as early ones
+            chunks = iter_pk_chunks(qs, kwargs["sql_chunk_size"], after=last_pk, limit=count)
+
+            if kwargs["workers"]:
+                self._index_in_process(dt, chunks, count, cursor, kwargs)
+            else:
+                self._enqueue(dt, chunks, count, cursor, kwargs)
+
+    def _enqueue(self, dt, chunks, count, cursor, kwargs):
+        """Send a celery task to index each chunk of ids."""
+        done = 0
+        for ids in chunks:
+            index_objects_bulk.delay(
+                dt.__name__,
+                ids,
+                timeout=kwargs["timeout"],
+                # elastic_chunk_size determines how many documents get sent to elastic
+                # in each bulk request, the limiting factor here is the performance of
+                # our elastic cluster
+                elastic_chunk_size=kwargs["elastic_chunk_size"],
+            )
+            if cursor:
+                cursor.set(dt.__name__, ids[-1])
+            if kwargs["print_sql_count"]:
+                self.stdout.write(f"{len(connection.queries)} SQL queries executed")
+                reset_queries()
+            done += len(ids)
+            self.stdout.write(f"Indexed {done} out of {count}")
+
+    def _index_in_process(self, dt, chunks, count, cursor, kwargs):
+        """Index each chunk of ids from a pool of threads, reporting throughput as we go.
+
+        The cursor only moves past a chunk once it and every chunk before it have been sent,
+        so resuming never skips a chunk that was still in flight when the run stopped.
+        """
+
+        def index_chunk(ids):
+            try:
+                return bulk_index_objects(
+                    dt,
+                    ids,
                     timeout=kwargs["timeout"],
-                    # elastic_chunk_size determines how many documents get sent to elastic
-                    # in each bulk request, the limiting factor here is the performance of
-                    # our elastic cluster
                     elastic_chunk_size=kwargs["elastic_chunk_size"],
                 )
-                if kwargs["print_sql_count"]:
-                    self.stdout.write(f"{len(connection.queries)} SQL queries executed")
-                    reset_queries()
-                self.stdout.write(f"Indexed {min(end, count)} out of {count}")
+            finally:
+                # each thread opens its own database connection
+                connections.close_all()
+
+        stats = ReindexStats()
+        workers = kwargs["workers"]
+        in_flight = deque()
+
+        def complete_oldest():
+            ids, future = in_flight.popleft()
+            result = future.result()
+            stats.add(result)
+            if result.errors:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"{len(result.errors)} document(s) failed to index, "
+                        f"first error: {result.errors[0]}"
+                    )
+                )
+            elif cursor and not (stats.rejected or stats.failed):
+                # once a chunk has failed, leave the cursor before it
+                cursor.set(dt.__name__, ids[-1])
+            self.stdout.write(f"{dt.__name__}: indexed {stats.docs} out of {count} ({stats})")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for ids in chunks:
+                # keep a bounded number of chunks in flight, so we don't read ids from the
+                # database much faster than elastic can accept documents
+                if len(in_flight) >= workers * 2:
+                    complete_oldest()
+                in_flight.append((ids, executor.submit(index_chunk, ids)))
+            while in_flight:
+                complete_oldest()
+
+        if stats.rejected or stats.failed:
+            raise CommandError(
+                f"{dt.__name__}: {stats.rejected + stats.failed} document(s) failed to index, "
+                "rerun with --resume to continue from the last complete chunk."
+            )
@@ -0,0 +1,87 @@
+import time
+from dataclasses import dataclass, field
+
+from kitsune.sumo.redis_utils import redis_client
+
+CURSOR_KEY = "search:reindex:cursor"
+
+
+def iter_pk_chunks(queryset, chunk_size, after=None, limit=None):
+    """Yield lists of primary keys from `queryset`, in ascending order.
+
+    Each chunk is fetched with a `pk > last seen pk` filter rather than an offset, so fetching
+    the last chunk of a large table costs the same as fetching the first one, and only one
+    chunk of ids is held in memory at a time.
+
+    after: only yield primary keys greater than this one, to resume a previous run.
+    limit: stop after yielding this many primary keys in total.
+    """
+    queryset = queryset.order_by("pk")
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        page = queryset if after is None else queryset.filter(pk__gt=after)
+        pks = list(page.values_list("pk", flat=True)[:size])
+        if not pks:
+            return
+        yield pks
+        after = pks[-1]
+        if remaining is not None:
+            remaining -= len(pks)
+
+
+class ReindexCursor:
+    """The last primary key reindexed for each document type, stored in Redis.
+
+    A crashed or interrupted reindex can be resumed from where it stopped by passing the
+    stored value as the `after` argument of `iter_pk_chunks`.
+    """
+
+    def __init__(self, redis=None):
+        self.redis = redis or redis_client("default")
+
+    def get(self, doc_type_name):
+        value = self.redis.hget(CURSOR_KEY, doc_type_name)
+        return int(value) if value is not None else None
+
+    def set(self, doc_type_name, pk):
+        self.redis.hset(CURSOR_KEY, doc_type_name, pk)
+
+    def clear(self, doc_type_name):
+        self.redis.hdel(CURSOR_KEY, doc_type_name)
+
+
+@dataclass
+class ReindexStats:
+    """Running totals used to report the progress of reindexing a document type."""
+
+    docs: int = 0
+    chunks: int = 0
+    bulk_seconds: float = 0.0
+    rejected: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def add(self, result):
+        """Add the `BulkIndexResult` of one chunk to the totals."""
+        self.docs += result.indexed
+        self.chunks += 1
+        self.bulk_seconds += result.seconds
+        self.rejected += result.rejected
+        self.failed += len(result.errors) - result.rejected
+
+    @property
+    def docs_per_second(self):
+        elapsed = time.monotonic() - self.started
+        return self.docs / elapsed if elapsed else 0.0
+
+    @property
+    def mean_bulk_latency(self):
+        return self.bulk_seconds / self.chunks if self.chunks else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.docs_per_second:.1f} docs/s, "
+            f"{self.mean_bulk_latency * 1000:.0f}ms mean bulk latency per chunk, "
+            f"{self.rejected} rejected, {self.failed} failed"
+        )
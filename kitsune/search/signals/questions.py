@@ -1,13 +1,9 @@
 from django.db.models.signals import m2m_changed, post_delete, post_save
 
 from kitsune.questions.models import Answer, AnswerVote, Question, QuestionVote
+from kitsune.search.coalesce import enqueue_index
 from kitsune.search.decorators import search_receiver
-from kitsune.search.es_utils import (
-    delete_object,
-    index_object,
-    index_objects_bulk,
-    remove_from_field,
-)
+from kitsune.search.es_utils import delete_object, remove_from_field
 from kitsune.tags.models import SumoTag
 
 
@@ -16,8 +12,8 @@ from kitsune.tags.models import SumoTag
 def handle_question_save(instance, **kwargs):
     if not isinstance(instance, Question):
         return
-    index_object.delay("QuestionDocument", instance.pk)
-    index_objects_bulk.delay("AnswerDocument", list(instance.answers.values_list("pk", flat=True)))
+    enqueue_index("QuestionDocument", [instance.pk])
+    enqueue_index("AnswerDocument", instance.answers.values_list("pk", flat=True))
 
 
 @search_receiver(post_delete, Question)
@@ -28,7 +24,7 @@ def handle_question_delete(instance, **kwargs):
 @search_receiver(post_delete, Answer)
 def handle_answer_delete(instance, **kwargs):
     delete_object.delay("AnswerDocument", instance.pk)
-    index_object.delay("QuestionDocument", instance.question_id)
+    enqueue_index("QuestionDocument", [instance.question_id])
 
 
 @search_receiver(post_delete, SumoTag)
@@ -42,22 +38,20 @@ def handle_tag_save(instance, created=False, **kwargs):
         return
     question_ids = list(Question.objects.filter(tags=instance).values_list("pk", flat=True))
     if question_ids:
-        index_objects_bulk.delay("QuestionDocument", question_ids)
+        enqueue_index("QuestionDocument", question_ids)
 
 
 @search_receiver(post_delete, QuestionVote)
 def handle_question_vote_delete(instance, **kwargs):
-    index_object.delay("QuestionDocument", instance.question_id)
-    index_objects_bulk.delay(
-        "AnswerDocument", list(instance.question.answers.values_list("pk", flat=True))
-    )
+    enqueue_index("QuestionDocument", [instance.question_id])
+    enqueue_index("AnswerDocument", instance.question.answers.values_list("pk", flat=True))
 
 
 @search_receiver(post_save, AnswerVote)
 def handle_answer_vote_save(instance, **kwargs):
-    index_object.delay("AnswerDocument", instance.answer_id)
+    enqueue_index("AnswerDocument", [instance.answer_id])
 
 
 @search_receiver(post_delete, AnswerVote)
 def handle_answer_vote_delete(instance, **kwargs):
-    index_object.delay("AnswerDocument", instance.answer_id)
+    enqueue_index("AnswerDocument", [instance.answer_id])
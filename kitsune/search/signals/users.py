@@ -2,8 +2,9 @@ from django.contrib.auth.models import Group, User
 from django.db.models.signals import m2m_changed, post_delete, post_save
 
 from kitsune.products.models import Product
+from kitsune.search.coalesce import enqueue_index
 from kitsune.search.decorators import search_receiver
-from kitsune.search.es_utils import delete_object, index_object, remove_from_field
+from kitsune.search.es_utils import delete_object, remove_from_field
 from kitsune.users.models import Profile
 
 
@@ -12,7 +13,7 @@ from kitsune.users.models import Profile
 @search_receiver(m2m_changed, User.groups.through)
 @search_receiver(m2m_changed, Profile.products.through)
 def handle_profile_save(instance, **kwargs):
-    index_object.delay("ProfileDocument", instance.pk)
+    enqueue_index("ProfileDocument", [instance.pk])
 
 
 @search_receiver(post_delete, Profile)
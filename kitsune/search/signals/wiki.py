@@ -1,8 +1,9 @@
 from django.db.models.signals import m2m_changed, post_delete, post_save
 
 from kitsune.products.models import Product, Topic
+from kitsune.search.coalesce import enqueue_index
 from kitsune.search.decorators import search_receiver
-from kitsune.search.es_utils import delete_object, index_object, remove_from_field
+from kitsune.search.es_utils import delete_object, remove_from_field
 from kitsune.wiki.models import Document
 
 
@@ -11,7 +12,7 @@ from kitsune.wiki.models import Document
 @search_receiver(m2m_changed, Document.topics.through)
 def handle_document_save(instance, **kwargs):
     if instance.current_revision:
-        index_object.delay("WikiDocument", instance.pk)
+        enqueue_index("WikiDocument", [instance.pk])
 
 
 @search_receiver(post_delete, Document)
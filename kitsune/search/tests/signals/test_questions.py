@@ -109,7 +109,7 @@ class QuestionDocumentSignalsTests(ElasticTestCase):
         creator_ids = self.get_doc().question_answer_creator_ids
         self.assertEqual(creator_ids.count(str(self.answer.creator_id)), 1)
 
-    @patch("kitsune.search.signals.questions.index_object.delay")
+    @patch("kitsune.search.coalesce.index_object.delay")
     def test_kb_tag(self, mock_index_object):
         # the tag m2m relation is shared across all models which use it
         # so will trigger signals on all models which use it, but we don't
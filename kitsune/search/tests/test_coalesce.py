@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+
+from kitsune.search.coalesce import (
+    PENDING_KEY,
+    STATS_KEY,
+    coalesce_stats,
+    drain_index_queue,
+    enqueue_index,
+)
+from kitsune.sumo.redis_utils import redis_client
+from kitsune.sumo.tests import TestCase
+
+
+@override_settings(ES_INDEX_COALESCE_WINDOW=60)
+class CoalesceTests(TestCase):
+    def setUp(self):
+        self.redis = redis_client("default")
+        self.redis.delete(PENDING_KEY, STATS_KEY)
+        self.addCleanup(self.redis.delete, PENDING_KEY, STATS_KEY)
+
+    @override_settings(ES_INDEX_COALESCE_WINDOW=0)
+    @patch("kitsune.search.coalesce.index_objects_bulk.delay")
+    @patch("kitsune.search.coalesce.index_object.delay")
+    def test_no_window_indexes_immediately(self, mock_index_object, mock_index_bulk):
+        enqueue_index("QuestionDocument", [1])
+        enqueue_index("AnswerDocument", [2, 3])
+        mock_index_object.assert_called_once_with("QuestionDocument", 1)
+        mock_index_bulk.assert_called_once_with("AnswerDocument", [2, 3])
+        self.assertEqual(self.redis.zcard(PENDING_KEY), 0)
+
+    @patch("kitsune.search.coalesce.index_object.delay")
+    def test_repeated_updates_are_coalesced(self, mock_index_object):
+        for _ in range(3):
+            enqueue_index("QuestionDocument", [1])
+        enqueue_index("AnswerDocument", [1, 2])
+
+        mock_index_object.assert_not_called()
+        stats = coalesce_stats(self.redis)
+        self.assertEqual(stats["requested"], 5)
+        self.assertEqual(stats["pending"], 3)
+
+    @patch("kitsune.search.coalesce.index_objects_bulk.delay")
+    def test_drain_waits_for_the_window(self, mock_index_bulk):
+        enqueue_index("QuestionDocument", [1])
+        drain_index_queue()
+        mock_index_bulk.assert_not_called()
+
+        # pretend the update was requested two minutes ago
+        self.redis.zincrby(PENDING_KEY, -120, "QuestionDocument:1")
+        drain_index_queue()
+
+        self.assertEqual(len(mock_index_bulk.call_args_list), 1)
+        self.assertEqual(mock_index_bulk.call_args.args, ("QuestionDocument", [1]))
+
+    @patch("kitsune.search.coalesce.index_objects_bulk.delay")
+    def test_drain_groups_by_doc_type(self, mock_index_bulk):
+        for _ in range(2):
+            enqueue_index("QuestionDocument", [1, 2])
+            enqueue_index("AnswerDocument", [3])
+
+        with override_settings(ES_INDEX_COALESCE_WINDOW=0):
+            drain_index_queue()
+
+        calls = {c.args[0]: sorted(c.args[1]) for c in mock_index_bulk.call_args_list}
+        self.assertEqual(calls, {"QuestionDocument": [1, 2], "AnswerDocument": [3]})
+        for c in mock_index_bulk.call_args_list:
+            self.assertTrue(c.kwargs["live"])
+        self.assertEqual(self.redis.zcard(PENDING_KEY), 0)
+
+        stats = coalesce_stats(self.redis)
+        self.assertEqual(stats["requested"], 6)
+        self.assertEqual(stats["dispatched"], 3)
+        self.assertEqual(stats["ratio"], 2)
+
+    @patch("kitsune.search.coalesce._client", None)
+    @patch("kitsune.search.coalesce.redis_client", wraps=redis_client)
+    def test_redis_client_is_reused(self, mock_redis_client):
+        enqueue_index("QuestionDocument", [1])
+        enqueue_index("QuestionDocument", [2])
+        mock_redis_client.assert_called_once_with("default")
+        self.assertEqual(self.redis.zcard(PENDING_KEY), 2)
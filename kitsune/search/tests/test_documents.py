@@ -1,14 +1,25 @@
 from unittest.mock import patch
 
+from kitsune.groups.models import GroupProfile
+from kitsune.groups.tests import GroupProfileFactory
 from kitsune.questions.tests import (
     AnswerFactory,
     AnswerVoteFactory,
     QuestionFactory,
     QuestionVoteFactory,
 )
-from kitsune.search.documents import AnswerDocument, QuestionDocument
+from kitsune.search.documents import (
+    AnswerDocument,
+    ProfileDocument,
+    QuestionDocument,
+    WikiDocument,
+)
 from kitsune.sumo.tests import TestCase
 from kitsune.tags.tests import TagFactory
+from kitsune.users.models import Profile
+from kitsune.users.tests import GroupFactory, UserFactory
+from kitsune.wiki.models import Document
+from kitsune.wiki.tests import ApprovedRevisionFactory, TranslatedRevisionFactory
 
 
 class QuestionDocumentTests(TestCase):
@@ -110,3 +121,46 @@ class AnswerDocumentTests(TestCase):
     def test_get_works_with_prefixed_ids(self, mock_get):
         AnswerDocument.get("a_123")
         mock_get.assert_called_with("a_123")
+
+
+class WikiDocumentTests(TestCase):
+    def test_prepare_many_discards_restricted_documents_and_translations(self):
+        public = ApprovedRevisionFactory().document
+        restricted = ApprovedRevisionFactory(
+            document__restrict_to_groups=[GroupFactory()]
+        ).document
+        translation = TranslatedRevisionFactory(
+            document__parent=restricted, is_approved=True
+        ).document
+
+        queryset = (
+            Document.objects.select_related("current_revision")
+            .prefetch_related("topics", "products")
+            .filter(id__in=[public.id, restricted.id, translation.id])
+        )
+        with self.assertNumQueries(4):
+            docs = WikiDocument.prepare_many(queryset)
+
+        # translations are merged into their parent's ES document
+        self.assertCountEqual(
+            [(doc.meta.id, hasattr(doc, "es_discard_doc")) for doc in docs],
+            [(public.id, False), (restricted.id, True), (restricted.id, True)],
+        )
+
+
+class ProfileDocumentTests(TestCase):
+    def test_prepare_many_group_ids_match_prepare(self):
+        public = GroupProfileFactory(visibility=GroupProfile.Visibility.PUBLIC).group
+        private = GroupProfileFactory(visibility=GroupProfile.Visibility.PRIVATE).group
+        legacy = GroupFactory()
+        users = [UserFactory(groups=[public, private, legacy]) for _ in range(3)]
+
+        queryset = ProfileDocument.get_queryset().filter(user__in=users)
+        with self.assertNumQueries(5):
+            docs = ProfileDocument.prepare_many(queryset)
+
+        self.assertEqual(len(docs), 3)
+        for doc in docs:
+            expected = ProfileDocument.prepare(Profile.objects.get(pk=doc.meta.id)).group_ids
+            self.assertCountEqual(doc.group_ids, expected)
+            self.assertCountEqual(doc.group_ids, [public.id, legacy.id])
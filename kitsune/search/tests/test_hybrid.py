@@ -129,7 +129,7 @@ class HybridOrchestrationTests(SimpleTestCase):
             )
 
         target.assert_called_once_with()
-        cached.assert_called_once_with("firefox", RECIPE)
+        cached.assert_called_once_with("firefox", RECIPE, locale="en-US")
         limited.assert_not_called()
         embed.assert_not_called()
         floor.assert_called_once_with(META)
@@ -228,7 +228,7 @@ class HybridOrchestrationTests(SimpleTestCase):
                 )
 
             if limiter is False:
-                embed.assert_called_once_with("firefox", RECIPE)
+                embed.assert_called_once_with("firefox", RECIPE, locale="en-US")
                 self.assertEqual(limited.call_args.kwargs["group"], "retrieval-query-embedding")
                 self.assertEqual(limited.call_args.kwargs["key"], "user_or_ip")
                 self.assertNotIn("method", limited.call_args.kwargs)
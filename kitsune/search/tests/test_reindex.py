@@ -0,0 +1,56 @@
+from kitsune.questions.models import Question
+from kitsune.questions.tests import QuestionFactory
+from kitsune.search.es_utils import BulkIndexResult
+from kitsune.search.reindex import CURSOR_KEY, ReindexCursor, ReindexStats, iter_pk_chunks
+from kitsune.sumo.redis_utils import redis_client
+from kitsune.sumo.tests import TestCase
+
+
+class IterPkChunksTests(TestCase):
+    def setUp(self):
+        self.ids = sorted(QuestionFactory().id for _ in range(5))
+
+    def test_chunks_cover_every_id_in_order(self):
+        chunks = list(iter_pk_chunks(Question.objects.all(), 2))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        self.assertEqual([pk for chunk in chunks for pk in chunk], self.ids)
+
+    def test_after(self):
+        chunks = list(iter_pk_chunks(Question.objects.all(), 2, after=self.ids[2]))
+        self.assertEqual([pk for chunk in chunks for pk in chunk], self.ids[3:])
+
+    def test_limit(self):
+        chunks = list(iter_pk_chunks(Question.objects.all(), 2, limit=3))
+        self.assertEqual(chunks, [self.ids[:2], self.ids[2:3]])
+
+
+class ReindexCursorTests(TestCase):
+    def setUp(self):
+        self.redis = redis_client("default")
+        self.addCleanup(self.redis.delete, CURSOR_KEY)
+        self.cursor = ReindexCursor(self.redis)
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cursor.get("QuestionDocument"))
+        self.cursor.set("QuestionDocument", 42)
+        self.assertEqual(self.cursor.get("QuestionDocument"), 42)
+        self.assertIsNone(self.cursor.get("WikiDocument"))
+        self.cursor.clear("QuestionDocument")
+        self.assertIsNone(self.cursor.get("QuestionDocument"))
+
+
+class ReindexStatsTests(TestCase):
+    def test_rejections_are_counted_apart_from_failures(self):
+        stats = ReindexStats()
+        stats.add(BulkIndexResult(indexed=10, seconds=0.5))
+        stats.add(
+            BulkIndexResult(
+                indexed=8,
+                seconds=1.5,
+                errors=[{"index": {"status": 429}}, {"update": {"status": 500}}],
+            )
+        )
+        self.assertEqual(stats.docs, 18)
+        self.assertEqual(stats.rejected, 1)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.mean_bulk_latency, 1.0)
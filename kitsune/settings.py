@@ -350,6 +350,9 @@ ES_BULK_MAX_RETRIES = config("ES_BULK_MAX_RETRIES", default=1, cast=int)
 
 ES_DEFAULT_SQL_CHUNK_SIZE = config("ES_DEFAULT_SQL_CHUNK_SIZE", default=1000, cast=int)
 ES_DEFAULT_ELASTIC_CHUNK_SIZE = config("ES_DEFAULT_ELASTIC_CHUNK_SIZE", default=50, cast=int)
+# Collapse repeated index updates of the same document requested within this many seconds
+# into one, sent by the `drain_index_queue` periodic task. 0 indexes on every change.
+ES_INDEX_COALESCE_WINDOW = config("ES_INDEX_COALESCE_WINDOW", default=0, cast=float)
 
 # Retrieval (RAG) embeddings. No default backend: an unset value fails closed
 # (ImproperlyConfigured) so dev/staging/prod can't silently embed with the fake backend.
@@ -368,9 +371,19 @@ RETRIEVAL_EMBEDDING_TIMEOUT_SECONDS = config(
 RETRIEVAL_QUERY_EMBEDDING_TIMEOUT_SECONDS = config(
     "RETRIEVAL_QUERY_EMBEDDING_TIMEOUT_SECONDS", default=2, cast=float
 )
+# Concurrent query cache misses within this window share one provider request. Only
+# requests served by threads of the same process can share one, so it's off by default,
+# since the default gunicorn workers are synchronous.
+RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS = config(
+    "RETRIEVAL_QUERY_EMBEDDING_BATCH_WINDOW_SECONDS", default=0, cast=float
+)
 RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS = config(
     "RETRIEVAL_QUERY_VECTOR_CACHE_TTL_SECONDS", default=60 * 60, cast=int
 )
+# Entries in each process's query vector tier, in front of the shared cache. 0 disables it.
+RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE = config(
+    "RETRIEVAL_QUERY_VECTOR_LOCAL_CACHE_SIZE", default=1000, cast=int
+)
 # Calibrate these initial retrieval bounds in each serving environment before enabling
 # hybrid search.
 RETRIEVAL_SEMANTIC_K = config("RETRIEVAL_SEMANTIC_K", default=100, cast=int)
@@ -538,6 +551,7 @@ TEMPLATES = [
                 "waffle.jinja.WaffleExtension",
                 "jinja2.ext.do",
                 "django_jinja.builtins.extensions.CsrfExtension",
+                "django_jinja.builtins.extensions.CacheExtension",
                 "django_jinja.builtins.extensions.StaticFilesExtension",
                 "django_jinja.builtins.extensions.DjangoFiltersExtension",
                 "jinja2.ext.i18n",
@@ -613,6 +627,7 @@ MIDDLEWARE: tuple[str, ...] = (
     "kitsune.sumo.middleware.InAAQMiddleware",
     "kitsune.users.middleware.LogoutDeactivatedUsersMiddleware",
     "kitsune.users.middleware.LogoutInvalidatedSessionsMiddleware",
+    "kitsune.users.middleware.ProfileMapMiddleware",
     "dockerflow.django.middleware.DockerflowMiddleware",
 )
 
@@ -1051,6 +1066,8 @@ TIDINGS_CONFIRM_ANONYMOUS_WATCHES = config(
 )
 TIDINGS_MODEL_BASE = "kitsune.sumo.models.ModelBase"
 TIDINGS_REVERSE = "kitsune.sumo.urlresolvers.reverse"
+# Watchers of an event are notified in chunks of this many, each by its own task.
+TIDINGS_FANOUT_CHUNK_SIZE = config("TIDINGS_FANOUT_CHUNK_SIZE", default=500, cast=int)
 
 
 # Google Analytics settings.
@@ -1073,6 +1090,7 @@ REDIS_BACKENDS = {
 }
 
 HELPFULVOTES_UNHELPFUL_KEY = "helpfulvotes_topunhelpful"
+HELPFULVOTES_UNHELPFUL_KEYS_KEY = "helpfulvotes_topunhelpful_keys"
 
 LAST_SEARCH_COOKIE = "last_search"
 
@@ -1218,12 +1236,20 @@ DISABLE_HOSTNAME_MIDDLEWARE = config("DISABLE_HOSTNAME_MIDDLEWARE", default=Fals
 DISABLE_FEEDS = config("DISABLE_FEEDS", default=False, cast=bool)
 DISABLE_QUESTIONS_LIST_GLOBAL = config("DISABLE_QUESTIONS_LIST_GLOBAL", default=False, cast=bool)
 DISABLE_QUESTIONS_LIST_ALL = config("DISABLE_QUESTIONS_LIST_ALL", default=False, cast=bool)
+# How long the question list's stats, topics and tag facets are cached, in seconds.
+QUESTION_FACETS_TIMEOUT = config("QUESTION_FACETS_TIMEOUT", default=60 * 10, cast=int)
+# How long the username autocomplete results of a prefix are cached, in seconds.
+USERNAMES_AUTOCOMPLETE_TIMEOUT = config("USERNAMES_AUTOCOMPLETE_TIMEOUT", default=60, cast=int)
 IMAGE_ATTACHMENT_USER_LIMIT = config("IMAGE_ATTACHMENT_USER_LIMIT", default=50, cast=int)
 
 # Multi-window vote rate limits (see kitsune.questions.views.vote_is_ratelimited).
 VOTE_RATELIMITS = config("VOTE_RATELIMITS", default="5/m,20/h,50/d", cast=Csv())
 ANON_VOTE_RATELIMITS = config("ANON_VOTE_RATELIMITS", default="10/d", cast=Csv())
 
+# How many days back the daily KPI rollups are recomputed, to pick up later changes
+# like questions that got solved.
+KPI_ROLLUP_REFRESH_DAYS = config("KPI_ROLLUP_REFRESH_DAYS", default=30, cast=int)
+
 # list of strings to match against user agent to block
 USER_AGENT_FILTERS = config("USER_AGENT_FILTERS", default="", cast=Csv())
 
@@ -8,12 +8,15 @@ from django.db.models import F
 from django.http import HttpResponse
 from django.utils import translation
 from django.utils.translation import pgettext
-from rest_framework import fields, filters, permissions, serializers
+from rest_framework import fields, filters, pagination, permissions, serializers
 from rest_framework.authentication import CSRFCheck, SessionAuthentication
-from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotFound
 from rest_framework.renderers import JSONRenderer as DRFJSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from kitsune.sumo.i18n import normalize_language
+from kitsune.sumo.paginator import InvalidPage, KeysetPaginator
 from kitsune.users.models import Profile
 
 
@@ -371,3 +374,76 @@ class OrderingFilter(filters.OrderingFilter):
             F(field[1:]).desc(nulls_last=True) if field.startswith("-") else field
             for field in super().get_ordering(request, queryset, view)
         ]
+
+
+class KeysetOrPageNumberPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination, which switches to keyset pagination when the request has
+    a "cursor" query param (empty for the first page). Keyset pages neither count nor
+    skip rows, so every page costs the same as the first. They're ordered by the first
+    field of the view's ordering, with nulls last, and then by id.
+    """
+
+    cursor_query_param = "cursor"
+    keyset_page = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset_page = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        field, descending = self.get_keyset_ordering(request, queryset, view)
+        paginator = KeysetPaginator(
+            queryset, self.get_page_size(request), field, descending=descending
+        )
+        try:
+            self.keyset_page = paginator.page(
+                request.query_params[self.cursor_query_param] or None
+            )
+        except InvalidPage:
+            raise NotFound("Invalid cursor.")
+        return list(self.keyset_page)
+
+    def get_keyset_ordering(self, request, queryset, view):
+        """Return the field to order keyset pages by, and whether it's descending."""
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, filters.OrderingFilter):
+                # The plain field names, rather than the expressions of our subclass.
+                ordering = filters.OrderingFilter.get_ordering(backend(), request, queryset, view)
+                if ordering:
+                    return ordering[0].removeprefix("-"), ordering[0].startswith("-")
+        return "pk", True
+
+    def get_paginated_response(self, data):
+        if self.keyset_page is None:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if self.keyset_page is None:
+            return super().get_next_link()
+        if not self.keyset_page.has_next():
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.keyset_page.next_page_number(),
+        )
+
+    def get_previous_link(self):
+        if self.keyset_page is None:
+            return super().get_previous_link()
+        if not self.keyset_page.has_previous():
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.keyset_page.previous_page_number(),
+        )
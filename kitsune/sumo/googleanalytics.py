@@ -33,6 +33,8 @@ PERIOD_TO_DAYS_AGO = {
 }
 VALID_LOCALES = frozenset(lang for lang in settings.SUMO_LANGUAGES if lang != "xx")
 GA_SCOPES = ["https://www.googleapis.com/auth/analytics.readonly"]
+# The maximum number of rows that the GA4 data API will return in one response.
+REPORT_PAGE_SIZE = 10000
 
 
 def get_client():
@@ -291,16 +293,15 @@ def visitors_by_locale(start_date, end_date, verbose=False):
     return results
 
 
-def pageviews_by_document(period, verbose=False):
+def iter_pageviews_by_document(period, verbose=False):
     """
-    Returns a dictionary where the keys are (locale, slug) and the values are the
-    number of pageviews of the KB article at that locale and slug, within the given
-    period.
+    A generator that yields tuples of (locale, slug, num_page_views) for the KB articles
+    viewed within the given period, as each page of the GA4 report arrives. The same
+    (locale, slug) pair can be yielded more than once, and the page views of each should
+    be summed.
     """
     date_range = DateRange(start_date=PERIOD_TO_DAYS_AGO[period], end_date="today")
 
-    pageviews_by_locale_and_slug = {}
-
     for row in run_report(date_range, create_article_report_request, verbose=verbose):
         path = row.dimension_values[0].value
         article_locale = row.dimension_values[1].value
@@ -324,23 +325,34 @@ def pageviews_by_document(period, verbose=False):
         # each unique "url_locale" and "slug" pair. However, due to locale fallbacks (for
         # example, the "az" "captive-portal" page is requested but the "en-US" page is
         # returned) there can be multiple rows of any given pair of "article_locale" and
-        # "slug", so we need to accumulate the sum of all of those rows.
-        pageviews_by_locale_and_slug[(article_locale, slug)] = (
-            pageviews_by_locale_and_slug.get((article_locale, slug), 0) + num_page_views
+        # "slug".
+        yield (article_locale, slug, num_page_views)
+
+
+def pageviews_by_document(period, verbose=False):
+    """
+    Returns a dictionary where the keys are (locale, slug) and the values are the
+    number of pageviews of the KB article at that locale and slug, within the given
+    period.
+    """
+    pageviews_by_locale_and_slug = {}
+
+    for locale, slug, num_page_views in iter_pageviews_by_document(period, verbose=verbose):
+        pageviews_by_locale_and_slug[(locale, slug)] = (
+            pageviews_by_locale_and_slug.get((locale, slug), 0) + num_page_views
         )
 
     return pageviews_by_locale_and_slug
 
 
-def pageviews_by_question(period=LAST_YEAR, verbose=False):
+def iter_pageviews_by_question(period=LAST_YEAR, verbose=False):
     """
-    A generator that yields tuples of (question_id, num_page_views) for every
-    question with one or more page views within the given period.
+    A generator that yields tuples of (question_id, num_page_views) for the questions
+    viewed within the given period, as each page of the GA4 report arrives. The same
+    question can be yielded more than once, and the page views of each should be summed.
     """
     date_range = DateRange(start_date=PERIOD_TO_DAYS_AGO[period], end_date="today")
 
-    pageviews_by_id = {}
-
     for row in run_report(date_range, create_question_report_request, verbose=verbose):
         path = row.dimension_values[0].value
         # The path should be a question path without any query parameters, but in reality
@@ -356,8 +368,18 @@ def pageviews_by_question(period=LAST_YEAR, verbose=False):
             continue
 
         # The "run_report" will return one row for each unique question path. Since the
-        # path includes the locale, there can be multiple rows for each question, so we
-        # need to accumulate the sum of all of those rows.
+        # path includes the locale, there can be multiple rows for each question.
+        yield (question_id, num_page_views)
+
+
+def pageviews_by_question(period=LAST_YEAR, verbose=False):
+    """
+    Returns a dictionary where the keys are question ids and the values are the number
+    of pageviews of that question within the given period.
+    """
+    pageviews_by_id = {}
+
+    for question_id, num_page_views in iter_pageviews_by_question(period, verbose=verbose):
         pageviews_by_id[question_id] = pageviews_by_id.get(question_id, 0) + num_page_views
 
     return pageviews_by_id
@@ -1,3 +1,10 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.paginator import (
     EmptyPage,
     InvalidPage,
@@ -7,8 +14,11 @@ from django.core.paginator import (
 from django.core.paginator import (
     Paginator as DjPaginator,
 )
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils import timezone
 
-__all__ = ["EmptyPage", "InvalidPage", "Paginator"]
+__all__ = ["EmptyPage", "InvalidPage", "KeysetPaginator", "Paginator"]
 
 
 class Paginator(DjPaginator):
@@ -99,3 +109,149 @@ class SimplePage(Page):
     def end_index(self):
         """Returns the 1-based index of the last object on this page."""
         return (self.number - 1) * self.paginator.per_page + len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginator for Newer/Older pagination which seeks rather than counts.
+
+    Instead of a page number, each page is identified by an opaque cursor that
+    encodes the ordering key and id of the row it starts after (or, going back,
+    ends before), so fetching it costs the same however deep it is. The queryset
+    is ordered by `field`, which may span relations and be null, and then by id.
+    Back it with a composite index on (field, id) for cheap seeks.
+    """
+
+    def __init__(self, object_list, per_page, field, descending=True, nulls_last=True):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+        self.nulls_last = nulls_last
+
+    def page(self, cursor=None):
+        """Returns a KeysetPage for the given cursor, or the first page without one."""
+        backwards, position = decode_cursor(cursor) if cursor else (False, None)
+        descending = self.descending != backwards
+        nulls_last = self.nulls_last != backwards
+
+        queryset = self.object_list.annotate(keyset_position=F(self.field))
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(position, descending, nulls_last))
+            except (ValidationError, TypeError, ValueError) as err:
+                # A forged cursor, with a value the ordering field can't take.
+                raise InvalidPage("That cursor is not valid") from err
+        if descending:
+            ordering = [F("keyset_position").desc(nulls_last=nulls_last), F("pk").desc()]
+        else:
+            ordering = [F("keyset_position").asc(nulls_first=not nulls_last), F("pk").asc()]
+
+        # Fetch one more item than needed, so we know if there's another page.
+        items = list(queryset.order_by(*ordering)[: self.per_page + 1])
+        more = len(items) > self.per_page
+        items = items[: self.per_page]
+        if backwards:
+            if not more:
+                # Back at the start, which may not be a full page from here.
+                return self.page()
+            items.reverse()
+            return KeysetPage(items, self, cursor, has_previous=True, has_next=True)
+        return KeysetPage(items, self, cursor, has_previous=position is not None, has_next=more)
+
+    @staticmethod
+    def _after(position, descending, nulls_last):
+        """Return a filter for the rows after a position in the given order."""
+        value, pk = position
+        op = "lt" if descending else "gt"
+        if value is None:
+            after = Q(keyset_position__isnull=True, **{f"pk__{op}": pk})
+            if not nulls_last:
+                after |= Q(keyset_position__isnull=False)
+            return after
+
+        after = Q(keyset_position=value, **{f"pk__{op}": pk})
+        after |= Q(**{f"keyset_position__{op}": value})
+        if nulls_last:
+            after |= Q(keyset_position__isnull=True)
+        return after
+
+    def cursor(self, item, backwards=False):
+        """Return the cursor for the page after an item, or before it if backwards."""
+        return encode_cursor(backwards, (item.keyset_position, item.pk))
+
+
+class KeysetPage:
+    """A page for the KeysetPaginator.
+
+    It quacks enough like a Page to be rendered by the simple and quick paginators,
+    with cursors in place of the previous and next page numbers.
+    """
+
+    def __init__(self, object_list, paginator, cursor, has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self._has_previous = has_previous and bool(object_list)
+        self._has_next = has_next and bool(object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+    def previous_page_number(self):
+        """The cursor of the previous page."""
+        return self.paginator.cursor(self.object_list[0], backwards=True)
+
+    def next_page_number(self):
+        """The cursor of the next page."""
+        return self.paginator.cursor(self.object_list[-1])
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps the microseconds of datetimes, which DjangoJSONEncoder drops."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return {"datetime": o.isoformat()}
+        return super().default(o)
+
+
+def encode_cursor(backwards, position):
+    data = json.dumps([backwards, list(position)], cls=CursorEncoder)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        value = datetime.fromisoformat(value["datetime"])
+        if settings.USE_TZ and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+    return value
+
+
+def decode_cursor(cursor):
+    """Return (backwards, position) for a cursor, or raise InvalidPage."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        backwards, (value, pk) = json.loads(data)
+        value = _decode_value(value)
+    except (binascii.Error, KeyError, TypeError, ValueError) as err:
+        raise InvalidPage("That cursor is not valid") from err
+    if (
+        not isinstance(backwards, bool)
+        or not isinstance(pk, int)
+        or isinstance(value, list | dict)
+    ):
+        raise InvalidPage("That cursor is not valid")
+    return backwards, (value, pk)
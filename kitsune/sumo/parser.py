@@ -1,4 +1,5 @@
 import re
+from collections import defaultdict
 from urllib.parse import parse_qs, urlparse
 
 from django.conf import settings
@@ -53,6 +54,8 @@ YOUTUBE_DOMAINS = frozenset(
     ["youtu.be", "youtube.com", "www.youtube.com", "www.youtube-nocookie.com"]
 )
 UI_COMPONENT_PLACEHOLDER = "<p>UI_COMPONENT_EMBED_PLACEHOLDER_%s</p>"
+# [[x]] -> (None, 'x'), [[type:x]] -> ('type', 'x'), the way wikimarkup splits them.
+INTERNAL_LINK_RE = re.compile(r"\[\[(?:(:?[^:\]]*?):\s*)?(.*?)\]\]")
 ALLOWED_UI_COMPONENTS = frozenset(["device_migration_wizard", "details_start", "details_end"])
 
 
@@ -70,34 +73,40 @@ def wiki_to_html(
     )
 
 
-def get_object_fallback(cls, title, locale, default=None, **kwargs):
-    """Return an instance of cls matching title and locale, or fall
-    back to the default locale.
+def get_objects_fallback(cls, titles, locale, **kwargs):
+    """Return a dict of each of the titles to the instance of cls matching it and
+    locale, falling back to the default locale like get_object_fallback(), or None.
 
-    When falling back to the default locale, follow any wiki redirects
-    internally.
-
-    If the fallback fails, the return value is `default`.
-
-    You may pass in additional kwargs which go straight to the query.
+    The instances are looked up with a few queries for all the titles, rather than
+    a few queries for each of them.
 
     """
-    try:
-        return cls.objects.get(title=title, locale=locale, **kwargs)
-    except OSError, cls.DoesNotExist:
-        pass
+    objects = dict.fromkeys(titles)
+    for obj in cls.objects.filter(title__in=objects, locale=locale, **kwargs):
+        objects[obj.title] = obj
+
+    missing = [title for title, obj in objects.items() if obj is None]
+    if not missing or locale == settings.WIKI_DEFAULT_LANGUAGE:
+        return objects
 
     # Fallback
-    try:
-        default_lang_doc = cls.objects.get(
-            title=title, locale=settings.WIKI_DEFAULT_LANGUAGE, **kwargs
+    default_lang_objs = cls.objects.filter(
+        title__in=missing, locale=settings.WIKI_DEFAULT_LANGUAGE, **kwargs
+    )
+    if not hasattr(cls, "translated_to"):
+        objects.update((obj.title, obj) for obj in default_lang_objs)
+        return objects
+
+    default_lang_docs = list(default_lang_objs)
+    translations = {
+        trans.parent_id: trans
+        for trans in cls.objects.filter(
+            parent__in=default_lang_docs, locale=locale, current_revision__isnull=False
         )
-
+    }
+    for default_lang_doc in default_lang_docs:
         # Return the translation of this English item:
-        if hasattr(default_lang_doc, "translated_to"):
-            trans = default_lang_doc.translated_to(locale)
-            if trans and trans.current_revision:
-                return trans
+        trans = translations.get(default_lang_doc.id)
 
         # Follow redirects internally in an attempt to find a
         # translation of the final redirect target in the requested
@@ -106,23 +115,59 @@ def get_object_fallback(cls, title, locale, default=None, **kwargs):
         # the non-English user to be linked to the English redirect,
         # which would happily redirect them to the English final
         # article.
-        if hasattr(default_lang_doc, "redirect_document"):
-            target = default_lang_doc.redirect_document()
-            if target:
-                trans = target.translated_to(locale)
-                if trans and trans.current_revision:
-                    return trans
+        if not trans and (target := default_lang_doc.redirect_document()):
+            trans = target.translated_to(locale)
+            if trans and not trans.current_revision_id:
+                trans = None
+
+        # Or return the English item:
+        objects[default_lang_doc.title] = trans or default_lang_doc
+    return objects
+
+
+def get_object_fallback(cls, title, locale, default=None, **kwargs):
+    """Return an instance of cls matching title and locale, or fall
+    back to the default locale.
+
+    When falling back to the default locale, follow any wiki redirects
+    internally.
+
+    If the fallback fails, the return value is `default`.
+
+    You may pass in additional kwargs which go straight to the query.
+
+    """
+    obj = get_objects_fallback(cls, [title], locale, **kwargs)[title]
+    return default if obj is None else obj
+
+
+def split_link(name):
+    """Split the name of an internal link, e.g. "Title#hash|text", into its title,
+    text (False if there's none) and hash."""
+    text = False
+    title = name
+
+    # Split on pipe -- [[href|name]]
+    if "|" in name:
+        title, text = title.split("|", 1)
+        title = re.sub(r"\s+", " ", title).strip()
+
+    hash = ""
+    if "#" in title:
+        title, hash = title.split("#", 1)
 
-        # Return the English item:
-        return default_lang_doc
-    # Okay, all else failed
-    except OSError, cls.DoesNotExist:
-        return default
+    # Sections use _, page names use +
+    if hash != "":
+        hash = "#" + hash.replace(" ", "_")
 
+    return title, text, hash
 
-def _get_wiki_link(title, locale):
+
+def _get_wiki_link(title, locale, document=False):
     """Checks the page exists, and returns its URL or the URL to create it.
 
+    Pass the document the title refers to, or None, if it's been looked up already.
+
     Return value is a dict: {'found': boolean, 'url': string}.
     found is False if the document does not exist.
 
@@ -132,11 +177,13 @@ def _get_wiki_link(title, locale):
     # to happen) dependencies on client apps.
     from kitsune.wiki.models import Document
 
-    d = get_object_fallback(Document, locale=locale, title=title, is_template=False)
+    d = document
+    if d is False:
+        d = get_object_fallback(Document, locale=locale, title=title, is_template=False)
     if d:
         # If the article redirects use its destination article
-        while d.redirect_document():
-            d = d.redirect_document()
+        while target := d.redirect_document():
+            d = target
 
         # The locale in the link urls should always match the current
         # document's locale even if the document/slug being linked to
@@ -233,6 +280,9 @@ class WikiParser(Parser):
         self.youtube_videos = set()
         self.ui_components = set()
 
+        # The objects looked up by title, keyed by _object_key().
+        self.objects = {}
+
     def parse(
         self,
         text,
@@ -273,6 +323,8 @@ class WikiParser(Parser):
             of parsing.
         """
         self.locale = locale
+        self.objects = self._object_memo()
+        self._prefetch_objects(text)
 
         @email_utils.safe_translation
         def _parse(locale):
@@ -344,23 +396,52 @@ class WikiParser(Parser):
 
         return html
 
-    def _hook_internal_link(self, parser, space, name):
-        """Parses text and returns internal link."""
-        text = False
-        title = name
-
-        # Split on pipe -- [[href|name]]
-        if "|" in name:
-            title, text = title.split("|", 1)
-            title = re.sub(r"\s+", " ", title).strip()
+    def _object_memo(self):
+        """Return the dict to keep the objects looked up during a parse in."""
+        return {}
+
+    def _object_key(self, cls, title, kwargs):
+        return (cls, title, self.locale, *sorted(kwargs.items()))
+
+    def _get_object(self, cls, title, **kwargs):
+        """Return what get_object_fallback() does for the title in the parser's
+        locale, unless it was looked up already."""
+        key = self._object_key(cls, title, kwargs)
+        if key not in self.objects:
+            self.objects[key] = get_object_fallback(cls, title, self.locale, **kwargs)
+        return self.objects[key]
+
+    def _link_lookup(self, space, name):
+        """Return the (cls, title, kwargs) the hook of an internal link will pass to
+        _get_object(), or None if it won't look anything up."""
+        if space is None:
+            from kitsune.wiki.models import Document
+
+            title, _text, _hash = split_link(name)
+            if title:
+                return (Document, title, {"is_template": False})
+        elif space == "Image":
+            return (Image, name.split("|", 1)[0].strip(), {})
+        return None
 
-        hash = ""
-        if "#" in title:
-            title, hash = title.split("#", 1)
+    def _prefetch_objects(self, text):
+        """Look up the objects the internal links of the text refer to in bulk,
+        so the hooks find them in self.objects rather than querying for each."""
+        titles = defaultdict(set)
+        for match in INTERNAL_LINK_RE.finditer(text):
+            if lookup := self._link_lookup(*match.groups()):
+                cls, title, kwargs = lookup
+                if self._object_key(cls, title, kwargs) not in self.objects:
+                    titles[cls, tuple(sorted(kwargs.items()))].add(title)
+
+        for (cls, kwargs), group in titles.items():
+            kwargs = dict(kwargs)
+            for title, obj in get_objects_fallback(cls, group, self.locale, **kwargs).items():
+                self.objects[self._object_key(cls, title, kwargs)] = obj
 
-        # Sections use _, page names use +
-        if hash != "":
-            hash = "#" + hash.replace(" ", "_")
+    def _hook_internal_link(self, parser, space, name):
+        """Parses text and returns internal link."""
+        title, text, hash = split_link(name)
 
         # Links to this page can just contain href="#hash"
         if title == "" and hash != "":
@@ -368,7 +449,10 @@ class WikiParser(Parser):
                 text = hash.replace("_", " ")
             return '<a href="{}">{}</a>'.format(hash, text)
 
-        link = _get_wiki_link(title, self.locale)
+        from kitsune.wiki.models import Document
+
+        document = self._get_object(Document, title, is_template=False)
+        link = _get_wiki_link(title, self.locale, document)
         extra_a_attr = ""
         if not link["found"]:
             extra_a_attr += ' class="new" title="{tooltip}"'.format(
@@ -384,10 +468,9 @@ class WikiParser(Parser):
         """Adds syntax for inserting images."""
         title, params = build_hook_params(name, self.locale, IMAGE_PARAMS, IMAGE_PARAM_VALUES)
 
-        message = _lazy('The image "%s" does not exist.') % title
-        image = get_object_fallback(Image, title, self.locale, message)
-        if isinstance(image, str):
-            return image
+        image = self._get_object(Image, title)
+        if image is None:
+            return _lazy('The image "%s" does not exist.') % title
 
         return render_to_string(
             self.image_template,
@@ -1,9 +1,10 @@
 import random
 import time
+from datetime import UTC, date, datetime, timedelta
 from functools import cached_property
 
 from django.conf import settings
-from redis import ConnectionError, Redis
+from redis import ConnectionError, Redis, TimeoutError
 from sentry_sdk import capture_exception
 
 
@@ -117,3 +118,172 @@ class RateLimit:
             if self.max_wait_period and (waited >= self.max_wait_period):
                 break
         return waited
+
+
+class SlidingWindowCounter:
+    """
+    Per-object counts of events over the last few days, kept in Redis.
+
+    Each UTC day has its own hash of object ids to the number of events counted for
+    them that day, and the count of an object is the sum over the days of the window,
+    so counts slide forward a day at a time without anything being decremented. The
+    ids whose count changed, because an event was counted or a day left the window,
+    are collected until they're popped to write the new counts somewhere else.
+
+    The days are kept in Redis only, so the counter has to be seeded from the events
+    themselves when it's used for the first time, or if Redis lost them.
+    """
+
+    # How many days the counter catches up on when it wasn't popped for a while.
+    catch_up_days = 7
+
+    def __init__(self, name: str, days: int):
+        # The window is today and the given number of days before it.
+        self.name = name
+        self.days = days
+        self._redis: Redis | None = None
+        # Whether an event couldn't be counted and the seeded marker is still around.
+        self._needs_seeding = False
+
+    @property
+    def redis(self) -> Redis | None:
+        """
+        Creates and caches the Redis client on demand, or returns None if Redis isn't
+        available, in which case the next call tries again.
+        """
+        if self._redis is None:
+            try:
+                self._redis = redis_client("default")
+            except RedisError as err:
+                capture_exception(err)
+        return self._redis
+
+    def _day_key(self, day: date) -> str:
+        return f"counters:{self.name}:{day.isoformat()}"
+
+    @property
+    def _changed_key(self) -> str:
+        return f"counters:{self.name}:changed"
+
+    @property
+    def _seeded_key(self) -> str:
+        return f"counters:{self.name}:seeded"
+
+    @property
+    def _swept_key(self) -> str:
+        return f"counters:{self.name}:swept"
+
+    @property
+    def _expiry(self) -> timedelta:
+        # Keep each day until it has left the window and could still be caught up on.
+        return timedelta(days=self.days + 2 + self.catch_up_days)
+
+    def _window(self) -> list[date]:
+        today = datetime.now(UTC).date()
+        return [today - timedelta(days=n) for n in range(self.days + 1)]
+
+    def incr(self, obj_id: int) -> bool:
+        """
+        Count an event for the given object today. Returns False if it couldn't be
+        counted because Redis isn't available, in which case the counter has to be
+        seeded again, since it missed the event.
+        """
+        if not self.redis:
+            self._needs_seeding = True
+            return False
+        key = self._day_key(self._window()[0])
+        try:
+            with self.redis.pipeline() as pipe:
+                if self._needs_seeding:
+                    pipe.delete(self._seeded_key)
+                pipe.hincrby(key, obj_id, 1)
+                pipe.expire(key, self._expiry)
+                pipe.sadd(self._changed_key, obj_id)
+                pipe.execute()
+        except (ConnectionError, TimeoutError) as err:
+            capture_exception(err)
+            self._needs_seeding = True
+            try:
+                self.redis.delete(self._seeded_key)
+                self._needs_seeding = False
+            except ConnectionError, TimeoutError:
+                pass
+            # Try a new client next time.
+            self._redis = None
+            return False
+        self._needs_seeding = False
+        return True
+
+    def reset(self) -> None:
+        """Drop all the counts, so the counter needs to be seeded again."""
+        first = self._window()[-1] - timedelta(days=self.catch_up_days + 1)
+        self.redis.delete(
+            *(self._day_key(first + timedelta(days=n)) for n in range(self._expiry.days)),
+            self._changed_key,
+            self._seeded_key,
+            self._swept_key,
+        )
+        self._needs_seeding = False
+
+    def is_seeded(self) -> bool:
+        return bool(self.redis.exists(self._seeded_key))
+
+    def seed(self, rows) -> None:
+        """
+        Replace the counts of the window by the given (object id, day, count) rows,
+        and mark all of their objects as changed.
+        """
+        counts: dict[date, dict[int, int]] = {day: {} for day in self._window()}
+        for obj_id, day, count in rows:
+            if day in counts:
+                counts[day][obj_id] = count
+        with self.redis.pipeline() as pipe:
+            for day, day_counts in counts.items():
+                key = self._day_key(day)
+                pipe.delete(key)
+                if day_counts:
+                    pipe.hset(key, mapping=day_counts)
+                    pipe.expire(key, self._expiry)
+                    pipe.sadd(self._changed_key, *day_counts)
+            pipe.set(self._seeded_key, 1)
+            pipe.execute()
+
+    def pop_changed(self) -> set[int]:
+        """
+        Return the ids of the objects whose count changed since the last call, including
+        those counted on the days that left the window since then, up to catch_up_days
+        of them.
+        """
+        expired = datetime.now(UTC).date() - timedelta(days=self.days + 1)
+        first = expired
+        if swept := self.redis.get(self._swept_key):
+            first = max(
+                date.fromisoformat(swept) + timedelta(days=1),
+                expired - timedelta(days=self.catch_up_days),
+            )
+        expired_days = [first + timedelta(days=n) for n in range((expired - first).days + 1)]
+        with self.redis.pipeline() as pipe:
+            pipe.smembers(self._changed_key)
+            pipe.delete(self._changed_key)
+            for day in expired_days:
+                pipe.hkeys(self._day_key(day))
+            pipe.set(self._swept_key, expired.isoformat(), ex=self._expiry)
+            changed, _, *expired_ids, _ = pipe.execute()
+        for ids in expired_ids:
+            changed |= set(ids)
+        return {int(obj_id) for obj_id in changed}
+
+    def counts(self, obj_ids) -> dict[int, int]:
+        """Return the counts over the window of the objects with the given ids."""
+        obj_ids = list(obj_ids)
+        totals = dict.fromkeys(obj_ids, 0)
+        if not obj_ids:
+            return totals
+        with self.redis.pipeline() as pipe:
+            for day in self._window():
+                pipe.hmget(self._day_key(day), obj_ids)
+            for day_counts in pipe.execute():
+                for obj_id, count in zip(obj_ids, day_counts, strict=True):
+                    if count:
+                        totals[obj_id] += int(count)
+        return totals
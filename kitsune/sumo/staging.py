@@ -0,0 +1,45 @@
+from django.db import connection
+
+
+class CountStagingTable:
+    """
+    A temporary table of (key, value) integer counts, which accumulates counts for the same
+    key as they're added, so large reports can be loaded page by page with flat memory use
+    and then applied to a real table with a single statement.
+
+    The table lives only as long as the database connection, and is dropped on exit:
+
+        with CountStagingTable("visits_staging") as staging:
+            for page in pages:
+                staging.add(counts_for(page))
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO ... SELECT key, value FROM {staging.name} ...")
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.name}")
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {self.name} "
+                "(key bigint PRIMARY KEY, value bigint NOT NULL)"
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.name}")
+
+    def add(self, counts):
+        """Add a dictionary of counts by key to the counts already staged."""
+        if not counts:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.name} (key, value) "
+                "SELECT * FROM unnest(%s::bigint[], %s::bigint[]) "
+                f"ON CONFLICT (key) DO UPDATE SET value = {self.name}.value + EXCLUDED.value",
+                [list(counts.keys()), list(counts.values())],
+            )
@@ -11,7 +11,7 @@ document.addEventListener("DOMContentLoaded", () => {
   fetch(helpfulGraph.dataset.url)
     .then((response) => response.json())
     .then((data) => {
-      if (data.datums.length === 0) {
+      if (data.dates.length === 0) {
         helpfulGraph.textContent = gettext("No votes data");
         return;
       }
@@ -26,13 +26,17 @@ document.addEventListener("DOMContentLoaded", () => {
       helpfulGraph.appendChild(wrap);
 
       const schedule = window.requestIdleCallback || ((cb) => setTimeout(cb, 0));
-      schedule(() => renderLineChart(canvas, buildConfig(data.datums)));
+      schedule(() => renderLineChart(canvas, buildConfig(toDatums(data))));
     })
     .catch(() => {
       helpfulGraph.textContent = gettext("Error loading graph");
     });
 });
 
+function toDatums({ dates, yes, no }) {
+  return dates.map((date, i) => ({ date, yes: yes[i], no: no[i] }));
+}
+
 function buildConfig(datums) {
   return {
     type: "line",
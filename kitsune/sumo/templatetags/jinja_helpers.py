@@ -37,7 +37,7 @@ from kitsune.sumo.utils import (
     is_trusted_user,
     webpack_static,
 )
-from kitsune.users.models import Profile
+from kitsune.users.profiles import get_profile
 from kitsune.wiki.showfor import showfor_data as _showfor_data
 
 log = logging.getLogger("k.helpers")
@@ -281,12 +281,8 @@ def datetimeformat(context, value, format="shortdatetime", use_timesince=False):
     if hasattr(request, "session"):
         if "timezone" not in request.session:
             if hasattr(request, "user") and request.user.is_authenticated:
-                try:
-                    convert_tzinfo = (
-                        Profile.objects.get(user=request.user).timezone or default_tzinfo
-                    )
-                except Profile.DoesNotExist, AttributeError:
-                    pass
+                if profile := get_profile(request.user):
+                    convert_tzinfo = profile.timezone or default_tzinfo
             request.session["timezone"] = str(convert_tzinfo)
         else:
             tz_str = request.session.get("timezone")
@@ -1,11 +1,23 @@
+from datetime import UTC, datetime, timedelta
+
 import pyquery
+from django.contrib.auth.models import User
 from django.test.client import RequestFactory
-
-from kitsune.sumo.paginator import EmptyPage, PageNotAnInteger
+from django.utils import timezone
+
+from kitsune.sumo.paginator import (
+    EmptyPage,
+    InvalidPage,
+    KeysetPaginator,
+    PageNotAnInteger,
+    decode_cursor,
+    encode_cursor,
+)
 from kitsune.sumo.templatetags.jinja_helpers import paginator
 from kitsune.sumo.tests import TestCase
 from kitsune.sumo.urlresolvers import reverse
-from kitsune.sumo.utils import paginate, simple_paginate
+from kitsune.sumo.utils import keyset_paginate, paginate, simple_paginate
+from kitsune.users.tests import UserFactory
 
 
 def test_paginated_url():
@@ -96,3 +108,65 @@ class SimplePaginatorTestCase(TestCase):
         queryset = [{}, {}]
         with self.assertRaises(PageNotAnInteger):
             simple_paginate(request, queryset, per_page=2)
+
+
+class KeysetPaginatorTestCase(TestCase):
+    rf = RequestFactory()
+
+    def setUp(self):
+        now = timezone.now()
+        # Two ties and two nulls, so the id breaks ties on both sides of the nulls.
+        self.users = [
+            UserFactory(last_login=now - timedelta(days=days)) for days in (3, 1, 1, 2)
+        ] + UserFactory.create_batch(2, last_login=None)
+        self.queryset = User.objects.filter(id__in=[u.id for u in self.users])
+
+    def _walk(self, paginator):
+        """Return the ids of every page, going forward and then back again."""
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_page_number()))
+        forward = [[u.id for u in page] for page in pages]
+
+        backward = [forward[-1]]
+        page = pages[-1]
+        while page.has_previous():
+            page = paginator.page(page.previous_page_number())
+            backward.insert(0, [u.id for u in page])
+        self.assertEqual(forward, backward)
+        return forward
+
+    def test_descending_nulls_last(self):
+        u0, u1, u2, u3, u4, u5 = (u.id for u in self.users)
+        paginator = KeysetPaginator(self.queryset, 2, "last_login")
+        self.assertEqual(self._walk(paginator), [[u2, u1], [u3, u0], [u5, u4]])
+
+    def test_ascending_nulls_first(self):
+        u0, u1, u2, u3, u4, u5 = (u.id for u in self.users)
+        paginator = KeysetPaginator(
+            self.queryset, 4, "last_login", descending=False, nulls_last=False
+        )
+        self.assertEqual(self._walk(paginator), [[u4, u5, u0, u3], [u1, u2]])
+
+    def test_first_page(self):
+        for url in ("/questions", "/questions?page=1"):
+            page = keyset_paginate(self.rf.get(url), self.queryset, "last_login", per_page=5)
+            self.assertIsNone(page.cursor)
+            assert not page.has_previous()
+            assert page.has_next()
+
+    def test_cursor_keeps_microseconds(self):
+        position = (datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC), 7)
+        self.assertEqual((True, position), decode_cursor(encode_cursor(True, position)))
+
+    def test_invalid_cursors(self):
+        for cursor in ("2", "foo", "W3RydWVd"):
+            with self.assertRaises(InvalidPage):
+                keyset_paginate(self.rf.get(f"/questions?page={cursor}"), self.queryset, "id")
+
+    def test_forged_cursors(self):
+        for field in ("last_login", "id"):
+            for value in ("abc", [1]):
+                cursor = encode_cursor(False, (value, 1))
+                with self.assertRaises(InvalidPage):
+                    keyset_paginate(self.rf.get(f"/questions?page={cursor}"), self.queryset, field)
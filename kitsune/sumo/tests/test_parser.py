@@ -14,6 +14,7 @@ from kitsune.sumo.parser import (
     _get_wiki_link,
     build_hook_params,
     get_object_fallback,
+    get_objects_fallback,
     wiki_to_html,
 )
 from kitsune.sumo.tests import TestCase
@@ -129,6 +130,24 @@ class GetObjectFallbackTests(TestCase):
             get_object_fallback(Document, "redirect", redirect_rev.document.locale),
         )
 
+    def test_bulk(self):
+        """get_objects_fallback looks up several titles at once."""
+        en_d = DocumentFactory(title="A doc")
+        ApprovedRevisionFactory(document=en_d)
+        fr_d = DocumentFactory(parent=en_d, title="Une doc", locale="fr")
+        ApprovedRevisionFactory(document=fr_d)
+        other_fr_d = DocumentFactory(title="Autre doc", locale="fr")
+        other_en_d = DocumentFactory(title="Other doc")
+
+        with self.assertNumQueries(3):
+            objects = get_objects_fallback(
+                Document, ["A doc", "Autre doc", "Other doc", "No doc"], "fr"
+            )
+        self.assertEqual(
+            {"A doc": fr_d, "Autre doc": other_fr_d, "Other doc": other_en_d, "No doc": None},
+            objects,
+        )
+
 
 class TestWikiParser(TestCase):
     def setUp(self):
@@ -429,6 +448,21 @@ class TestWikiInternalLinks(TestCase):
         self.assertEqual("/fr/kb/une-doc", link.find("a").attr("href"))
         self.assertEqual("Une doc", link.find("a").text())
 
+    def test_links_are_looked_up_in_bulk(self):
+        """The number of queries doesn't grow with the number of links."""
+        for i in range(5):
+            en_d = DocumentFactory(title=f"Doc {i}")
+            fr_d = DocumentFactory(parent=en_d, title=f"Doc fr {i}", locale="fr")
+            ApprovedRevisionFactory(document=fr_d)
+        text = " ".join(f"[[Doc {i}]] [[Doc {i}#section|again]]" for i in range(5))
+
+        # The titles in French, then in English, then the translations of the latter.
+        with self.assertNumQueries(3):
+            links = pq(self.p.parse(f"{text} [[A new page]]", locale="fr"))("a")
+        self.assertEqual("/fr/kb/doc-fr-0", links.eq(0).attr("href"))
+        self.assertEqual("/fr/kb/doc-fr-4#section", links.eq(9).attr("href"))
+        assert links.eq(10).hasClass("new")
+
 
 class TestWikiImageTags(TestCase):
     def setUp(self):
@@ -1,10 +1,12 @@
 import multiprocessing
 import time
+from datetime import UTC, datetime, timedelta
 from unittest import mock
 
 from django.test import tag
+from redis import ConnectionError
 
-from kitsune.sumo.redis_utils import RateLimit, RedisError
+from kitsune.sumo.redis_utils import RateLimit, RedisError, SlidingWindowCounter
 from kitsune.sumo.tests import TestCase
 
 
@@ -116,3 +118,88 @@ class TestRateLimit(TestCase):
 
         redis_mock.assert_called_once()
         capture_mock.assert_called_once_with(redis_mock.side_effect)
+
+
+class TestSlidingWindowCounter(TestCase):
+    def setUp(self):
+        self.counter = SlidingWindowCounter("test-counter", days=7)
+        self.counter.reset()
+        self.today = datetime.now(UTC).date()
+
+    def tearDown(self):
+        self.counter.reset()
+
+    def test_incr(self):
+        self.assertFalse(self.counter.is_seeded())
+        self.assertTrue(self.counter.incr(1))
+        self.assertTrue(self.counter.incr(1))
+        self.assertTrue(self.counter.incr(2))
+        self.assertEqual({1, 2}, self.counter.pop_changed())
+        self.assertEqual(set(), self.counter.pop_changed())
+        self.assertEqual({1: 2, 2: 1, 3: 0}, self.counter.counts([1, 2, 3]))
+
+    def test_seed(self):
+        self.counter.incr(3)
+        self.counter.seed(
+            [
+                (1, self.today, 2),
+                (1, self.today - timedelta(days=7), 1),
+                (2, self.today - timedelta(days=3), 4),
+                # Outside of the window.
+                (2, self.today - timedelta(days=8), 5),
+            ]
+        )
+        self.assertTrue(self.counter.is_seeded())
+        self.assertEqual({1, 2, 3}, self.counter.pop_changed())
+        self.assertEqual({1: 3, 2: 4, 3: 0}, self.counter.counts([1, 2, 3]))
+
+    def test_day_leaving_the_window(self):
+        expired = self.counter._day_key(self.today - timedelta(days=8))
+        self.counter.redis.hset(expired, mapping={4: 1, 5: 2})
+        self.counter.incr(1)
+        self.assertEqual({1, 4, 5}, self.counter.pop_changed())
+        self.assertEqual(set(), self.counter.pop_changed())
+        self.assertEqual({4: 0, 5: 0}, self.counter.counts([4, 5]))
+
+    def test_without_redis(self):
+        with mock.patch(
+            "kitsune.sumo.redis_utils.redis_client", side_effect=RedisError("no redis")
+        ):
+            counter = SlidingWindowCounter("test-counter", days=7)
+            self.assertIsNone(counter.redis)
+            self.assertFalse(counter.incr(1))
+
+    def test_days_left_the_window_while_not_popped(self):
+        self.counter.pop_changed()
+        for n, obj_id in [(9, 4), (10, 5), (12, 6)]:
+            day = self.today - timedelta(days=n)
+            self.counter.redis.hset(self.counter._day_key(day), mapping={obj_id: 1})
+        # The last call was three days ago.
+        self.counter.redis.set(
+            self.counter._swept_key, (self.today - timedelta(days=11)).isoformat()
+        )
+        self.assertEqual({4, 5}, self.counter.pop_changed())
+        self.assertEqual(set(), self.counter.pop_changed())
+
+    @mock.patch("kitsune.sumo.redis_utils.capture_exception")
+    def test_redis_failure(self, capture_mock):
+        self.counter.seed([])
+        with mock.patch("redis.client.Pipeline.execute", side_effect=ConnectionError()):
+            self.assertFalse(self.counter.incr(1))
+        capture_mock.assert_called_once()
+        # The counter missed a vote, so it's seeded again.
+        self.assertFalse(self.counter.is_seeded())
+        self.assertTrue(self.counter.incr(1))
+
+    @mock.patch("kitsune.sumo.redis_utils.capture_exception")
+    def test_redis_failure_without_a_connection(self, capture_mock):
+        self.counter.seed([])
+        with (
+            mock.patch("redis.client.Pipeline.execute", side_effect=ConnectionError()),
+            mock.patch("redis.client.Redis.delete", side_effect=ConnectionError()),
+        ):
+            self.assertFalse(self.counter.incr(1))
+        self.assertTrue(self.counter.is_seeded())
+        # The marker is dropped along with the next count.
+        self.assertTrue(self.counter.incr(1))
+        self.assertFalse(self.counter.is_seeded())
@@ -64,6 +64,25 @@ def simple_paginate(request, queryset, per_page=20):
     return page
 
 
+def keyset_paginate(request, queryset, field, descending=True, nulls_last=True, per_page=20):
+    """Get a KeysetPaginator page, for the cursor in the "page" query param.
+
+    Page 1 is the first page, but other page numbers are invalid.
+    """
+    p = paginator.KeysetPaginator(
+        queryset, per_page, field, descending=descending, nulls_last=nulls_last
+    )
+
+    # Let the view the handle exceptions.
+    cursor = request.GET.get("page", "1")
+    if cursor.isdigit() and cursor != "1":
+        raise paginator.InvalidPage("Pages are identified by a cursor, not a number")
+    page = p.page(None if cursor == "1" else cursor)
+    page.url = build_paged_url(request)
+
+    return page
+
+
 def build_paged_url(request):
     """Build the url for the paginator."""
     base = request.build_absolute_uri(request.path)
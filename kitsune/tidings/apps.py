@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class TidingsConfig(AppConfig):
     name = "kitsune.tidings"
     default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        from kitsune.tidings.events import register_signals
+
+        register_signals()
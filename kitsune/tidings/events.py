@@ -1,19 +1,26 @@
+import hashlib
 import itertools
 import random
 from smtplib import SMTPException
+from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core import mail
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
 
-from kitsune.sumo.email_utils import send_messages
 from kitsune.tidings.models import EmailUser, Watch, WatchFilter, multi_raw
-from kitsune.tidings.tasks import send_emails
+from kitsune.tidings.tasks import fan_out_emails, send_emails, send_to_watchers
 from kitsune.tidings.utils import hash_to_unsigned
 
+WATCHES_VERSION_CACHE_KEY = "tidings:watches-version:{user_id}"
+# Event types have spaces, which can't be in cache keys, so they're hashed.
+WATCHES_CACHE_KEY = "tidings:watches:{user_id}:{version}:{event_digest}:{object_id}"
+
 
 class ActivationRequestFailed(Exception):
     """Raised when activation request fails, e.g. if email could not be sent"""
@@ -75,6 +82,67 @@ def unique_by_email(*users_and_watches):
         yield (user, watches)
 
 
+def user_watches(user, event_type, object_id=None):
+    """
+    Return the content type id, object id and filters of each watch the given user has
+    for the given event type, and the given object if not None, as a list of
+    ``(content_type_id, object_id, {name: value})`` tuples.
+
+    They're loaded in one query, cached until the user's watches change, and kept on
+    the user object for the rest of the request.
+    """
+    memo = user.__dict__.setdefault("_tidings_watches", {})
+    if (event_type, object_id) not in memo:
+        version = cache.get_or_set(
+            WATCHES_VERSION_CACHE_KEY.format(user_id=user.id), lambda: uuid4().hex, None
+        )
+        key = WATCHES_CACHE_KEY.format(
+            user_id=user.id,
+            version=version,
+            event_digest=hashlib.sha1(event_type.encode("utf-8")).hexdigest(),
+            object_id=object_id,
+        )
+        watches = cache.get(key)
+        if watches is None:
+            rows = Watch.objects.filter(user=user, event_type=event_type)
+            if object_id:
+                rows = rows.filter(object_id=object_id)
+            by_id = {}
+            for watch_id, content_type_id, watch_object_id, name, value in rows.values_list(
+                "id", "content_type_id", "object_id", "filters__name", "filters__value"
+            ):
+                _, _, watch_filters = by_id.setdefault(
+                    watch_id, (content_type_id, watch_object_id, {})
+                )
+                if name is not None:
+                    watch_filters[name] = value
+            watches = list(by_id.values())
+            cache.set(key, watches, settings.CACHE_MEDIUM_TIMEOUT)
+        memo[event_type, object_id] = watches
+    return memo[event_type, object_id]
+
+
+def forget_user_watches(user_id):
+    """Drop the cached watches of the user with the given id."""
+    key = WATCHES_VERSION_CACHE_KEY.format(user_id=user_id)
+    cache.delete(key)
+    # Watches cached before the change is committed can't see it, so once more.
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _drop_user_watches(sender, instance, **kwargs):
+    watch = instance.watch if isinstance(instance, WatchFilter) else instance
+    if watch.user_id:
+        forget_user_watches(watch.user_id)
+
+
+def register_signals():
+    post_save.connect(_drop_user_watches, sender=Watch)
+    post_delete.connect(_drop_user_watches, sender=Watch)
+    # Filters are only ever deleted along with their watch.
+    post_save.connect(_drop_user_watches, sender=WatchFilter)
+
+
 class Event:
     """Abstract base class for events
 
@@ -119,7 +187,7 @@ class Event:
         else:
             self.send_emails(exclude=exclude)
 
-    def send_emails(self, exclude=None):
+    def send_emails(self, exclude=None, fan_out=None):
         """
         Notify everyone watching the event (build and send emails).
 
@@ -133,8 +201,16 @@ class Event:
         :arg exclude: A sequence of users or None. If a sequence of users is
           passed in, each of those users will not be notified, though anonymous
           notifications having the same email address may still be sent.
+        :arg fan_out: The serialized event whose mails these are, or None. If
+          given, the watchers are notified in chunks of
+          ``TIDINGS_FANOUT_CHUNK_SIZE`` by :func:`~tidings.tasks.send_email_chunk`
+          tasks, which rebuild the event and call its :meth:`_mails()`.
         """
-        send_messages(self._mails(self._users_watching(exclude=exclude)))
+        users_and_watches = self._users_watching(exclude=exclude)
+        if fan_out:
+            fan_out_emails(self, fan_out, users_and_watches)
+        else:
+            send_to_watchers(self, users_and_watches)
 
     def serialize(self):
         """
@@ -368,9 +444,24 @@ class Event:
         response.
 
         """
-        return cls._watches_belonging_to_user(
-            user_or_email_, object_id=object_id, **filters
-        ).exists()
+        if isinstance(user_or_email_, str) or not user_or_email_.is_authenticated:
+            return cls._watches_belonging_to_user(
+                user_or_email_, object_id=object_id, **filters
+            ).exists()
+
+        # Answer from the user's watches, so repeated checks don't each query them.
+        cls._validate_filters(filters)
+        content_type_id = (
+            ContentType.objects.get_for_model(cls.content_type).id if cls.content_type else None
+        )
+        wanted_filters = {k: hash_to_unsigned(v) for k, v in filters.items()}
+        return any(
+            (content_type_id is None or watch_content_type_id == content_type_id)
+            and watch_filters == wanted_filters
+            for watch_content_type_id, _, watch_filters in user_watches(
+                user_or_email_, cls.event_type, object_id or None
+            )
+        )
 
     @classmethod
     def notify(cls, user_or_email_, object_id=None, **filters):
@@ -418,6 +509,8 @@ class Event:
             )
             for k, v in iter(filters.items()):
                 WatchFilter.objects.create(watch=watch, name=k, value=hash_to_unsigned(v))
+        if not isinstance(user_or_email_, str):
+            user_or_email_.__dict__.pop("_tidings_watches", None)
         # Send email for inactive watches.
         if not watch.is_active:
             email = watch.user.email if watch.user else watch.email
@@ -441,6 +534,8 @@ class Event:
 
         """
         cls._watches_belonging_to_user(user_or_email_, **filters).delete()
+        if not isinstance(user_or_email_, str):
+            user_or_email_.__dict__.pop("_tidings_watches", None)
 
     # TODO: If GenericForeignKeys don't give us cascading deletes, make a
     # stop_notifying_all(**filters) or something. It should delete any watch of
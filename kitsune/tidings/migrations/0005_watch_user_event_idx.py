@@ -0,0 +1,22 @@
+import django.contrib.postgres.operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently, so writes to the watches aren't blocked
+    # meanwhile, which can't be done in a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tidings", "0004_auto_20240208_0241"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="watch",
+            index=models.Index(
+                fields=["user", "event_type", "content_type", "object_id"],
+                name="watch_user_event_idx",
+            ),
+        ),
+    ]
@@ -9,6 +9,9 @@ from .utils import import_from_setting, reverse
 
 ModelBase: models.Model = import_from_setting("TIDINGS_MODEL_BASE", models.Model)
 
+# How many rows multi_raw() fetches from the database at a time.
+MULTI_RAW_FETCH_SIZE = 2000
+
 
 def multi_raw(query, params, models, model_to_fields):
     """Scoop multiple model instances out of the DB at once, given a query that
@@ -19,17 +22,21 @@ def multi_raw(query, params, models, model_to_fields):
 
         [(<User such-and-such>, <Watch such-and-such>), ...]
 
+    The rows are read in chunks through a server-side cursor where the database
+    supports it, rather than fetched all at once. The instances aren't streamed any
+    further: Event._users_watching_by_filter() merges them all by email with
+    unique_by_email() before anything is sent.
+
     """
-    cursor = connections[router.db_for_read(models[0])].cursor()
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-
-    for row in rows:
-        row_iter = iter(row)
-        yield [
-            model_class(**{a: next(row_iter) for a in model_to_fields[model_class]})
-            for model_class in models
-        ]
+    with connections[router.db_for_read(models[0])].chunked_cursor() as cursor:
+        cursor.execute(query, params)
+        while rows := cursor.fetchmany(MULTI_RAW_FETCH_SIZE):
+            for row in rows:
+                row_iter = iter(row)
+                yield [
+                    model_class(**{a: next(row_iter) for a in model_to_fields[model_class]})
+                    for model_class in models
+                ]
 
 
 class Watch(ModelBase):
@@ -62,6 +69,15 @@ class Watch(ModelBase):
     #: Active watches receive notifications, inactive watches don't.
     is_active = models.BooleanField(default=False, db_index=True)
 
+    class Meta:
+        # For looking up the watches of a user, as Event.is_notifying() does.
+        indexes = [
+            models.Index(
+                fields=["user", "event_type", "content_type", "object_id"],
+                name="watch_user_event_idx",
+            ),
+        ]
+
     def __str__(self):
         # TODO: Trace event_type back to find the Event subclass, and ask it
         # how to describe me in English.
@@ -1,10 +1,19 @@
+import itertools
+import logging
+import time
+
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import prefetch_related_objects
 from sentry_sdk import capture_exception
 
-from kitsune.tidings.models import Watch
+from kitsune.sumo.email_utils import send_messages
+from kitsune.tidings.models import EmailUser, Watch
 from kitsune.tidings.utils import get_class
 
+log = logging.getLogger("k.task")
+
 
 @shared_task
 def claim_watches(user_id):
@@ -12,17 +21,15 @@ def claim_watches(user_id):
     Attach any anonymous watches having a user's email to that user.
     Call this from your user registration process if you like.
     """
+    from kitsune.tidings.events import forget_user_watches
+
     user = get_user_model().objects.get(id=user_id)
     Watch.objects.filter(email=user.email).update(email=None, user=user)
+    forget_user_watches(user.id)
 
 
-@shared_task
-def send_emails(event_info, exclude_user_ids=None):
-    """
-    Celery task that is JSON-serializer friendly, and that fires the event specified by
-    the "event_info" argument while excluding the users specified by "exclude_user_ids",
-    which must be a sequence of user ids if not None.
-    """
+def _get_event(event_info):
+    """Construct the event serialized as "event_info", or return None if its instance is gone."""
     event_cls_info = event_info["event"]
     instance_info = event_info.get("instance")
 
@@ -37,10 +44,66 @@ def send_emails(event_info, exclude_user_ids=None):
             instance = instance_cls.objects.get(id=instance_info["id"])
         except instance_cls.DoesNotExist as err:
             capture_exception(err)
-            return
-        event = event_cls(instance)
+            return None
+        return event_cls(instance)
+    return event_cls()
+
+
+def send_to_watchers(event, users_and_watches):
+    """Build the mails of the event for the given watchers, and send them over one connection."""
+    User = get_user_model()
+    users_and_watches = list(users_and_watches)
+    # The mails are localized by the profile of each user.
+    prefetch_related_objects(
+        [user for user, watches in users_and_watches if isinstance(user, User) and user.pk],
+        "profile",
+    )
+    send_messages(event._mails(users_and_watches))
+
+
+def fan_out_emails(event, event_info, users_and_watches):
+    """
+    Notify the watchers of the event serialized as "event_info" in chunks, each sent by
+    its own send_email_chunk task, or right away if they fit in a single chunk.
+    """
+    User = get_user_model()
+    start = time.monotonic()
+    num_recipients = num_chunks = 0
+
+    chunks = itertools.batched(users_and_watches, settings.TIDINGS_FANOUT_CHUNK_SIZE, strict=False)
+    first_chunk = next(chunks, ())
+    second_chunk = next(chunks, None)
+    if second_chunk is None:
+        send_to_watchers(event, first_chunk)
+        num_recipients, num_chunks = len(first_chunk), 1
     else:
-        event = event_cls()
+        for chunk in itertools.chain([first_chunk, second_chunk], chunks):
+            recipients = [
+                (user.pk if isinstance(user, User) else None, user.email, [w.id for w in watches])
+                for user, watches in chunk
+            ]
+            send_email_chunk.delay(event_info, recipients)
+            num_recipients += len(chunk)
+            num_chunks += 1
+
+    log.info(
+        "Fanned out %s to %d recipients in %d chunks in %.2fs",
+        event_info["event"]["class"],
+        num_recipients,
+        num_chunks,
+        time.monotonic() - start,
+    )
+
+
+@shared_task
+def send_emails(event_info, exclude_user_ids=None):
+    """
+    Celery task that is JSON-serializer friendly, and that fires the event specified by
+    the "event_info" argument while excluding the users specified by "exclude_user_ids",
+    which must be a sequence of user ids if not None.
+    """
+    if (event := _get_event(event_info)) is None:
+        return
 
     # Get the excluded users, if any.
     if exclude_user_ids:
@@ -48,4 +111,32 @@ def send_emails(event_info, exclude_user_ids=None):
     else:
         exclude = None
 
-    event.send_emails(exclude=exclude)
+    event.send_emails(exclude=exclude, fan_out=event_info)
+
+
+@shared_task
+def send_email_chunk(event_info, recipients):
+    """
+    Send the mails of the event specified by the "event_info" argument to a chunk of its
+    watchers, given as (user id or None, email, watch ids) triples. Watches that were
+    deleted since, and the watchers left without any, are skipped.
+    """
+    if (event := _get_event(event_info)) is None:
+        return
+
+    User = get_user_model()
+    users = User.objects.select_related("profile").in_bulk(
+        [user_id for user_id, email, watch_ids in recipients if user_id]
+    )
+    watches = Watch.objects.in_bulk(
+        [watch_id for user_id, email, watch_ids in recipients for watch_id in watch_ids]
+    )
+
+    users_and_watches = []
+    for user_id, email, watch_ids in recipients:
+        user = users.get(user_id) if user_id else EmailUser(email)
+        user_watches = [watches[watch_id] for watch_id in watch_ids if watch_id in watches]
+        if user and user_watches:
+            users_and_watches.append((user, user_watches))
+
+    send_to_watchers(event, users_and_watches)
@@ -1,5 +1,16 @@
+import warnings
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache.backends.base import CacheKeyWarning
+from django.core.mail import EmailMessage
+from django.test import override_settings
+
 from kitsune.sumo.tests import TestCase
-from kitsune.tidings.events import unique_by_email
+from kitsune.tidings.events import Event, unique_by_email
+from kitsune.tidings.models import Watch
+from kitsune.tidings.tasks import send_email_chunk
 from kitsune.tidings.tests import WatchFactory
 from kitsune.users.tests import UserFactory
 
@@ -41,3 +52,99 @@ class UniqueByEmailTests(TestCase):
         self.assertEqual(
             {w.event_type for w in watches}, {w1.event_type, w2.event_type, w5.event_type}
         )
+
+
+class FanOutEvent(Event):
+    event_type = "fan out"
+
+    def _mails(self, users_and_watches):
+        for user, watches in users_and_watches:
+            yield EmailMessage("Fan out", str(len(watches)), to=[user.email])
+
+    def serialize(self):
+        return {"event": {"module": "kitsune.tidings.tests.test_events", "class": "FanOutEvent"}}
+
+
+class FanOutTests(TestCase):
+    def setUp(self):
+        self.users = [UserFactory(email=f"user{n}@example.com") for n in range(3)]
+        for user in self.users:
+            WatchFactory(user=user, event_type=FanOutEvent.event_type)
+        WatchFactory(email="anon@example.com", event_type=FanOutEvent.event_type)
+
+    def _recipients(self):
+        return sorted(email for message in mail.outbox for email in message.to)
+
+    @override_settings(TIDINGS_FANOUT_CHUNK_SIZE=3)
+    def test_fire_in_chunks(self):
+        with mock.patch.object(send_email_chunk, "delay", wraps=send_email_chunk.delay) as delay:
+            FanOutEvent().fire(exclude=[self.users[0]])
+        self.assertEqual(0, delay.call_count)
+        self.assertEqual(
+            ["anon@example.com", "user1@example.com", "user2@example.com"], self._recipients()
+        )
+
+        mail.outbox = []
+        with mock.patch.object(send_email_chunk, "delay", wraps=send_email_chunk.delay) as delay:
+            FanOutEvent().fire()
+        self.assertEqual(2, delay.call_count)
+        self.assertEqual(
+            ["anon@example.com"] + [user.email for user in self.users], self._recipients()
+        )
+
+    def test_chunk_skips_deleted_watches(self):
+        user, other = self.users[:2]
+        watch = Watch.objects.get(user=user)
+        send_email_chunk(
+            FanOutEvent().serialize(),
+            [
+                (user.id, user.email, [watch.id]),
+                (other.id, other.email, [watch.id + 1000]),
+                (None, "anon@example.com", [Watch.objects.get(email="anon@example.com").id]),
+            ],
+        )
+        self.assertEqual(["anon@example.com", user.email], self._recipients())
+
+
+class LocaleEvent(Event):
+    event_type = "locale event"
+    filters = {"locale"}
+
+
+class IsNotifyingTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def test_exact_filters(self):
+        LocaleEvent.notify(self.user, locale="de")
+        self.assertTrue(LocaleEvent.is_notifying(self.user, locale="de"))
+        self.assertFalse(LocaleEvent.is_notifying(self.user, locale="fr"))
+        self.assertFalse(LocaleEvent.is_notifying(self.user))
+        self.assertFalse(FanOutEvent.is_notifying(self.user))
+
+    def test_watches_are_loaded_once(self):
+        LocaleEvent.notify(self.user, locale="de")
+        LocaleEvent.is_notifying(self.user, locale="fr")
+        with self.assertNumQueries(0):
+            self.assertTrue(LocaleEvent.is_notifying(self.user, locale="de"))
+        # Other requests get them from the cache.
+        user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(LocaleEvent.is_notifying(user, locale="de"))
+
+    def test_cache_keys_are_valid(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            LocaleEvent.notify(self.user, locale="de")
+            self.assertTrue(LocaleEvent.is_notifying(self.user, locale="de"))
+
+    def test_changes_are_seen(self):
+        self.assertFalse(LocaleEvent.is_notifying(self.user, locale="de"))
+        LocaleEvent.notify(self.user, locale="de")
+        self.assertTrue(LocaleEvent.is_notifying(self.user, locale="de"))
+
+        user = User.objects.get(id=self.user.id)
+        self.assertTrue(LocaleEvent.is_notifying(user, locale="de"))
+        LocaleEvent.stop_notifying(self.user, locale="de")
+        self.assertFalse(LocaleEvent.is_notifying(self.user, locale="de"))
+        self.assertFalse(LocaleEvent.is_notifying(User.objects.get(id=self.user.id), locale="de"))
@@ -1,5 +1,5 @@
+import hashlib
 import json
-from datetime import timedelta
 from importlib import import_module
 from typing import override
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
@@ -8,12 +8,10 @@ from django.conf import settings
 from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
 from django.contrib.auth.models import Group, Permission, User
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
-from django.db.models import Count, Q
-from django.db.models.functions import Now
 from django.http import Http404, JsonResponse
-from django.utils import timezone
 from django.utils.encoding import force_str
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
@@ -24,13 +22,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from kitsune.access.decorators import group_required, login_required
-from kitsune.questions.models import Answer
-from kitsune.questions.utils import num_answers, num_questions, num_solutions
+from kitsune.questions.contributor_stats import get_stats
+from kitsune.questions.models import ContributorStats
 from kitsune.sumo.api_utils import DateTimeUTCField, OrderingFilter, PermissionMod
 from kitsune.sumo.decorators import json_view
 from kitsune.users.models import Profile, Setting
 from kitsune.users.templatetags.jinja_helpers import profile_avatar
 
+USERNAMES_CACHE_KEY = "users:usernames:{digest}"
+
 
 def display_name_or_none(user):
     try:
@@ -66,12 +66,31 @@ def usernames(request):
     if not request.user.is_authenticated:
         return []
 
-    users = (
+    # The same prefixes are looked up by everyone typing a name, one keystroke after
+    # the other, so the lists are cached for a little while.
+    cache_key = USERNAMES_CACHE_KEY.format(
+        digest=hashlib.sha1(pre.lower().encode("utf-8")).hexdigest()
+    )
+    autocomplete_list = cache.get(cache_key)
+    if autocomplete_list is None:
+        autocomplete_list = _usernames(pre)
+        cache.set(cache_key, autocomplete_list, settings.USERNAMES_AUTOCOMPLETE_TIMEOUT)
+    return autocomplete_list
+
+
+def _usernames(pre):
+    active_users = (
         User.objects.filter(is_active=True)
         .exclude(profile__is_fxa_migrated=False)
-        .filter(Q(username__istartswith=pre) | Q(profile__name__istartswith=pre))
         .select_related("profile")
-    )[:10]
+    )
+    # Usernames and profile names are matched separately, so each query can use the
+    # prefix index on its own table rather than scanning the join of both.
+    users = list(active_users.filter(username__istartswith=pre)[:10])
+    if len(users) < 10:
+        users += active_users.filter(profile__name__istartswith=pre).exclude(
+            id__in=[user.id for user in users]
+        )[: 10 - len(users)]
 
     autocomplete_list = []
     exact_match_in_list = False
@@ -224,17 +243,16 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     def get_question_count(self, profile):
         request = self.context.get("request")
-        return num_questions(profile.user, viewer=request.user if request else None)
+        return get_stats(profile.user).question_count(viewer=request.user if request else None)
 
     def get_answer_count(self, profile):
-        return num_answers(profile.user)
+        return get_stats(profile.user).answers
 
     def get_solution_count(self, profile):
-        return num_solutions(profile.user)
+        return get_stats(profile.user).solutions
 
     def get_last_answer_date(self, profile):
-        last_answer = profile.user.answers.order_by("-created").first()
-        return last_answer.created if last_answer else None
+        return get_stats(profile.user).last_answer_date
 
 
 class ProfileFKSerializer(ProfileSerializer):
@@ -271,42 +289,49 @@ class ProfileViewSet(
 
     number_blacklist = [666, 69]
 
-    # This is routed to /api/2/user/weekly-solutions/
-    def weekly_solutions(self, request, **kwargs):
+    def _top_solvers(self, field):
         """
-        Return the most helpful users in the past week.
+        Return the 10 users with the most solutions in the given ContributorStats
+        window field, along with that count.
         """
-        start = timezone.now() - timedelta(days=7)
-        # Get a list of top 10 users and the number of solutions they have in the last week.
-        # It looks like [{'creator__username': 'bob', 'creator__count': 12}, ...]
         # This uses ``username`` instead of ``id``, because ``username`` appears
         # in the output of ``ProfileFKSerializer``, whereas ``id`` does not.
-        # It also reverse order the dictionary according to amount of solution so that we can get
-        # get top contributors
-        # Use "__range" to ensure the database index is used in Postgres.
         raw_counts = (
-            Answer.objects.exclude(solution_for=None)
-            .filter(created__range=(start, Now()))
-            .values("creator__username")
-            .annotate(Count("creator"))
-            .order_by("creator__count")
-            .reverse()[:10]
+            ContributorStats.objects.filter(**{f"{field}__gt": 0})
+            .order_by(f"-{field}")
+            .values_list("user__username", field)[:10]
         )
 
         # Turn that list into a dictionary from username -> count.
-        username_to_count = {u["creator__username"]: u["creator__count"] for u in raw_counts}
+        username_to_count = dict(raw_counts)
 
         # Get all the profiles mentioned in the above.
-        profiles = Profile.objects.filter(user__username__in=list(username_to_count.keys()))
+        profiles = Profile.objects.filter(
+            user__username__in=list(username_to_count.keys())
+        ).select_related("user")
         result = ProfileFKSerializer(instance=profiles, many=True).data
 
         # Pair up the profiles and the solution counts.
         for u in result:
-            u["weekly_solutions"] = username_to_count[u["username"]]
+            u[field] = username_to_count[u["username"]]
 
-        result.sort(key=lambda u: u["weekly_solutions"], reverse=True)
+        result.sort(key=lambda u: u[field], reverse=True)
         return Response(result)
 
+    # This is routed to /api/2/user/weekly-solutions/
+    def weekly_solutions(self, request, **kwargs):
+        """
+        Return the most helpful users in the past week.
+        """
+        return self._top_solvers("weekly_solutions")
+
+    # This is routed to /api/2/user/monthly-solutions/
+    def monthly_solutions(self, request, **kwargs):
+        """
+        Return the most helpful users in the past month.
+        """
+        return self._top_solvers("monthly_solutions")
+
 
 @group_required("Staff")
 @require_POST
@@ -1,3 +1,4 @@
+import logging
 from datetime import UTC, datetime
 
 from django.contrib.auth import logout
@@ -6,6 +7,9 @@ from django.utils import timezone
 from django.utils.deprecation import MiddlewareMixin
 
 from kitsune.sumo.urlresolvers import reverse
+from kitsune.users.profiles import profile_map
+
+log = logging.getLogger("k.users")
 
 
 class LogoutDeactivatedUsersMiddleware(MiddlewareMixin):
@@ -52,3 +56,19 @@ class LogoutInvalidatedSessionsMiddleware(MiddlewareMixin):
         if change_time and change_time > first_seen:
             logout(request)
             return HttpResponseRedirect(reverse("home"))
+
+
+class ProfileMapMiddleware:
+    """Keeps a map of the user profiles looked up while handling each request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_map() as profiles:
+            response = self.get_response(request)
+        log.debug(
+            f"{request.path}: {len(profiles.profiles)} profiles, "
+            f"{profiles.queries_avoided} profile queries avoided."
+        )
+        return response
@@ -0,0 +1,36 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The indexes are built concurrently, so writes to these big tables aren't blocked
+    # meanwhile, which can't be done in a transaction.
+    atomic = False
+
+    dependencies = [
+        ("users", "0039_remove_profile_csat_email_sent"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="profile",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="text_pattern_ops"
+                ),
+                name="upper_name_prefix_idx",
+            ),
+        ),
+        # The username__istartswith and username__iexact lookups of the username
+        # autocomplete compare UPPER(username), which the unique index on the
+        # username can't help with.
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_upper_username_prefix_idx "
+                "ON auth_user (UPPER(username::text) text_pattern_ops)"
+            ),
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS auth_user_upper_username_prefix_idx",
+        ),
+    ]
@@ -4,6 +4,7 @@ from functools import cached_property
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
 from django.db.models.functions import Upper
 from django.utils import timezone
@@ -147,7 +148,13 @@ class Profile(ModelBase):
     updated_column_name = "user__date_joined"
 
     class Meta:
-        indexes = [models.Index(Upper("name"), name="upper_name_idx")]
+        indexes = [
+            models.Index(Upper("name"), name="upper_name_idx"),
+            # For the name__istartswith lookups of the username autocomplete.
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"), name="upper_name_prefix_idx"
+            ),
+        ]
         permissions = (
             ("view_karma_points", "Can view karma points"),
             ("deactivate_users", "Can deactivate users"),
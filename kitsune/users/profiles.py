@@ -0,0 +1,97 @@
+"""
+A per-request identity map of user profiles.
+
+Templates and serializers show users through helpers like display_name() and
+profile_avatar(), one user at a time. Each User instance loads its own profile, so a
+page listing fifty questions or answers loads fifty profiles one by one, and loads
+the profile of the same user as many times as they appear on it.
+
+Within a request, ProfileMapMiddleware keeps a ProfileMap. Views hand the users of a
+page to prefetch_profiles(), which loads their profiles in one query. get_profile()
+looks up any other user's profile once per request. Either way, the profile is
+attached to every User instance it's asked for, so ``user.profile`` costs nothing
+afterwards.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db.models import prefetch_related_objects
+
+from kitsune.users.models import Profile
+
+_active_profile_map = ContextVar("profile_map", default=None)
+
+
+def _attach(user, profile):
+    User.profile.related.set_cached_value(user, profile)
+    if profile is not None:
+        Profile.user.field.set_cached_value(profile, user)
+
+
+class ProfileMap:
+    """The profiles of the users seen in a request, by user id."""
+
+    def __init__(self):
+        self.profiles = {}
+        # How many profile lookups were answered without a query.
+        self.queries_avoided = 0
+
+    def load(self, user_ids):
+        """Load the profiles of the users not seen yet in one query."""
+        missing = set(user_ids) - self.profiles.keys()
+        missing.discard(None)
+        if missing:
+            self.profiles.update(dict.fromkeys(missing))
+            self.profiles.update(
+                (profile.user_id, profile)
+                for profile in Profile.all_profiles.filter(user_id__in=missing)
+            )
+
+    def get(self, user):
+        if user.id in self.profiles:
+            self.queries_avoided += 1
+        else:
+            self.load([user.id])
+        profile = self.profiles[user.id]
+        _attach(user, profile)
+        return profile
+
+
+@contextmanager
+def profile_map():
+    """Share one ProfileMap between all the profile lookups within the block."""
+    profiles = ProfileMap()
+    token = _active_profile_map.set(profiles)
+    try:
+        yield profiles
+    finally:
+        _active_profile_map.reset(token)
+
+
+def get_profile(user):
+    """Return the profile of the user, or None if there isn't one."""
+    if getattr(user, "id", None) is None:
+        return None
+    if User.profile.related.is_cached(user):
+        return User.profile.related.get_cached_value(user)
+    if profiles := _active_profile_map.get():
+        return profiles.get(user)
+    try:
+        return user.profile
+    except Profile.DoesNotExist:
+        return None
+
+
+def prefetch_profiles(users):
+    """Load the profiles of the users, which may include None, in one query."""
+    users = [user for user in users if getattr(user, "id", None) is not None]
+    profiles = _active_profile_map.get()
+    if profiles is None:
+        prefetch_related_objects(users, "profile")
+        return
+
+    profiles.load(user.id for user in users)
+    for user in users:
+        _attach(user, profiles.profiles[user.id])
@@ -6,16 +6,17 @@ from markupsafe import Markup, escape
 from kitsune.sumo.templatetags.jinja_helpers import urlparams
 from kitsune.sumo.urlresolvers import reverse
 from kitsune.sumo.utils import webpack_static
+from kitsune.users import profiles
 from kitsune.users.models import Profile
 from kitsune.users.utils import user_is_contributor
 
 
 @library.global_function
 def get_profile(user):
-    try:
-        return Profile.objects.get(user_id=user.id)
-    except Profile.DoesNotExist:
+    profile = profiles.get_profile(user)
+    if profile is None or profile.account_type == Profile.AccountType.SYSTEM:
         return None
+    return profile
 
 
 @library.global_function
@@ -29,21 +30,16 @@ def profile_url(user, edit=False):
 @library.global_function
 def profile_avatar(user, size=200):
     """Return a URL to the user's avatar."""
-    try:  # This is mostly for tests.
-        profile = user.profile
-    except (Profile.DoesNotExist, AttributeError):
+    profile = profiles.get_profile(user)
+    if profile is None:
         return webpack_static(settings.DEFAULT_AVATAR)
-    else:
-        return profile.fxa_avatar or webpack_static(settings.DEFAULT_AVATAR)
+    return profile.fxa_avatar or webpack_static(settings.DEFAULT_AVATAR)
 
 
 @library.global_function
 def display_name(user):
     """Return a display name if set, else the username."""
-    try:  # Also mostly for tests.
-        profile = user.profile
-    except (Profile.DoesNotExist, AttributeError):
-        return user.username
+    profile = profiles.get_profile(user)
     return profile.display_name if profile else user.username
 
 
@@ -63,6 +59,8 @@ def unicode_to_html(text):
 def user_list(users):
     """Turn a list of users into a list of links to their profiles."""
     link = '<a class="user secondary-color" rel="nofollow" href="%s">%s</a>'
+    users = list(users)
+    profiles.prefetch_profiles(users)
     result_list = ", ".join(
         [link % (escape(profile_url(u)), escape(display_name(u))) for u in users]
     )
@@ -57,6 +57,19 @@ class UsernamesTests(TestCase):
         data = json.loads(res.content)
         self.assertEqual(1, len(data))
 
+    def test_exact_match_is_included(self):
+        for i in range(12):
+            UserFactory(username=f"ringo{i}")
+        UserFactory(username="Ringo")
+        res = self.client.get(urlparams(self.url, term="ringo"))
+        self.assertIn("Ringo", [d["username"] for d in json.loads(res.content)])
+
+    def test_results_are_cached(self):
+        self.client.get(urlparams(self.url, term="test"))
+        UserFactory(username="testUser2")
+        res = self.client.get(urlparams(self.url, term="TEST"))
+        self.assertEqual(["testUser"], [d["username"] for d in json.loads(res.content)])
+
     def test_post(self):
         res = self.client.post(self.url)
         self.assertEqual(405, res.status_code)
@@ -163,6 +176,16 @@ class TestUserView(TestCase):
         top_ten = user_info_list[:10]
         self.assertEqual(sorted(top_ten), sorted(data_list))
 
+    def test_monthly_solutions(self):
+        eight_days_ago = timezone.now() - timedelta(days=8)
+        solution = SolutionAnswerFactory(created=eight_days_ago)
+        res = self.client.get(reverse("user-monthly-solutions"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [(solution.creator.username, 1)],
+            [(data["username"], data["monthly_solutions"]) for data in res.data],
+        )
+
     def test_email_visible_when_signed_in(self):
         p = ProfileFactory()
         url = reverse("user-detail", args=[p.user.username])
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+
+from kitsune.sumo.tests import TestCase
+from kitsune.users.profiles import get_profile, prefetch_profiles, profile_map
+from kitsune.users.tests import UserFactory
+
+
+class ProfileMapTests(TestCase):
+    def setUp(self):
+        self.user_ids = [UserFactory().id for _ in range(3)]
+        self.no_profile = UserFactory(profile=None)
+
+    def _users(self):
+        return list(User.objects.filter(id__in=self.user_ids).order_by("id"))
+
+    def test_prefetch_profiles(self):
+        users = self._users()
+        with profile_map():
+            with self.assertNumQueries(1):
+                prefetch_profiles([*users, None, self.no_profile])
+            with self.assertNumQueries(0):
+                self.assertEqual([u.id for u in users], [u.profile.user_id for u in users])
+                self.assertIsNone(get_profile(self.no_profile))
+
+    def test_profiles_are_loaded_once_per_request(self):
+        with profile_map() as profiles:
+            with self.assertNumQueries(1):
+                get_profile(self._users()[0])
+            # Another instance of the same user.
+            users = self._users()
+            with self.assertNumQueries(0):
+                self.assertEqual(users[0].id, get_profile(users[0]).user_id)
+            self.assertEqual(1, profiles.queries_avoided)
+
+    def test_without_a_profile_map(self):
+        users = self._users()
+        with self.assertNumQueries(1):
+            prefetch_profiles(users)
+        with self.assertNumQueries(0):
+            get_profile(users[0])
@@ -14,5 +14,10 @@ urlpatterns = [
         api.ProfileViewSet.as_view({"get": "weekly_solutions"}),
         name="user-weekly-solutions",
     ),
+    re_path(
+        "^2/user/monthly-solutions",
+        api.ProfileViewSet.as_view({"get": "monthly_solutions"}),
+        name="user-monthly-solutions",
+    ),
     re_path("^2/", include(router.urls)),
 ]
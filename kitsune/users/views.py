@@ -48,7 +48,8 @@ from kitsune.forums.models import Post, Thread
 from kitsune.kbadge.models import Award
 from kitsune.kbforums.models import Post as KBForumPost
 from kitsune.kbforums.models import Thread as KBForumThread
-from kitsune.questions.utils import mark_content_as_spam, num_answers, num_questions, num_solutions
+from kitsune.questions.contributor_stats import get_stats
+from kitsune.questions.utils import mark_content_as_spam
 from kitsune.sumo.templatetags.jinja_helpers import urlparams
 from kitsune.sumo.urlresolvers import reverse
 from kitsune.sumo.utils import get_next_url, paginate, simple_paginate
@@ -143,14 +144,15 @@ def profile(request, username):
             raise Http404("No Profile matches the given query.")
 
         groups = user_profile.visible_group_profiles(request.user)
+        stats = get_stats(user_profile.user)
         ctx.update(
             {
                 "profile": user_profile,
                 "awards": Award.objects.filter(user=user_profile.user),
                 "groups": groups,
-                "num_questions": num_questions(user_profile.user, viewer=request.user),
-                "num_answers": num_answers(user_profile.user),
-                "num_solutions": num_solutions(user_profile.user),
+                "num_questions": stats.question_count(viewer=request.user),
+                "num_answers": stats.answers,
+                "num_solutions": stats.solutions,
                 "num_documents": (
                     user_documents(user_profile.user, viewer=request.user).count()
                     + num_deleted_contributions(Document, contributor=user_profile.user)
@@ -8,6 +8,8 @@ class WikiConfig(AppConfig):
     def ready(self):
         import kitsune.wiki.signals  # noqa
         from kitsune.wiki.badges import register_signals
+        from kitsune.wiki.vote_history import register_signals as register_vote_history_signals
 
         # register signals for badges
         register_signals()
+        register_vote_history_signals()
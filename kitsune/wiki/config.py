@@ -110,6 +110,8 @@ REDIRECT_SLUG = _lazy("%(old)s-redirect-%(number)i")
 
 # Template for the cache key of the full article html.
 DOC_HTML_CACHE_KEY = "doc_html:{locale}:{slug}"
+# Template for the cache key of the version of an article's cached page fragments.
+DOC_FRAGMENT_VERSION_CACHE_KEY = "doc_fragment_version:{id}"
 
 SIMPLE_WIKI_LANDING_PAGE_SLUG = "frequently-asked-questions"
 
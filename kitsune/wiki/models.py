@@ -3,13 +3,14 @@ import logging
 from datetime import timedelta
 from typing import override
 from urllib.parse import urlparse
+from uuid import uuid4
 
 import waffle
 from django.conf import settings
 from django.contrib.auth.models import Group, User
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError, models
+from django.db import IntegrityError, models, transaction
 from django.db.models import Q, Value
 from django.db.models.functions import Now
 from django.urls import is_valid_path
@@ -34,6 +35,7 @@ from kitsune.wiki.config import (
     ADMINISTRATION_CATEGORY,
     CANNED_RESPONSES_CATEGORY,
     CATEGORIES,
+    DOC_FRAGMENT_VERSION_CACHE_KEY,
     DOC_HTML_CACHE_KEY,
     MAJOR_SIGNIFICANCE,
     MEDIUM_SIGNIFICANCE,
@@ -719,8 +721,29 @@ class Document(NotificationsMixin, ModelBase, DocumentPermissionMixin):
             pass
 
     def clear_cached_html(self):
-        # Clear out both mobile and desktop templates.
-        cache.delete(doc_html_cache_key(self.locale, self.slug))
+        html_key = doc_html_cache_key(self.locale, self.slug)
+        version_key = DOC_FRAGMENT_VERSION_CACHE_KEY.format(id=self.id)
+
+        def clear():
+            # Clear out both mobile and desktop templates.
+            cache.delete(html_key)
+            # Start a new version of the page fragments cached for logged-in users.
+            cache.set(version_key, uuid4().hex, None)
+
+        clear()
+        # Pages rendered in between, before the change is committed, cached the old
+        # content under the new version, so clear it once more after the commit.
+        transaction.on_commit(clear)
+
+    @property
+    def fragment_cache_version(self):
+        """
+        An opaque version for the fragments of this document's page which are cached
+        across users. It changes whenever the cached html is cleared.
+        """
+        return cache.get_or_set(
+            DOC_FRAGMENT_VERSION_CACHE_KEY.format(id=self.id), uuid4().hex, None
+        )
 
     def is_visible_for(self, user, use_cache=True):
         """
@@ -1,4 +1,9 @@
+import logging
 import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from itertools import count
 from xml.sax.saxutils import quoteattr
 
@@ -17,7 +22,7 @@ from wikimarkup.parser import ALLOWED_TAGS
 
 from kitsune.gallery.models import Image
 from kitsune.sumo import parser as sumo_parser
-from kitsune.sumo.parser import ALLOWED_ATTRIBUTES, ALLOWED_STYLES, get_object_fallback
+from kitsune.sumo.parser import ALLOWED_ATTRIBUTES, ALLOWED_STYLES, split_link
 from kitsune.sumo.sanitize import clean
 from kitsune.wiki.models import Document
 
@@ -50,6 +55,8 @@ BLOCK_LEVEL_ELEMENTS = [
 ]
 TEMPLATE_ARG_REGEX = re.compile("{{{([^{]+?)}}}")
 
+log = logging.getLogger("k.wiki")
+
 
 def wiki_to_html(
     wiki_markup,
@@ -379,6 +386,86 @@ class ForParser:
 RECURSION_MESSAGE = _lazy('[Recursive inclusion of "%s"]')
 
 
+@dataclass
+class InclusionTiming:
+    """How often a template or include was needed, and how long parsing it took."""
+
+    title: str
+    parses: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
+class TemplateMemo:
+    """The documents and parsed bodies of templates and includes, shared by parses.
+
+    Each parse gets a memo of its own, so a template used twice in a document is
+    only fetched and parsed once. Within `memoize_templates()`, every parse shares
+    one memo, so a run over many documents parses each popular template only once.
+    Parsed bodies are keyed by the current revision of the included document, but
+    documents are looked up only once per memo, so keep a shared memo to one run.
+    The documents and images that links refer to are kept with them, in `documents`.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.bodies = {}
+        self.dehydrations = {}
+        self.timings = {}
+
+    def strip_fors(self, text):
+        """Memoized ForParser.strip_fors()."""
+        if text not in self.dehydrations:
+            self.dehydrations[text] = ForParser.strip_fors(text)
+        return self.dehydrations[text]
+
+    def record_timing(self, document, seconds=None):
+        """Record a parse of an inclusion, or a memo hit if it took no parse."""
+        timing = self.timings.setdefault(document.id, InclusionTiming(document.title))
+        if seconds is None:
+            timing.hits += 1
+        else:
+            timing.parses += 1
+            timing.seconds += seconds
+
+    def log_timings(self, limit=10):
+        """Log the inclusions which took the longest to parse."""
+        slowest = sorted(self.timings.items(), key=lambda item: item[1].seconds, reverse=True)
+        for doc_id, timing in slowest[:limit]:
+            log.info(
+                f"Parsed {timing.title!r} ({doc_id}) {timing.parses} times in "
+                f"{timing.seconds:.3f}s, reused it {timing.hits} times."
+            )
+
+
+_active_template_memo = ContextVar("template_memo", default=None)
+
+
+@contextmanager
+def memoize_templates():
+    """Share one TemplateMemo between all the wiki parses within the block."""
+    memo = TemplateMemo()
+    token = _active_template_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _active_template_memo.reset(token)
+
+
+@dataclass
+class _InclusionFrame:
+    """What the memo entry of an inclusion being parsed must know."""
+
+    # Side effects of the parse, as (method name, args), to replay on reuse.
+    effects: list = field(default_factory=list)
+    # Every document included along the way, which must not be among the
+    # documents including it wherever it's reused.
+    included: set = field(default_factory=set)
+    # The output of a parse that hit a recursive inclusion depends on which
+    # documents included it, so it can't be reused elsewhere.
+    reusable: bool = True
+
+
 class WikiParser(sumo_parser.WikiParser):
     """An extension of the parser from the forums adding more crazy features
 
@@ -400,6 +487,10 @@ class WikiParser(sumo_parser.WikiParser):
         # Stack of document IDs to prevent include/template recursion.
         self.inclusions = [doc_id] if doc_id else []
 
+        # Stack of the inclusions being parsed, innermost last.
+        self._inclusion_frames = []
+        self.memo = TemplateMemo()
+
         # The wiki has additional hooks not used elsewhere
         self.registerInternalLinkHook("Include", self._hook_include)
         self.registerInternalLinkHook("I", self._hook_include)
@@ -408,9 +499,13 @@ class WikiParser(sumo_parser.WikiParser):
 
     def parse(self, text, **kwargs):
         """Wrap SUMO's parse() to support additional wiki-only features."""
+        if not self._inclusion_frames:
+            # Each top-level parse starts from a fresh memo, unless it's part of a run.
+            memo = _active_template_memo.get()
+            self.memo = TemplateMemo() if memo is None else memo
 
         # Replace fors with inline tokens the wiki formatter will tolerate:
-        text, data = ForParser.strip_fors(text)
+        text, data = self.memo.strip_fors(text)
 
         # Do simple substitutions:
         text = parse_simple_syntax(text)
@@ -462,10 +557,78 @@ class WikiParser(sumo_parser.WikiParser):
             set(include_doc.original.restrict_to_groups.values_list("pk", flat=True))
         )
 
+    def _object_memo(self):
+        """Keep the objects looked up in the memo, so they're looked up once per memo."""
+        return self.memo.documents
+
+    def _link_lookup(self, space, name):
+        if space in ("Include", "I"):
+            return (Document, name, {})
+        if space in ("Template", "T"):
+            return (Document, "Template:" + name.split("|")[0], {"is_template": True})
+        return super()._link_lookup(space, name)
+
+    def _get_inclusion(self, title, **kwargs):
+        """Return the document to include for a title, looking it up once per memo."""
+        return self._get_object(Document, title, **kwargs)
+
+    def _record(self, effect, *args):
+        """Call the named side effect of parsing, e.g. recording a link, so that it
+        is replayed whenever the memoized inclusions that led to it are reused."""
+        if self._inclusion_frames:
+            self._inclusion_frames[-1].effects.append((effect, args))
+        getattr(self, effect)(*args)
+
+    def _recursion(self, title):
+        for frame in self._inclusion_frames:
+            frame.reusable = False
+        return RECURSION_MESSAGE % title
+
+    def _parse_inclusion(self, parser, include, parse):
+        """Return the parsed body of an included document, from the memo if possible."""
+        key = (
+            type(self),
+            include.id,
+            include.current_revision_id,
+            self.locale,
+            translation.get_language(),
+            frozenset(self.restrict_to_group_ids),
+        )
+        entry = self.memo.bodies.get(key)
+        if entry is not None and entry[2].isdisjoint(parser.inclusions):
+            html, effects, included = entry
+            for effect, args in effects:
+                self._record(effect, *args)
+            if self._inclusion_frames:
+                self._inclusion_frames[-1].included.update(included)
+            self.memo.record_timing(include)
+            return html
+
+        frame = _InclusionFrame()
+        self._inclusion_frames.append(frame)
+        parser.inclusions.append(include.id)
+        start = time.monotonic()
+        try:
+            html = parse()
+        finally:
+            parser.inclusions.pop()
+            self._inclusion_frames.pop()
+        self.memo.record_timing(include, time.monotonic() - start)
+
+        frame.included.add(include.id)
+        if frame.reusable:
+            self.memo.bodies[key] = (html, tuple(frame.effects), frozenset(frame.included))
+        if self._inclusion_frames:
+            outer = self._inclusion_frames[-1]
+            outer.effects.extend(frame.effects)
+            outer.included.update(frame.included)
+            outer.reusable = outer.reusable and frame.reusable
+        return html
+
     def _hook_include(self, parser, space, title):
         """Returns the document's parsed content."""
         message = _('The document "%s" does not exist.') % title
-        include = get_object_fallback(Document, title, locale=self.locale)
+        include = self._get_inclusion(title)
         if not include or not include.current_revision:
             return message
 
@@ -473,13 +636,15 @@ class WikiParser(sumo_parser.WikiParser):
             return message
 
         if include.id in parser.inclusions:
-            return RECURSION_MESSAGE % title
-        else:
-            parser.inclusions.append(include.id)
-        ret = parser.parse(include.current_revision.content, show_toc=False, locale=self.locale)
-        parser.inclusions.pop()
-
-        return ret
+            return self._recursion(title)
+
+        return self._parse_inclusion(
+            parser,
+            include,
+            lambda: parser.parse(
+                include.current_revision.content, show_toc=False, locale=self.locale
+            ),
+        )
 
     # Wiki templates are documents that receive arguments.
     #
@@ -495,9 +660,7 @@ class WikiParser(sumo_parser.WikiParser):
         template_title = "Template:" + short_title
 
         message = _('The template "%s" does not exist or has no approved revision.') % short_title
-        template = get_object_fallback(
-            Document, template_title, locale=self.locale, is_template=True
-        )
+        template = self._get_inclusion(template_title, is_template=True)
 
         if not template or not template.current_revision:
             return message
@@ -506,19 +669,24 @@ class WikiParser(sumo_parser.WikiParser):
             return message
 
         if template.id in parser.inclusions:
-            return RECURSION_MESSAGE % template_title
-        else:
-            parser.inclusions.append(template.id)
-        c = template.current_revision.content.rstrip()
-        # Note: this completely ignores the allowed attributes passed to the
-        # WikiParser.parse() method and defaults to ALLOWED_ATTRIBUTES.
-        parsed = parser.parse(c, show_toc=False, attributes=ALLOWED_ATTRIBUTES, locale=self.locale)
-        parser.inclusions.pop()
-
-        # Special case for inline templates
-        if "\n" not in c:
-            parsed = parsed.replace("<p>", "")
-            parsed = parsed.replace("</p>", "")
+            return self._recursion(template_title)
+
+        def parse():
+            c = template.current_revision.content.rstrip()
+            # Note: this completely ignores the allowed attributes passed to the
+            # WikiParser.parse() method and defaults to ALLOWED_ATTRIBUTES.
+            parsed = parser.parse(
+                c, show_toc=False, attributes=ALLOWED_ATTRIBUTES, locale=self.locale
+            )
+
+            # Special case for inline templates
+            if "\n" not in c:
+                parsed = parsed.replace("<p>", "")
+                parsed = parsed.replace("</p>", "")
+            return parsed
+
+        # The parameters are filled in after parsing, so the memo works for all of them.
+        parsed = self._parse_inclusion(parser, template, parse)
         # Do some string formatting to replace parameters
         return _format_template_content(parsed, _build_template_params(params))
 
@@ -528,50 +696,67 @@ class WhatLinksHereParser(WikiParser):
 
     def __init__(self, doc_id, **kwargs):
         self.current_doc = Document.objects.get(pk=doc_id)
+        # The links and images already recorded, so replays don't repeat them.
+        self._recorded = set()
         super().__init__(doc_id=doc_id, **kwargs)
 
-    def _hook_internal_link(self, parser, space, name):
-        """Records links between documents, and then calls super()."""
+    def _add_link_to(self, linked_doc, kind):
+        if ("link", linked_doc.id, kind) not in self._recorded:
+            self._recorded.add(("link", linked_doc.id, kind))
+            self.current_doc.add_link_to(linked_doc, kind)
+
+    def _add_image(self, image):
+        if ("image", image.id) not in self._recorded:
+            self._recorded.add(("image", image.id))
+            self.current_doc.add_image(image)
 
+    @staticmethod
+    def _normalize_link(name):
         title, *rest = map(str.strip, name.split("|"))
         title = re.sub(r"\s+", " ", title)
-        locale = self.current_doc.locale
         link_text = rest[0] if rest else ""
-        name = f"{title}|{link_text}" if link_text else title
+        return f"{title}|{link_text}" if link_text else title
+
+    def _link_lookup(self, space, name):
+        if space is None:
+            name = self._normalize_link(name)
+        return super()._link_lookup(space, name)
 
-        linked_doc = get_object_fallback(Document, title, locale)
+    def _hook_internal_link(self, parser, space, name):
+        """Records links between documents, and then calls super()."""
+        name = self._normalize_link(name)
+        title, _text, _hash = split_link(name)
+
+        linked_doc = self._get_object(Document, title, is_template=False) if title else None
         if linked_doc is not None:
-            self.current_doc.add_link_to(linked_doc, "link")
+            self._record("_add_link_to", linked_doc, "link")
         return super()._hook_internal_link(parser, space, name)
 
     def _hook_template(self, parser, space, name):
         """Record a template link between documents, and then call super()."""
 
         params = name.split("|")
-        template = get_object_fallback(
-            Document, "Template:" + params[0], locale=self.locale, is_template=True
-        )
+        template = self._get_inclusion("Template:" + params[0], is_template=True)
 
         if template:
-            self.current_doc.add_link_to(template, "template")
+            self._record("_add_link_to", template, "template")
 
         return super()._hook_template(parser, space, name)
 
     def _hook_include(self, parser, space, name):
         """Record an include link between documents, and then call super()."""
-        include = get_object_fallback(Document, name, locale=self.locale)
+        include = self._get_inclusion(name)
 
         if include:
-            self.current_doc.add_link_to(include, "include")
+            self._record("_add_link_to", include, "include")
 
         return super()._hook_include(parser, space, name)
 
     def _hook_image_tag(self, parser, space, name):
         """Record an image is included in a document, then call super()."""
-        title = name.split("|")[0]
-        image = get_object_fallback(Image, title, self.locale)
+        image = self._get_object(Image, name.split("|")[0].strip())
 
         if image:
-            self.current_doc.add_image(image)
+            self._record("_add_image", image)
 
         return super()._hook_image_tag(parser, space, name)
@@ -1,4 +1,5 @@
 import logging
+from collections import Counter, deque
 from datetime import date, datetime, timedelta
 from itertools import batched, chain
 
@@ -35,6 +36,7 @@ from kitsune.wiki.config import (
 )
 from kitsune.wiki.models import (
     Document,
+    DocumentLink,
     Locale,
     Revision,
     RevisionAnchorRecord,
@@ -43,6 +45,7 @@ from kitsune.wiki.models import (
     TitleCollision,
     resolves_to_document_view,
 )
+from kitsune.wiki.parser import memoize_templates
 from kitsune.wiki.utils import generate_short_url
 
 log = logging.getLogger("k.task")
@@ -297,38 +300,40 @@ def _rebuild_kb_chunk(data: list[int]) -> None:
     log.info(f"Rebuilding {len(data)} documents.")
 
     messages = []
-    for pk in data:
-        message = None
-        try:
-            document = Document.objects.get(pk=pk)
-
-            # If we know a redirect link to be broken (i.e. if it looks like a
-            # link to a document but the document isn't there), log an error:
-            url = document.redirect_url()
-            if url and resolves_to_document_view(url) and not document.redirect_document():
-                log.warning(f"Invalid redirect document: {pk}")
-
-            html = document.parse_and_calculate_links()
-            if document.html != html:
-                # We are calling update here to so we only update the html
-                # column instead of all of them. This bypasses post_save
-                # signal handlers like the one that triggers reindexing.
-                # See bug 797038 and bug 797352.
-                Document.objects.filter(pk=pk).update(html=html)
-        except Document.DoesNotExist:
-            message = "Missing document: %d" % pk
-        except Revision.DoesNotExist:
-            message = "Missing revision for document: %d" % pk
-        except ValidationError as e:
-            message = "ValidationError for %d: %s" % (pk, e.messages[0])
-        except SlugCollision:
-            message = "SlugCollision: %d" % pk
-        except TitleCollision:
-            message = "TitleCollision: %d" % pk
-
-        if message:
-            log.debug(message)
-            messages.append(message)
+    with memoize_templates() as memo:
+        for pk in data:
+            message = None
+            try:
+                document = Document.objects.get(pk=pk)
+
+                # If we know a redirect link to be broken (i.e. if it looks like a
+                # link to a document but the document isn't there), log an error:
+                url = document.redirect_url()
+                if url and resolves_to_document_view(url) and not document.redirect_document():
+                    log.warning(f"Invalid redirect document: {pk}")
+
+                html = document.parse_and_calculate_links()
+                if document.html != html:
+                    # We are calling update here to so we only update the html
+                    # column instead of all of them. This bypasses post_save
+                    # signal handlers like the one that triggers reindexing.
+                    # See bug 797038 and bug 797352.
+                    Document.objects.filter(pk=pk).update(html=html)
+            except Document.DoesNotExist:
+                message = "Missing document: %d" % pk
+            except Revision.DoesNotExist:
+                message = "Missing revision for document: %d" % pk
+            except ValidationError as e:
+                message = "ValidationError for %d: %s" % (pk, e.messages[0])
+            except SlugCollision:
+                message = "SlugCollision: %d" % pk
+            except TitleCollision:
+                message = "TitleCollision: %d" % pk
+
+            if message:
+                log.debug(message)
+                messages.append(message)
+    memo.log_timings()
 
     if messages:
         subject = "[{}] Exceptions raised in _rebuild_kb_chunk()".format(settings.PLATFORM_NAME)
@@ -410,38 +415,83 @@ def maybe_award_badge(badge_template: dict, year: int, user_id: int) -> bool:
         return False
 
 
+def _cascade_order(base_doc_id: int) -> list[int]:
+    """Return a document and every document that includes it, directly or otherwise.
+
+    This walks the graph of links between documents one level at a time, with a
+    single query per level. If a document A includes another document B as a
+    template, then there is an edge from B to A in this graph. The result is in
+    topological order, so every document comes after the documents it includes;
+    documents which include each other in a cycle come last.
+    """
+    includers: dict[int, set[int]] = {}
+    affected = {base_doc_id}
+    frontier = {base_doc_id}
+    while frontier:
+        edges = DocumentLink.objects.filter(
+            linked_to_id__in=frontier, kind__in=["template", "include"]
+        ).values_list("linked_to_id", "linked_from_id")
+        frontier = set()
+        for included_id, includer_id in edges:
+            includers.setdefault(included_id, set()).add(includer_id)
+            if includer_id not in affected:
+                affected.add(includer_id)
+                frontier.add(includer_id)
+
+    in_degree = Counter(chain.from_iterable(includers.values()))
+    # The changed document goes first, even when it's part of a cycle.
+    in_degree.pop(base_doc_id, None)
+    order = []
+    ready = deque([base_doc_id])
+    while ready:
+        doc_id = ready.popleft()
+        order.append(doc_id)
+        for includer_id in sorted(includers.get(doc_id, ())):
+            if includer_id not in in_degree:
+                continue
+            in_degree[includer_id] -= 1
+            if not in_degree[includer_id]:
+                del in_degree[includer_id]
+                ready.append(includer_id)
+
+    return order + sorted(in_degree)
+
+
 @shared_task
 @skip_if_read_only_mode
 def render_document_cascade(base_doc_id):
     """Given a document, render it and all documents that may be affected."""
+    if not Document.objects.filter(id=base_doc_id).exists():
+        capture_exception(Document.DoesNotExist(f"Document {base_doc_id} does not exist."))
+        return
 
-    # This walks along the graph of links between documents. If there is
-    # a document A that includes another document B as a template, then
-    # there is an edge from A to B in this graph. The goal here is to
-    # process every node exactly once. This is robust to cycles and
-    # diamonds in the graph, since it keeps track of what nodes have
-    # been visited already.
+    # The parser reads the source of included documents rather than their stored
+    # html, so the chunks don't depend on each other and can be rendered in parallel.
+    # Keeping them in topological order just refreshes the closest documents first.
+    order = _cascade_order(base_doc_id)
+    log.info(f"Rendering a cascade of {len(order)} documents from {base_doc_id}.")
+    for chunk in batched(order, 50, strict=False):
+        _render_cascade_chunk.delay(list(chunk))
 
-    try:
-        base_doc = Document.objects.get(id=base_doc_id)
-    except Document.DoesNotExist as err:
-        capture_exception(err)
-        return
-    todo = {base_doc}
-    done = set()
 
-    while todo:
-        d = todo.pop()
-        if d in done:
-            # Don't process a node twice.
-            continue
-        d.html = d.parse_and_calculate_links()
-        d.save()
-        done.add(d)
-        todo.update(
-            link_to.linked_from
-            for link_to in d.links_to().filter(kind__in=["template", "include"])
-        )
+@shared_task
+@skip_if_read_only_mode
+def _render_cascade_chunk(document_ids: list[int]) -> None:
+    """Re-render a chunk of a cascade, saving only the documents whose html changed."""
+    documents = Document.objects.select_related("current_revision").in_bulk(document_ids)
+    with memoize_templates() as memo:
+        for doc_id in document_ids:
+            document = documents.get(doc_id)
+            if document is None:
+                # Deleted since the cascade was planned.
+                continue
+            html = document.parse_and_calculate_links()
+            if html == document.html:
+                # Unchanged html needs no save, and no re-indexing or cache busting either.
+                continue
+            document.html = html
+            document.save()
+    memo.log_timings()
 
 
 @shared_task_with_retry
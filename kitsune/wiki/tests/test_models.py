@@ -62,6 +62,26 @@ class DocumentTests(TestCase):
 
         assert not d.is_template
 
+    def test_fragment_cache_version_changes_with_the_cached_html(self):
+        d = DocumentFactory()
+        version = d.fragment_cache_version
+        self.assertEqual(version, d.fragment_cache_version)
+
+        d.clear_cached_html()
+        self.assertNotEqual(version, d.fragment_cache_version)
+
+        version = d.fragment_cache_version
+        d.save()
+        self.assertNotEqual(version, d.fragment_cache_version)
+
+    def test_fragment_cache_version_changes_again_on_commit(self):
+        d = DocumentFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            d.clear_cached_html()
+            # Cached by a page rendered before the commit.
+            version = d.fragment_cache_version
+        self.assertNotEqual(version, d.fragment_cache_version)
+
     def test_delete_tagged_document(self):
         """Make sure deleting a tagged doc deletes its tag relationships."""
         # TODO: Move to wherever the tests for TaggableMixin are.
@@ -10,7 +10,14 @@ from kitsune.sumo.tests import TestCase
 from kitsune.users.tests import GroupFactory
 from kitsune.wiki.config import TEMPLATE_TITLE_PREFIX, TEMPLATES_CATEGORY
 from kitsune.wiki.models import Document
-from kitsune.wiki.parser import PATTERNS, RECURSION_MESSAGE, ForParser, WikiParser, _key_split
+from kitsune.wiki.parser import (
+    PATTERNS,
+    RECURSION_MESSAGE,
+    ForParser,
+    WikiParser,
+    _key_split,
+    memoize_templates,
+)
 from kitsune.wiki.parser import _build_template_params as _btp
 from kitsune.wiki.parser import _format_template_content as _ftc
 from kitsune.wiki.tests import (
@@ -593,6 +600,72 @@ class TestWikiTemplateRestricted(TestCase):
         self.assertIn("Secret template content", doc.text())
 
 
+class TestTemplateMemo(TestCase):
+    def test_template_parsed_once_per_document(self):
+        """A template used with different params is parsed once and reused."""
+        _, _, p = doc_rev_parser(
+            "{{{1}}} and {{{2}}}",
+            TEMPLATE_TITLE_PREFIX + "Pair",
+            category=TEMPLATES_CATEGORY,
+        )
+        html = p.parse("[[T:Pair|a|b]] [[T:Pair|c|d]]")
+
+        self.assertEqual("a and b c and d", pq(html).text())
+        (timing,) = p.memo.timings.values()
+        self.assertEqual((timing.parses, timing.hits), (1, 1))
+
+    def test_memo_is_shared_within_a_run(self):
+        doc_rev_parser("Shared content", "Shared")
+
+        with memoize_templates() as memo:
+            for _ in range(3):
+                self.assertEqual("Shared content", pq(WikiParser().parse("[[I:Shared]]")).text())
+
+        (timing,) = memo.timings.values()
+        self.assertEqual((timing.parses, timing.hits), (1, 2))
+
+    def test_memo_is_not_shared_outside_a_run(self):
+        d, _, p = doc_rev_parser("English content", "Test title")
+        self.assertEqual("English content", pq(p.parse("[[I:Test title]]")).text())
+
+        ApprovedRevisionFactory(document=d, content="New")
+        self.assertEqual("New", pq(p.parse("[[I:Test title]]")).text())
+
+    def test_memo_respects_recursion(self):
+        """A memoized body isn't reused where something it includes is an ancestor."""
+        doc_rev_parser("Outer [[I:Inner]]", "Outer")
+        inner, _, _ = doc_rev_parser("Inner", "Inner")
+        expected = WikiParser(doc_id=inner.id).parse("[[I:Outer]]")
+
+        with memoize_templates():
+            WikiParser().parse("[[I:Outer]]")
+            self.assertEqual(expected, WikiParser(doc_id=inner.id).parse("[[I:Outer]]"))
+        self.assertIn(str(RECURSION_MESSAGE % "Inner"), expected)
+
+    def test_memo_replays_links(self):
+        """Links recorded while parsing a template are recorded again on reuse."""
+        doc_rev_parser("leaf", TEMPLATE_TITLE_PREFIX + "Leaf", category=TEMPLATES_CATEGORY)
+        branch, _, _ = doc_rev_parser(
+            "[[T:Leaf]] branch", TEMPLATE_TITLE_PREFIX + "Branch", category=TEMPLATES_CATEGORY
+        )
+        d1, _, _ = doc_rev_parser("[[T:Branch]] one", "One")
+        d2, _, _ = doc_rev_parser("[[T:Branch]] two", "Two")
+
+        with memoize_templates() as memo:
+            for d in (d1, d2):
+                d.parse_and_calculate_links()
+
+        self.assertEqual(memo.timings[branch.id].hits, 1)
+        for d in (d1, d2):
+            self.assertEqual(
+                {(link.linked_to.title, link.kind) for link in d.links_from()},
+                {
+                    (TEMPLATE_TITLE_PREFIX + "Branch", "template"),
+                    (TEMPLATE_TITLE_PREFIX + "Leaf", "template"),
+                },
+            )
+
+
 class TestWikiVideo(TestCase):
     """Video hook."""
 
@@ -19,6 +19,7 @@ from kitsune.wiki.badges import WIKI_BADGES
 from kitsune.wiki.config import TEMPLATE_TITLE_PREFIX, TEMPLATES_CATEGORY
 from kitsune.wiki.models import Document, Revision, RevisionAnchorRecord
 from kitsune.wiki.tasks import (
+    _cascade_order,
     _rebuild_kb_chunk,
     cleanup_old_anchor_records,
     rebuild_kb,
@@ -218,6 +219,40 @@ class TestDocumentRenderCascades(TestCase):
         self.assertEqual(self._clean(d2), "ONE two")
         self.assertEqual(self._clean(d3), "ONE ONE two three")
 
+    def test_cascade_order(self):
+        d1, _, _ = doc_rev_parser(
+            "one ", title=TEMPLATE_TITLE_PREFIX + "D1", category=TEMPLATES_CATEGORY
+        )
+        d2, _, _ = doc_rev_parser(
+            "[[T:D1]] two", title=TEMPLATE_TITLE_PREFIX + "D2", category=TEMPLATES_CATEGORY
+        )
+        d3, _, _ = doc_rev_parser("[[T:D1]] [[T:D2]] three", title="D3")
+        doc_rev_parser("unrelated", title="D4")
+
+        # D3 includes D1 directly, but must still wait for D2.
+        self.assertEqual(_cascade_order(d1.id), [d1.id, d2.id, d3.id])
+        self.assertEqual(_cascade_order(d2.id), [d2.id, d3.id])
+        self.assertEqual(_cascade_order(d3.id), [d3.id])
+
+    def test_cascade_order_with_cycle(self):
+        d1, _, _ = doc_rev_parser("[[Include:D2]] one", title="D1")
+        d2, _, _ = doc_rev_parser("[[Include:D1]] two", title="D2")
+        d1.add_link_to(d2, "include")
+
+        self.assertEqual(_cascade_order(d1.id), [d1.id, d2.id])
+        self.assertEqual(_cascade_order(d2.id), [d2.id, d1.id])
+
+    def test_cascade_skips_unchanged_documents(self):
+        d1, _, _ = doc_rev_parser(
+            "one ", title=TEMPLATE_TITLE_PREFIX + "D1", category=TEMPLATES_CATEGORY
+        )
+        d2, _, _ = doc_rev_parser("[[T:D1]] two", title="D2")
+
+        with mock.patch.object(Document, "save") as save:
+            render_document_cascade(d1.id)
+        save.assert_not_called()
+        self.assertEqual(_cascade_order(d1.id), [d1.id, d2.id])
+
 
 class TestMaybeAwardBadge(TestCase):
     """Test that the annual wiki badges are awarded correctly."""
@@ -492,6 +492,39 @@ class DocumentTests(TestCase):
         # Check that content is available in es
         self.assertEqual(pq(trans_doc.html)("div").text(), doc("#doc-content div").text())
 
+    def test_logged_in_fragments_are_reused_until_the_document_changes(self):
+        """The related documents block is cached for logged-in users, and
+        is refreshed when the document's cached html is cleared."""
+        r = ApprovedRevisionFactory(content="Some text.")
+        related = ApprovedRevisionFactory(document__title="Old related title").document
+        r.document.related_documents.add(related)
+        u = UserFactory()
+        self.client.login(username=u.username, password="testpass")
+
+        response = self.client.get(r.document.get_absolute_url())
+        self.assertIn("Old related title", pq(response.content)("#related-documents").text())
+
+        Document.objects.filter(id=related.id).update(title="New related title")
+        response = self.client.get(r.document.get_absolute_url())
+        self.assertIn("Old related title", pq(response.content)("#related-documents").text())
+
+        r.document.clear_cached_html()
+        response = self.client.get(r.document.get_absolute_url())
+        self.assertIn("New related title", pq(response.content)("#related-documents").text())
+
+    def test_related_documents_fragment_hides_unapproved_documents(self):
+        """Unapproved related documents aren't shown to logged-in users, even
+        the creator, since the block is shared by users with the same groups."""
+        r = ApprovedRevisionFactory(content="Some text.")
+        unapproved = RevisionFactory(document__title="Unapproved related").document
+        r.document.related_documents.add(unapproved)
+        self.client.login(
+            username=unapproved.revisions.get().creator.username, password="testpass"
+        )
+
+        response = self.client.get(r.document.get_absolute_url())
+        self.assertNotIn("Unapproved related", pq(response.content).text())
+
     def test_document_share_link_escape(self):
         """Ensure that the share link isn't escaped."""
         r = ApprovedRevisionFactory(
@@ -2932,16 +2965,11 @@ class HelpfulVoteTests(TestCase):
 
         # Check the data.
         data = json.loads(resp.content)
-        self.assertIn("datums", data)
         self.assertIn("annotations", data)
-        self.assertEqual(3, len(data["datums"]))
+        self.assertEqual(3, len(data["dates"]))
         self.assertEqual(1, len(data["annotations"]))
-        self.assertEqual(data["datums"][0]["no"], 3)
-        self.assertEqual(data["datums"][0]["yes"], 1)
-        self.assertEqual(data["datums"][1]["no"], 2)
-        self.assertEqual(data["datums"][1]["yes"], 1)
-        self.assertEqual(data["datums"][2]["no"], 1)
-        self.assertEqual(data["datums"][2]["yes"], 2)
+        self.assertEqual([3, 2, 1], data["no"])
+        self.assertEqual([1, 1, 2], data["yes"])
         annotation = data["annotations"][0]
         self.assertEqual("Article Revisions", annotation["name"])
         self.assertEqual("revisions", annotation["slug"])
@@ -2953,7 +2981,7 @@ class HelpfulVoteTests(TestCase):
         resp = get(self.client, "wiki.get_helpful_votes_async", args=[r.document.slug])
         self.assertEqual(200, resp.status_code)
         data = json.loads(resp.content)
-        self.assertEqual(0, len(data["datums"]))
+        self.assertEqual({"dates": [], "yes": [], "no": [], "annotations": []}, data)
 
 
 class SelectLocaleTests(TestCase):
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from kitsune.sumo.tests import TestCase
+from kitsune.wiki.tests import ApprovedRevisionFactory, HelpfulVoteFactory
+from kitsune.wiki.vote_history import vote_history
+
+
+class VoteHistoryTests(TestCase):
+    def setUp(self):
+        self.days_ago = timezone.now() - timedelta(days=3)
+        self.rev = ApprovedRevisionFactory(
+            created=self.days_ago - timedelta(days=1), reviewed=self.days_ago
+        )
+        self.document_id = self.rev.document_id
+        HelpfulVoteFactory(revision=self.rev, helpful=True, created=self.days_ago)
+        HelpfulVoteFactory(revision=self.rev, helpful=False, created=self.days_ago)
+        HelpfulVoteFactory(
+            revision=self.rev, helpful=True, created=self.days_ago + timedelta(days=1)
+        )
+
+    def test_vote_history(self):
+        history = vote_history(self.document_id)
+        day = timezone.localdate(self.days_ago)
+        self.assertEqual(
+            [day.isoformat(), (day + timedelta(days=1)).isoformat()], history["dates"]
+        )
+        self.assertEqual([1, 1], history["yes"])
+        self.assertEqual([1, 0], history["no"])
+        self.assertEqual([self.rev.id], list(history["revisions"]))
+
+    def test_start(self):
+        start = timezone.localdate(self.days_ago) + timedelta(days=1)
+        history = vote_history(self.document_id, start)
+        self.assertEqual([start.isoformat()], history["dates"])
+        self.assertEqual([1], history["yes"])
+        self.assertEqual([0], history["no"])
+
+    def test_closed_days_are_cached(self):
+        vote_history(self.document_id)
+        # Only today's votes are counted.
+        with self.assertNumQueries(1):
+            history = vote_history(self.document_id)
+        self.assertEqual([1, 1], history["yes"])
+
+    def test_todays_votes_are_counted_live(self):
+        vote_history(self.document_id)
+        rev = ApprovedRevisionFactory(document=self.rev.document)
+        HelpfulVoteFactory(revision=rev, helpful=False)
+        history = vote_history(self.document_id)
+        self.assertEqual(timezone.localdate().isoformat(), history["dates"][-1])
+        self.assertEqual([1, 0, 1], history["no"])
+        self.assertEqual({self.rev.id, rev.id}, set(history["revisions"]))
+
+    def test_saving_a_revision_drops_the_history(self):
+        vote_history(self.document_id)
+        self.rev.reviewed = timezone.now()
+        self.rev.save()
+        (_, shown, _) = vote_history(self.document_id)["revisions"][self.rev.id]
+        self.assertEqual(timezone.localdate(), shown)
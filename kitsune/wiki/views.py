@@ -1,28 +1,26 @@
 import json
 import logging
-from datetime import datetime, timedelta
-from datetime import time as datetime_time
+from datetime import date, datetime
 from functools import wraps
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.db.models import Count, Exists, OuterRef, Q, Subquery
-from django.db.models.functions import Coalesce, Now, TruncDate
+from django.db.models.functions import Coalesce, Now
 from django.forms.utils import ErrorList
 from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy as _lazy
 from django.utils.translation import pgettext
 from django.utils.translation.trans_real import parse_accept_lang_header
-from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 
 from kitsune.access.decorators import login_required
@@ -36,6 +34,7 @@ from kitsune.sumo.templatetags.jinja_helpers import urlparams
 from kitsune.sumo.urlresolvers import reverse
 from kitsune.sumo.utils import (
     get_next_url,
+    in_staff_group,
     paginate,
     set_aaq_context,
     smart_int,
@@ -88,6 +87,7 @@ from kitsune.wiki.utils import (
     get_visible_revision_or_404,
     update_kb_visited,
 )
+from kitsune.wiki.vote_history import vote_history
 
 log = logging.getLogger("k.wiki")
 l10n_factory = TranslationStrategyFactory()
@@ -285,29 +285,6 @@ def document(request, document_slug, document=None):
     else:
         document_css_class = ""
 
-    # Build a set of breadcrumbs, ending with the document's title, and
-    # starting with the product, with the topic(s) in between.
-    # The breadcrumbs are built backwards, and then reversed.
-
-    # Get document title. If it is like "Title - Subtitle", strip off the subtitle.
-    trimmed_title = doc.title.split(" - ")[0].strip()
-    breadcrumbs = [(None, trimmed_title)]
-    # Get the dominant topic, and all parent topics. Save the topic chosen for
-    # picking a product later.
-    document_topics = doc.get_topics().order_by("display_order")
-    if len(document_topics) > 0:
-        topic = document_topics.first()
-        breadcrumbs.append(
-            (
-                topic.get_absolute_url(product.slug),
-                pgettext("DB: products.Topic.title", topic.title),
-            )
-        )
-    breadcrumbs.append(
-        (product.get_absolute_url(), pgettext("DB: products.Product.title", product.title))
-    )
-    # The list above was built backwards, so flip this.
-    breadcrumbs.reverse()
     votes = HelpfulVote.objects.filter(revision=doc.current_revision).aggregate(
         total_votes=Count("id"),
         helpful_votes=Count("id", filter=Q(helpful=True)),
@@ -330,6 +307,17 @@ def document(request, document_slug, document=None):
     related_documents = get_visible_related_documents(
         request.user, doc, locale=request.LANGUAGE_CODE, is_archived=False
     )
+    related_docs_viewer = _related_documents_viewer(request.user)
+    if related_docs_viewer.startswith("groups:"):
+        # The cached block is shared by every logged-in user with the same groups, so
+        # leave out the unapproved documents only some of them would be able to see.
+        related_documents = related_documents.filter(current_revision__isnull=False)
+
+    # The breadcrumbs, article body and related documents are cached as fragments
+    # shared across users, so they're only built when those fragments are missing.
+    fragment_version = doc.fragment_cache_version
+    if doc.parent:
+        fragment_version = f"{fragment_version}:{doc.parent.fragment_cache_version}"
 
     data = {
         "document": doc,
@@ -346,7 +334,7 @@ def document(request, document_slug, document=None):
         "ga_article_locale": ga_article_locale,
         "related_products": doc.related_products.exclude(pk=product.pk),
         "show_aaq_widget": show_aaq_widget,
-        "breadcrumb_items": breadcrumbs,
+        "breadcrumb_items": SimpleLazyObject(lambda: _document_breadcrumbs(doc, product)),
         "document_css_class": document_css_class,
         "any_localizable_revision": doc.revisions.filter(
             is_approved=True, is_ready_for_localization=True
@@ -359,11 +347,55 @@ def document(request, document_slug, document=None):
             sorted(pgettext("DB: products.Product.title", p.title) for p in products)
         ),
         "related_docs": related_documents,
+        "related_docs_viewer": related_docs_viewer,
+        "fragment_version": fragment_version,
     }
 
     return maybe_vary_on_accept_language(render(request, "wiki/document.html", data))
 
 
+def _document_breadcrumbs(doc, product):
+    """
+    Build a set of breadcrumbs, ending with the document's title, and
+    starting with the product, with the topic(s) in between.
+    """
+    # The breadcrumbs are built backwards, and then reversed.
+
+    # Get document title. If it is like "Title - Subtitle", strip off the subtitle.
+    trimmed_title = doc.title.split(" - ")[0].strip()
+    breadcrumbs = [(None, trimmed_title)]
+    # Get the dominant topic, and all parent topics. Save the topic chosen for
+    # picking a product later.
+    document_topics = doc.get_topics().order_by("display_order")
+    if len(document_topics) > 0:
+        topic = document_topics.first()
+        breadcrumbs.append(
+            (
+                topic.get_absolute_url(product.slug),
+                pgettext("DB: products.Topic.title", topic.title),
+            )
+        )
+    breadcrumbs.append(
+        (product.get_absolute_url(), pgettext("DB: products.Product.title", product.title))
+    )
+    # The list above was built backwards, so flip this.
+    breadcrumbs.reverse()
+    return breadcrumbs
+
+
+def _related_documents_viewer(user):
+    """
+    Identify the set of related documents the given user can see, so the
+    cached related documents fragment can be shared by users who see the same.
+    """
+    if not user.is_authenticated:
+        return "anonymous"
+    if user.is_superuser or in_staff_group(user):
+        return "staff"
+    group_ids = sorted(user.groups.values_list("id", flat=True))
+    return "groups:" + ",".join(str(group_id) for group_id in group_ids)
+
+
 def revision(request, document_slug, revision_id):
     """View a wiki document revision."""
     rev = get_visible_revision_or_404(
@@ -1442,69 +1474,35 @@ def handle_vote(request, document_slug):
     return HttpResponseRedirect(revision.document.get_absolute_url())
 
 
-HELPFUL_VOTES_WINDOW_DAYS = 730
-
-
 @require_GET
-@cache_page(60 * 5)
 def get_helpful_votes_async(request, document_slug):
     document = get_visible_document_or_404(
         request.user, locale=request.LANGUAGE_CODE, slug=document_slug
     )
 
-    default_start = (timezone.now() - timedelta(days=HELPFUL_VOTES_WINDOW_DAYS)).date()
     try:
         start = datetime.fromisoformat(request.GET.get("start", "")).date()
     except ValueError:
-        start = default_start
-
-    datums = []
-    flag_data = []
-    rev_data = []
-    revisions = set()
-    created_list = []
-
-    results = (
-        HelpfulVote.objects.filter(revision__document=document, created__gte=start)
-        .values(date_created=TruncDate("created"))
-        .annotate(
-            revisions=ArrayAgg("revision_id"),
-            count_helpful=Count("helpful", filter=Q(helpful=True)),
-            count_unhelpful=Count("helpful", filter=Q(helpful=False)),
-        )
-        .order_by("date_created")
-    )
+        start = None
 
-    for res in results:
-        revisions.update(res["revisions"])
-        created_list.append(res["date_created"])
-        datums.append(
-            {
-                "yes": res["count_helpful"],
-                "no": res["count_unhelpful"],
-                "date": res["date_created"].isoformat(),
-            }
-        )
-
-    if not created_list:
-        send = {"datums": [], "annotations": []}
+    history = vote_history(document.id, start)
+    dates = history.pop("dates")
+    send = {"dates": dates, "yes": history["yes"], "no": history["no"], "annotations": []}
+    if not dates:
         return HttpResponse(json.dumps(send), content_type="application/json")
 
-    min_created = datetime.combine(min(created_list), datetime_time.min)
-    max_created = datetime.combine(max(created_list), datetime_time.max)
-
-    for flag in ImportantDate.objects.filter(date__gte=min_created, date__lte=max_created):
-        flag_data.append({"x": flag.date.isoformat(), "text": _(flag.text)})
-
-    for rev in Revision.objects.filter(
-        pk__in=revisions, created__range=(min_created, max_created)
-    ):
-        rdate = rev.reviewed or rev.created
-        rev_data.append(
-            {"x": rdate.date().isoformat(), "text": str(_("Revision %s")) % rev.created}
-        )
-
-    send = {"datums": datums, "annotations": []}
+    first_day = date.fromisoformat(dates[0])
+    last_day = date.fromisoformat(dates[-1])
+
+    flag_data = [
+        {"x": flag.date.isoformat(), "text": _(flag.text)}
+        for flag in ImportantDate.objects.filter(date__gte=first_day, date__lte=last_day)
+    ]
+    rev_data = [
+        {"x": shown.isoformat(), "text": str(_("Revision %s")) % created}
+        for created_day, shown, created in history["revisions"].values()
+        if first_day <= created_day <= last_day
+    ]
 
     if flag_data:
         send["annotations"].append(
@@ -0,0 +1,133 @@
+"""
+Daily helpful vote counts behind the helpfulness chart on a document's history page.
+
+Votes are always cast now, so the counts of the days that are over never change. They
+are counted once a day per document, along with the revisions voted on, and kept in
+the cache as columns of dates, yes and no counts until the day is over. Only today's
+votes are counted live. A revision that is saved or deleted drops its document's
+counts, since that changes its annotation or the votes it had.
+
+Days are days in the current time zone, the same as ``TruncDate("created")`` gives.
+"""
+
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from kitsune.wiki.models import HelpfulVote, Revision
+
+# How many days of votes the chart shows by default.
+WINDOW_DAYS = 730
+
+VOTE_HISTORY_CACHE_KEY = "wiki:helpful-votes:{document_id}:{day}"
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _cache_key(document_id, today):
+    return VOTE_HISTORY_CACHE_KEY.format(document_id=document_id, day=today.isoformat())
+
+
+def _count_votes(document_id, start, end=None):
+    """
+    Count the votes on the document's revisions cast from the ``start`` datetime
+    until ``end``, if given, and return them as a dict of columns, along with the
+    ids of the revisions voted on.
+    """
+    votes = HelpfulVote.objects.filter(revision__document=document_id, created__gte=start)
+    if end:
+        votes = votes.filter(created__lt=end)
+    rows = (
+        votes.values("revision_id", day=TruncDate("created"))
+        .annotate(
+            yes=Count("id", filter=Q(helpful=True)),
+            no=Count("id", filter=Q(helpful=False)),
+        )
+        .order_by("day")
+    )
+
+    columns = {"dates": [], "yes": [], "no": []}
+    revision_ids = set()
+    for row in rows:
+        day = row["day"].isoformat()
+        if not columns["dates"] or columns["dates"][-1] != day:
+            columns["dates"].append(day)
+            columns["yes"].append(0)
+            columns["no"].append(0)
+        columns["yes"][-1] += row["yes"]
+        columns["no"][-1] += row["no"]
+        revision_ids.add(row["revision_id"])
+    return columns, revision_ids
+
+
+def _revision_annotations(revision_ids):
+    """
+    Return a dict of the given revisions' ids to the date they were created, the date
+    they are shown at on the chart and when they were created.
+    """
+    return {
+        rev.id: (
+            timezone.localdate(rev.created),
+            timezone.localdate(rev.reviewed or rev.created),
+            rev.created,
+        )
+        for rev in Revision.objects.filter(pk__in=revision_ids).only("created", "reviewed")
+    }
+
+
+def _closed_days(document_id, today):
+    """Return the cached counts of the window's days before today."""
+    key = _cache_key(document_id, today)
+    closed = cache.get(key)
+    if closed is None:
+        start = _day_start(today - timedelta(days=WINDOW_DAYS))
+        closed, revision_ids = _count_votes(document_id, start, _day_start(today))
+        closed["revisions"] = _revision_annotations(revision_ids)
+        cache.set(key, closed, settings.CACHE_LONG_TIMEOUT)
+    return closed
+
+
+def vote_history(document_id, start=None):
+    """
+    Return the daily vote counts of the document since the ``start`` date, or over
+    the last WINDOW_DAYS days, as a dict of ``dates``, ``yes`` and ``no`` columns and
+    the ``revisions`` voted on, as returned by ``_revision_annotations``.
+    """
+    today = timezone.localdate()
+    window_start = today - timedelta(days=WINDOW_DAYS)
+    start = start or window_start
+
+    if start < window_start:
+        history, revision_ids = _count_votes(document_id, _day_start(start))
+        history["revisions"] = _revision_annotations(revision_ids)
+        return history
+
+    closed = _closed_days(document_id, today)
+    live, revision_ids = _count_votes(document_id, _day_start(today))
+
+    first = bisect_left(closed["dates"], start.isoformat())
+    history = {column: closed[column][first:] + live[column] for column in live}
+
+    # Revisions voted on for the first time today are not in the cached counts.
+    history["revisions"] = {
+        **closed["revisions"],
+        **_revision_annotations(revision_ids - closed["revisions"].keys()),
+    }
+    return history
+
+
+def _drop_vote_history(sender, instance, **kwargs):
+    cache.delete(_cache_key(instance.document_id, timezone.localdate()))
+
+
+def register_signals():
+    post_save.connect(_drop_vote_history, sender=Revision)
+    post_delete.connect(_drop_vote_history, sender=Revision)